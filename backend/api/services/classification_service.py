@@ -1,5 +1,6 @@
 import uuid
 import time
+from contextlib import nullcontext
 from typing import Dict, Any, List
 from datetime import datetime
 from ..models.model_loader import model_loader
@@ -11,6 +12,20 @@ from ..models.schemas import (
 )
 from ..config.database import get_database
 
+try:
+    # Observability modules live in the backend root, which is not always on sys.path
+    from metrics import METRICS
+    from tracing import current_trace_id
+except ImportError:
+    METRICS = None
+
+    def current_trace_id():
+        return None
+
+def _stage(name: str):
+    """METRICS.stage timer, or a no-op when metrics are unavailable"""
+    return METRICS.stage(name) if METRICS is not None else nullcontext()
+
 class ClassificationService:
     def __init__(self):
         self.database = get_database()
@@ -113,15 +128,17 @@ class ClassificationService:
         """Log request to database"""
         try:
             collection = self.database["requests"]
-            await collection.insert_one({
-                "_id": request_id,
-                "timestamp": datetime.utcnow(),
-                "text": request.text,
-                "user_id": request.user_id,
-                "session_id": request.session_id,
-                "location": request.location,
-                "contact_info": request.contact_info
-            })
+            with _stage("mongo_logging"):
+                await collection.insert_one({
+                    "_id": request_id,
+                    "trace_id": current_trace_id(),
+                    "timestamp": datetime.utcnow(),
+                    "text": request.text,
+                    "user_id": request.user_id,
+                    "session_id": request.session_id,
+                    "location": request.location,
+                    "contact_info": request.contact_info
+                })
         except Exception as e:
             print(f"Failed to log request: {e}")
     
@@ -129,15 +146,17 @@ class ClassificationService:
         """Log classification result to database"""
         try:
             collection = self.database["classifications"]
-            await collection.insert_one({
-                "_id": str(uuid.uuid4()),
-                "request_id": request_id,
-                "timestamp": analysis.timestamp,
-                "is_emergency": analysis.emergency_analysis.is_emergency,
-                "urgency_level": analysis.urgency_analysis.urgency_level,
-                "requires_immediate_action": analysis.requires_immediate_action,
-                "processing_time_ms": analysis.processing_time_ms
-            })
+            with _stage("mongo_logging"):
+                await collection.insert_one({
+                    "_id": str(uuid.uuid4()),
+                    "request_id": request_id,
+                    "trace_id": current_trace_id(),
+                    "timestamp": analysis.timestamp,
+                    "is_emergency": analysis.emergency_analysis.is_emergency,
+                    "urgency_level": analysis.urgency_analysis.urgency_level,
+                    "requires_immediate_action": analysis.requires_immediate_action,
+                    "processing_time_ms": analysis.processing_time_ms
+                })
         except Exception as e:
             print(f"Failed to log classification: {e}")
 
@@ -0,0 +1,147 @@
+"""
+Cold-start import benchmark for the RescueLanka service entry points
+backend/benchmarks/import_time.py
+
+Imports each entry point in a fresh interpreter with ``-X importtime`` and
+records the wall time, the self-reported import time and the slowest
+top-level imports. Results are written as JSON so runs can be compared:
+
+    python benchmarks/import_time.py --output import_time.json
+    python benchmarks/import_time.py --baseline import_time.json
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+ENTRY_POINTS = [
+    "run",
+    "minimal",
+    "complete_model_service",
+    "vlm_real_service",
+    "vlm_mock_service",
+    "start_vlm_services",
+]
+
+# Heavy modules that should not be imported before a model loads
+HEAVY_MODULES = ["tensorflow", "torch", "transformers", "cv2", "sklearn", "onnxruntime"]
+
+_IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def parse_importtime(stderr: str) -> List[Dict[str, Any]]:
+    """Parse ``-X importtime`` output into {module, self_us, cumulative_us, depth}"""
+    entries = []
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            entries.append({
+                "module": match.group(4),
+                "self_us": int(match.group(1)),
+                "cumulative_us": int(match.group(2)),
+                "depth": (len(match.group(3)) - 1) // 2
+            })
+    return entries
+
+
+def measure_entry_point(module: str, top: int = 10) -> Dict[str, Any]:
+    """Import one module in a fresh interpreter and time it"""
+    probe = (
+        f"import sys; import {module}; "
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+
+    started_at = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe],
+        cwd=str(BACKEND_DIR), env=env, capture_output=True, text=True
+    )
+    wall_ms = (time.perf_counter() - started_at) * 1000
+
+    entries = parse_importtime(result.stderr)
+    top_level = [entry for entry in entries if entry["depth"] == 0]
+    top_level.sort(key=lambda entry: entry["cumulative_us"], reverse=True)
+
+    return {
+        "ok": result.returncode == 0,
+        "wall_ms": wall_ms,
+        "import_ms": sum(entry["cumulative_us"] for entry in top_level) / 1000,
+        "heavy_modules_loaded": [m for m in result.stdout.strip().split(",") if m] if result.returncode == 0 else [],
+        "slowest_imports": [
+            {"module": entry["module"], "cumulative_ms": entry["cumulative_us"] / 1000}
+            for entry in top_level[:top]
+        ],
+        "error": result.stderr.strip().splitlines()[-1] if result.returncode != 0 and result.stderr.strip() else None
+    }
+
+
+def run_benchmark(entry_points: List[str], repeats: int, top: int) -> Dict[str, Any]:
+    results = {}
+    for module in entry_points:
+        runs = [measure_entry_point(module, top) for _ in range(repeats)]
+        best = min(runs, key=lambda run: run["wall_ms"])
+        results[module] = {
+            "ok": all(run["ok"] for run in runs),
+            "wall_ms_median": statistics.median(run["wall_ms"] for run in runs),
+            "wall_ms_min": best["wall_ms"],
+            "import_ms_median": statistics.median(run["import_ms"] for run in runs),
+            "heavy_modules_loaded": best["heavy_modules_loaded"],
+            "slowest_imports": best["slowest_imports"],
+            "error": best["error"]
+        }
+        status = "✅" if results[module]["ok"] else "❌"
+        print(f"{status} {module:<24} {results[module]['wall_ms_median']:8.1f} ms "
+              f"(heavy: {', '.join(best['heavy_modules_loaded']) or 'none'})")
+
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "python": sys.version.split()[0],
+        "repeats": repeats,
+        "entry_points": results
+    }
+
+
+def compare_to_baseline(report: Dict[str, Any], baseline: Dict[str, Any]):
+    print("\n📊 Change vs baseline (median wall time)")
+    for module, result in report["entry_points"].items():
+        previous = baseline.get("entry_points", {}).get(module)
+        if not previous:
+            continue
+        delta = result["wall_ms_median"] - previous["wall_ms_median"]
+        print(f"   {module:<24} {previous['wall_ms_median']:8.1f} -> {result['wall_ms_median']:8.1f} ms "
+              f"({delta:+.1f} ms)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold-start import time of the service entry points")
+    parser.add_argument("--entry-point", action="append", dest="entry_points",
+                        help="Module to measure (repeatable, default: all service entry points)")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10, help="Slowest imports to record per entry point")
+    parser.add_argument("--output", type=Path, help="Write the JSON report here")
+    parser.add_argument("--baseline", type=Path, help="Previous JSON report to compare against")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.entry_points or ENTRY_POINTS, max(1, args.repeats), args.top)
+
+    if args.baseline and args.baseline.exists():
+        compare_to_baseline(report, json.loads(args.baseline.read_text()))
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+        print(f"\n💾 Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
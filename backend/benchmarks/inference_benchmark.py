@@ -0,0 +1,300 @@
+"""
+In-process inference benchmark for every model entry point
+backend/benchmarks/inference_benchmark.py
+
+Loads CompleteModelService and VLMRobustService from a models directory
+(tiny stand-ins from tiny_models.py by default), then measures latency
+percentiles and throughput per entry point, image size and batch size:
+
+    python benchmarks/inference_benchmark.py --output inference.json
+    python benchmarks/inference_benchmark.py --models-dir models --image-sizes 512,2048
+    python benchmarks/inference_benchmark.py --baseline inference.json
+
+Entry points with a batched API (classify_disasters_from_images,
+analyze_images) are called with the whole batch; the rest are called
+batch-size times concurrently so the micro-batchers and executors see real
+contention. Result caches are disabled unless --keep-caches is given.
+"""
+
+import os
+import io
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import tempfile
+import subprocess
+from datetime import datetime
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(BACKEND_DIR))
+sys.path.append(str(Path(__file__).resolve().parent))
+
+from tiny_models import generate_tiny_models
+
+ENTRY_POINTS = [
+    "classify_emergency",
+    "classify_urgency",
+    "classify_disaster_from_image",
+    "analyze_visual_damage_indicators",
+    "complete_analysis",
+    "vlm_robust.analyze_image",
+]
+
+# Entry points that take no image (benchmarked once, not per image size)
+TEXT_ENTRY_POINTS = {"classify_emergency", "classify_urgency"}
+
+SAMPLE_TEXTS = [
+    "Help! Flood water rising fast near the river, family trapped on the roof",
+    "Building collapsed in Colombo after the earthquake, people missing",
+    "Landslide blocked the road to the village, no injuries reported",
+    "Fire and heavy smoke in the market area, children need evacuation",
+    "Power is out in our street since the cyclone, we need food and water",
+    "Minor flooding on the main road this morning, traffic is slow",
+]
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def summarize(latencies_ms: List[float], items_per_call: int, wall_s: float) -> Dict[str, Any]:
+    return {
+        "calls": len(latencies_ms),
+        "items_per_call": items_per_call,
+        "mean_ms": float(np.mean(latencies_ms)),
+        "min_ms": min(latencies_ms),
+        "p50_ms": percentile(latencies_ms, 0.50),
+        "p95_ms": percentile(latencies_ms, 0.95),
+        "p99_ms": percentile(latencies_ms, 0.99),
+        "max_ms": max(latencies_ms),
+        "throughput_items_per_s": len(latencies_ms) * items_per_call / wall_s if wall_s > 0 else None
+    }
+
+
+def make_images(side: int, count: int, seed: int) -> List[bytes]:
+    """Distinct side x side JPEGs: colour gradients plus noise, so file sizes are photo-like"""
+    from PIL import Image
+
+    rng = np.random.default_rng(seed + side)
+    ramp = np.linspace(0, 255, side, dtype=np.float32)
+    images = []
+    for _ in range(count):
+        base = (ramp[None, :, None] * rng.uniform(0.3, 1.0, size=3) +
+                ramp[:, None, None] * rng.uniform(0.0, 0.7, size=3)) / 1.7
+        noise = rng.normal(0, 12, size=(side, side, 3))
+        pixels = np.clip(base + noise, 0, 255).astype(np.uint8)
+        buffer = io.BytesIO()
+        Image.fromarray(pixels).save(buffer, format="JPEG", quality=90)
+        images.append(buffer.getvalue())
+    return images
+
+
+def time_case(call: Callable[[int], Any], batch_size: int, concurrent: bool,
+              iterations: int, warmup: int, pool: ThreadPoolExecutor) -> Dict[str, Any]:
+    """Time one (entry point, image size, batch size) case
+
+    call(i) runs one item; with concurrent=False it is handed the whole batch.
+    """
+    def run_once(iteration: int):
+        if concurrent and batch_size > 1:
+            futures = [pool.submit(call, iteration * batch_size + k) for k in range(batch_size)]
+            for future in futures:
+                future.result()
+        else:
+            call(iteration)
+
+    for iteration in range(warmup):
+        run_once(iteration)
+
+    latencies = []
+    started_at = time.perf_counter()
+    for iteration in range(warmup, warmup + iterations):
+        call_started_at = time.perf_counter()
+        run_once(iteration)
+        latencies.append((time.perf_counter() - call_started_at) * 1000)
+    return summarize(latencies, batch_size, time.perf_counter() - started_at)
+
+
+def build_calls(name: str, complete_service, vlm_service, images: List[bytes],
+                batch_size: int) -> Optional[tuple]:
+    """(call, concurrent) for an entry point; images are cycled from the pool"""
+    def text(i: int) -> str:
+        # Unique text per call so result caches (if kept) behave like live traffic
+        return f"{SAMPLE_TEXTS[i % len(SAMPLE_TEXTS)]} #{i}"
+
+    def image(i: int) -> bytes:
+        return images[i % len(images)]
+
+    def image_batch(i: int) -> List[bytes]:
+        return [image(i * batch_size + k) for k in range(batch_size)]
+
+    if name == "classify_emergency":
+        return (lambda i: complete_service.classify_emergency(text(i))), True
+    if name == "classify_urgency":
+        return (lambda i: complete_service.classify_urgency(text(i))), True
+    if name == "classify_disaster_from_image":
+        if batch_size > 1:
+            return (lambda i: complete_service.classify_disasters_from_images(image_batch(i))), False
+        return (lambda i: complete_service.classify_disaster_from_image(image(i))), False
+    if name == "analyze_visual_damage_indicators":
+        return (lambda i: complete_service.enhanced_vlm.analyze_visual_damage_indicators(image(i))), True
+    if name == "complete_analysis":
+        return (lambda i: complete_service.complete_analysis(text(i), image(i), location="Colombo")), True
+    if name == "vlm_robust.analyze_image":
+        if vlm_service is None:
+            return None
+        if batch_size > 1:
+            return (lambda i: vlm_service.analyze_images(image_batch(i), text_description=text(i))), False
+        return (lambda i: vlm_service.analyze_image(image(i), text_description=text(i))), False
+    raise ValueError(f"Unknown entry point: {name}")
+
+
+def environment_info(models_dir: Path) -> Dict[str, Any]:
+    info = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "models_dir": str(models_dir),
+        "packages": {}
+    }
+    for package in ("numpy", "torch", "transformers", "tensorflow", "sklearn", "PIL", "cv2", "onnxruntime"):
+        module = sys.modules.get(package)
+        if module is not None:
+            info["packages"][package] = getattr(module, "__version__", "unknown")
+    try:
+        info["git_commit"] = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+            capture_output=True, text=True, timeout=10
+        ).stdout.strip() or None
+    except Exception:
+        info["git_commit"] = None
+    # Every RESCUELANKA_* knob in effect, so runs with different settings are not compared blindly
+    info["settings"] = {key: value for key, value in sorted(os.environ.items()) if key.startswith("RESCUELANKA_")}
+    return info
+
+
+def compare_with_baseline(report: Dict[str, Any], baseline: Dict[str, Any]):
+    previous = {(c["entry_point"], c["image_size"], c["batch_size"]): c for c in baseline.get("cases", [])}
+    print("\n📊 Change vs baseline (p50 / p95):")
+    for case in report["cases"]:
+        old = previous.get((case["entry_point"], case["image_size"], case["batch_size"]))
+        if old is None:
+            continue
+        p50_change = (case["p50_ms"] / old["p50_ms"] - 1) * 100 if old["p50_ms"] else 0.0
+        p95_change = (case["p95_ms"] / old["p95_ms"] - 1) * 100 if old["p95_ms"] else 0.0
+        print(f"   {case['entry_point']:<34} {str(case['image_size'] or '-'):>5} x{case['batch_size']:<3} "
+              f"{p50_change:+7.1f}%  {p95_change:+7.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark model entry points in-process")
+    parser.add_argument("--models-dir", type=Path, help="Models directory (default: generate tiny models)")
+    parser.add_argument("--tiny-dir", type=Path, default=Path(tempfile.gettempdir()) / "rescuelanka_tiny_models")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--entry-points", default=",".join(ENTRY_POINTS))
+    parser.add_argument("--image-sizes", default="256,1024,2048", help="Square image sides in pixels")
+    parser.add_argument("--batch-sizes", default="1,4,16")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--keep-caches", action="store_true", help="Leave the text/feature result caches on")
+    parser.add_argument("--output", type=Path, help="Write the JSON report here")
+    parser.add_argument("--baseline", type=Path, help="Previous report to compare against")
+    args = parser.parse_args()
+
+    entry_points = [name.strip() for name in args.entry_points.split(",") if name.strip()]
+    image_sizes = [int(size) for size in args.image_sizes.split(",") if size.strip()]
+    batch_sizes = [int(size) for size in args.batch_sizes.split(",") if size.strip()]
+
+    # Cache settings are read when the services are imported
+    if not args.keep_caches:
+        os.environ.setdefault("RESCUELANKA_TEXT_CACHE_TTL", "0")
+        os.environ.setdefault("RESCUELANKA_FEATURE_CACHE_MB", "0")
+    os.environ.setdefault("RESCUELANKA_TRACE_EXPORTER", "none")
+
+    random.seed(args.seed)
+    np.random.seed(args.seed)
+
+    if args.models_dir is None:
+        generate_tiny_models(args.tiny_dir, seed=args.seed)
+        models_dir = args.tiny_dir
+    else:
+        models_dir = args.models_dir
+
+    from complete_model_service import CompleteModelService
+    from vlm_real_service import VLMRobustService
+
+    load_started_at = time.perf_counter()
+    complete_service = CompleteModelService(models_base_dir=str(models_dir))
+    complete_service.load_all_models()
+    vlm_service = VLMRobustService(models_dir=str(models_dir / "vlm" / "models"))
+    if not vlm_service.load_models():
+        print("⚠️ VLMRobustService failed to load - skipping its entry point")
+        vlm_service = None
+    load_seconds = time.perf_counter() - load_started_at
+    print(f"✅ Services loaded in {load_seconds:.1f}s: {complete_service.models_loaded}")
+
+    # Caches are off by default, so a small pool of distinct images is enough
+    images_needed = min(max(batch_sizes) * (args.iterations + args.warmup), 16)
+    cases = []
+    with ThreadPoolExecutor(max_workers=max(batch_sizes)) as pool:
+        for image_size in image_sizes:
+            images = make_images(image_size, images_needed, args.seed)
+            for name in entry_points:
+                if name in TEXT_ENTRY_POINTS and image_size != image_sizes[0]:
+                    continue
+                for batch_size in batch_sizes:
+                    calls = build_calls(name, complete_service, vlm_service, images, batch_size)
+                    if calls is None:
+                        continue
+                    call, concurrent = calls
+                    stats = time_case(call, batch_size, concurrent, args.iterations, args.warmup, pool)
+                    case = {
+                        "entry_point": name,
+                        "image_size": None if name in TEXT_ENTRY_POINTS else image_size,
+                        "batch_size": batch_size,
+                        "mode": "concurrent" if concurrent and batch_size > 1 else "batched",
+                        **stats
+                    }
+                    cases.append(case)
+                    print(f"⏱️ {name:<34} {str(case['image_size'] or '-'):>5} x{batch_size:<3} "
+                          f"p50 {stats['p50_ms']:8.2f} ms  p95 {stats['p95_ms']:8.2f} ms  "
+                          f"p99 {stats['p99_ms']:8.2f} ms  {stats['throughput_items_per_s']:8.1f} items/s")
+
+    complete_service.executor.shutdown(wait=False)
+    complete_service.stage_executor.shutdown(wait=False)
+
+    report = {
+        "timestamp": datetime.now().isoformat(),
+        "environment": environment_info(models_dir),
+        "config": {
+            "iterations": args.iterations,
+            "warmup": args.warmup,
+            "seed": args.seed,
+            "keep_caches": args.keep_caches,
+            "image_sizes": image_sizes,
+            "batch_sizes": batch_sizes
+        },
+        "load_seconds": load_seconds,
+        "models_loaded": complete_service.models_loaded,
+        "cases": cases
+    }
+
+    if args.baseline and args.baseline.exists():
+        compare_with_baseline(report, json.loads(args.baseline.read_text()))
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2, default=str))
+        print(f"\n💾 Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
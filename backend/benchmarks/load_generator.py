@@ -0,0 +1,384 @@
+"""
+Open-loop HTTP load generator for the RescueLanka gateways
+backend/benchmarks/load_generator.py
+
+Sends disaster reports at fixed arrival rates, whether or not earlier
+requests have finished, and reports throughput, error rate and latency
+percentiles for each rate step:
+
+    python start_vlm_services.py        # run.py on 8000, mock image service on 8001
+    python benchmarks/load_generator.py --rates 5,10,20,40 --duration 30 --output load.json
+    python benchmarks/load_generator.py --url http://localhost:8000 \\
+        --endpoint-url combined=http://localhost:8002 --mix complete=3,combined=2,vlm_base64=1
+
+Two latencies are recorded per request:
+
+- service time: request sent -> response read
+- response time: scheduled arrival -> response read (corrected for
+  coordinated omission)
+
+A closed-loop client that waits for each reply stops sending while the
+server stalls, so its percentiles hide the stall. Measuring from the
+scheduled arrival keeps that queueing time. The first rate step whose
+achieved throughput, error rate or corrected p99 misses the targets is
+reported as the saturation point.
+"""
+
+import io
+import sys
+import json
+import time
+import random
+import base64
+import asyncio
+import argparse
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import aiohttp
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from vlm_mock_service import TEST_SCENARIOS
+
+# Text-only reports mixed in alongside the image scenarios
+TEXT_REPORTS = [
+    {"text_description": "Water entering houses near the Kelani river, elderly people need help",
+     "location": "Kolonnawa, Western Province", "disaster_type": "flood"},
+    {"text_description": "Tree fell on power lines after heavy wind, road blocked",
+     "location": "Matara, Southern Province", "disaster_type": "cyclone"},
+    {"text_description": "Cracks appearing on the hillside behind the school",
+     "location": "Badulla, Uva Province", "disaster_type": "landslide"},
+    {"text_description": "Family of five trapped on the roof, water still rising",
+     "location": "Ratnapura, Sabaragamuwa Province", "disaster_type": "flood"},
+]
+
+
+@dataclass
+class Endpoint:
+    """One gateway route and how to build its request"""
+    name: str
+    path: str
+    # required | optional (--image-ratio of reports carry one) | none
+    image: str
+    build: Callable[["Report"], Dict[str, Any]]
+
+
+@dataclass
+class Report:
+    text: str
+    location: str
+    disaster_type: str
+    image: Optional[bytes]
+
+
+@dataclass
+class Sample:
+    endpoint: str
+    scheduled: float
+    sent: float
+    finished: float
+    status: int
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and 200 <= self.status < 300
+
+
+def _form(report: Report, text_field: str) -> aiohttp.FormData:
+    form = aiohttp.FormData()
+    form.add_field(text_field, report.text)
+    form.add_field("location", report.location)
+    form.add_field("disaster_type", report.disaster_type)
+    if report.image is not None:
+        form.add_field("file", report.image, filename="report.jpg", content_type="image/jpeg")
+    return form
+
+
+ENDPOINTS = {
+    # run.py
+    "complete": Endpoint("complete", "/analyze/complete", "optional",
+                         lambda report: {"data": _form(report, "text")}),
+    # run.py and minimal.py
+    "vlm_image": Endpoint("vlm_image", "/vlm/analyze/image", "required",
+                          lambda report: {"data": _form(report, "text_description")}),
+    # minimal.py
+    "vlm_base64": Endpoint("vlm_base64", "/vlm/analyze/base64", "required",
+                           lambda report: {"json": {
+                               "image": base64.b64encode(report.image).decode("utf-8"),
+                               "text_description": report.text,
+                               "location": report.location,
+                               "disaster_type": report.disaster_type
+                           }}),
+    "combined": Endpoint("combined", "/analyze/combined", "optional",
+                         lambda report: {"data": _form(report, "text")}),
+    # api/main.py
+    "batch": Endpoint("batch", "/analyze/batch", "none",
+                      lambda report: {"json": {
+                          "texts": [report.text] + [r["text_description"] for r in TEXT_REPORTS[:3]],
+                          "user_id": "load-generator",
+                          "session_id": "load-generator"
+                      }}),
+}
+
+DEFAULT_MIX = "complete=3,vlm_image=2,vlm_base64=1,combined=3,batch=1"
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def latency_summary(values_ms: List[float]) -> Dict[str, Any]:
+    return {
+        "p50_ms": percentile(values_ms, 0.50),
+        "p90_ms": percentile(values_ms, 0.90),
+        "p99_ms": percentile(values_ms, 0.99),
+        "p999_ms": percentile(values_ms, 0.999),
+        "max_ms": max(values_ms) if values_ms else None
+    }
+
+
+def load_images(image_dir: Optional[Path], size: int, count: int, seed: int) -> List[bytes]:
+    """JPEGs from a directory, or synthetic ones (the gateways check real JPEG headers)"""
+    if image_dir is not None:
+        images = [path.read_bytes() for path in sorted(image_dir.iterdir())
+                  if path.suffix.lower() in (".jpg", ".jpeg", ".png")]
+        if not images:
+            raise SystemExit(f"No .jpg/.png images in {image_dir}")
+        return images
+
+    from PIL import Image
+
+    rng = random.Random(seed)
+    images = []
+    for _ in range(count):
+        image = Image.new("RGB", (size, size), tuple(rng.randrange(256) for _ in range(3)))
+        # A few blocks so JPEG sizes are not trivially small
+        for _ in range(12):
+            x, y = rng.randrange(size), rng.randrange(size)
+            block = Image.new("RGB", (size // 4, size // 4), tuple(rng.randrange(256) for _ in range(3)))
+            image.paste(block, (x, y))
+        buffer = io.BytesIO()
+        image.save(buffer, format="JPEG", quality=90)
+        images.append(buffer.getvalue())
+    return images
+
+
+def make_report(rng: random.Random, endpoint: Endpoint, images: List[bytes], image_ratio: float) -> Report:
+    """A scenario report (with image) or a text-only report, as the endpoint allows"""
+    with_image = endpoint.image == "required" or (endpoint.image == "optional" and rng.random() < image_ratio)
+    source = rng.choice(list(TEST_SCENARIOS.values()) if with_image else TEXT_REPORTS)
+    return Report(
+        text=source["text_description"],
+        location=source["location"],
+        disaster_type=source["disaster_type"],
+        image=rng.choice(images) if with_image else None
+    )
+
+
+async def send_one(session: aiohttp.ClientSession, url: str, endpoint: Endpoint,
+                   report: Report, scheduled: float) -> Sample:
+    sent = time.perf_counter()
+    try:
+        async with session.post(url + endpoint.path, **endpoint.build(report)) as response:
+            await response.read()
+            return Sample(endpoint.name, scheduled, sent, time.perf_counter(), response.status,
+                          None if response.status < 400 else f"HTTP {response.status}")
+    except Exception as e:
+        return Sample(endpoint.name, scheduled, sent, time.perf_counter(), 0, f"{type(e).__name__}: {e}")
+
+
+async def run_step(session: aiohttp.ClientSession, urls: Dict[str, str], mix: Dict[str, float],
+                   rate: float, duration: float, images: List[bytes], image_ratio: float,
+                   arrivals: str, rng: random.Random) -> List[Sample]:
+    """Fire requests on an arrival schedule fixed in advance (open loop)"""
+    names = list(mix)
+    weights = [mix[name] for name in names]
+
+    schedule = []
+    offset = 0.0
+    while True:
+        offset += rng.expovariate(rate) if arrivals == "poisson" else 1.0 / rate
+        if offset >= duration:
+            break
+        schedule.append(offset)
+
+    started_at = time.perf_counter()
+    tasks = []
+    for offset in schedule:
+        scheduled = started_at + offset
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        endpoint = ENDPOINTS[rng.choices(names, weights)[0]]
+        report = make_report(rng, endpoint, images, image_ratio)
+        tasks.append(asyncio.create_task(send_one(session, urls[endpoint.name], endpoint, report, scheduled)))
+
+    return list(await asyncio.gather(*tasks))
+
+
+def summarize_step(samples: List[Sample], rate: float, duration: float) -> Dict[str, Any]:
+    def summarize(group: List[Sample]) -> Dict[str, Any]:
+        ok = [s for s in group if s.ok]
+        finished = max((s.finished for s in group), default=0.0)
+        first = min((s.scheduled for s in group), default=0.0)
+        wall = max(finished - first, duration)
+        errors: Dict[str, int] = {}
+        for s in group:
+            if not s.ok:
+                reason = s.error or f"HTTP {s.status}"
+                errors[reason] = errors.get(reason, 0) + 1
+        return {
+            "requests": len(group),
+            "succeeded": len(ok),
+            "error_rate": (len(group) - len(ok)) / len(group) if group else 0.0,
+            "errors": errors,
+            "throughput_rps": len(ok) / wall if wall > 0 else 0.0,
+            "service_time": latency_summary([(s.finished - s.sent) * 1000 for s in ok]),
+            "response_time": latency_summary([(s.finished - s.scheduled) * 1000 for s in ok])
+        }
+
+    by_endpoint: Dict[str, List[Sample]] = {}
+    for sample in samples:
+        by_endpoint.setdefault(sample.endpoint, []).append(sample)
+
+    return {
+        "offered_rps": rate,
+        "duration_s": duration,
+        **summarize(samples),
+        "endpoints": {name: summarize(group) for name, group in sorted(by_endpoint.items())}
+    }
+
+
+def is_saturated(step: Dict[str, Any], min_throughput_ratio: float, max_error_rate: float,
+                 slo_p99_ms: float) -> List[str]:
+    """Reasons a step misses its targets (empty when it keeps up)"""
+    reasons = []
+    if step["throughput_rps"] < min_throughput_ratio * step["offered_rps"]:
+        reasons.append(f"throughput {step['throughput_rps']:.1f} < {min_throughput_ratio:.0%} of offered")
+    if step["error_rate"] > max_error_rate:
+        reasons.append(f"error rate {step['error_rate']:.1%}")
+    p99 = step["response_time"]["p99_ms"]
+    if p99 is not None and p99 > slo_p99_ms:
+        reasons.append(f"corrected p99 {p99:.0f} ms > {slo_p99_ms:.0f} ms")
+    return reasons
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    mix = {}
+    for part in value.split(","):
+        if not part.strip():
+            continue
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise SystemExit(f"Unknown endpoint '{name}'. Available: {', '.join(ENDPOINTS)}")
+        mix[name] = float(weight) if weight else 1.0
+    return mix
+
+
+async def run_load(args) -> Dict[str, Any]:
+    mix = parse_mix(args.mix)
+    urls = {name: args.url.rstrip("/") for name in ENDPOINTS}
+    for override in args.endpoint_url:
+        name, _, url = override.partition("=")
+        urls[name.strip()] = url.rstrip("/")
+
+    rng = random.Random(args.seed)
+    images = load_images(args.images, args.image_size, 8, args.seed)
+    print(f"🖼️ {len(images)} images, mean {sum(map(len, images)) / len(images) / 1024:.0f} KB")
+
+    connector = aiohttp.TCPConnector(limit=args.max_connections)
+    timeout = aiohttp.ClientTimeout(total=args.timeout)
+    steps = []
+    saturation = None
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        for rate in args.rates:
+            print(f"\n🚦 {rate:g} req/s for {args.duration:g}s ({args.arrivals} arrivals)")
+            samples = await run_step(session, urls, mix, rate, args.duration, images,
+                                     args.image_ratio, args.arrivals, rng)
+            step = summarize_step(samples, rate, args.duration)
+            step["saturation_reasons"] = is_saturated(step, args.min_throughput_ratio,
+                                                      args.max_error_rate, args.slo_p99_ms)
+            steps.append(step)
+
+            service, response = step["service_time"], step["response_time"]
+            print(f"   ✅ {step['throughput_rps']:.1f} req/s  errors {step['error_rate']:.1%}  "
+                  f"service p50/p99 {service['p50_ms'] or 0:.0f}/{service['p99_ms'] or 0:.0f} ms  "
+                  f"corrected p50/p99 {response['p50_ms'] or 0:.0f}/{response['p99_ms'] or 0:.0f} ms")
+            for name, endpoint in step["endpoints"].items():
+                print(f"      {name:<11} {endpoint['requests']:5d} req  errors {endpoint['error_rate']:6.1%}  "
+                      f"corrected p99 {endpoint['response_time']['p99_ms'] or 0:8.0f} ms")
+
+            if step["saturation_reasons"]:
+                print(f"   ⚠️ Saturated: {'; '.join(step['saturation_reasons'])}")
+                if saturation is None:
+                    saturation = rate
+                if args.stop_at_saturation:
+                    break
+            if args.pause > 0:
+                await asyncio.sleep(args.pause)
+
+    sustained = [step["offered_rps"] for step in steps if not step["saturation_reasons"]]
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "config": {
+            "urls": {name: urls[name] for name in mix},
+            "mix": mix,
+            "arrivals": args.arrivals,
+            "duration_s": args.duration,
+            "image_ratio": args.image_ratio,
+            "max_connections": args.max_connections,
+            "slo_p99_ms": args.slo_p99_ms,
+            "seed": args.seed
+        },
+        "max_sustained_rps": max(sustained) if sustained else None,
+        "saturation_rps": saturation,
+        "steps": steps
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Open-loop load test for the RescueLanka gateways")
+    parser.add_argument("--url", default="http://localhost:8000", help="Gateway base URL")
+    parser.add_argument("--endpoint-url", action="append", default=[],
+                        help="Per-endpoint base URL override, e.g. combined=http://localhost:8002")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"Endpoint weights ({', '.join(ENDPOINTS)})")
+    parser.add_argument("--rates", type=lambda v: [float(r) for r in v.split(",")], default=[5.0, 10.0, 20.0],
+                        help="Arrival rates (req/s) to step through")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds per rate step")
+    parser.add_argument("--arrivals", choices=["poisson", "uniform"], default="poisson")
+    parser.add_argument("--image-ratio", type=float, default=0.6,
+                        help="Share of reports to optional-image endpoints that carry an image")
+    parser.add_argument("--images", type=Path, help="Directory of JPEG/PNG images (default: synthetic)")
+    parser.add_argument("--image-size", type=int, default=1024, help="Synthetic image side")
+    parser.add_argument("--max-connections", type=int, default=256)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--slo-p99-ms", type=float, default=2000.0, help="Corrected p99 target per step")
+    parser.add_argument("--max-error-rate", type=float, default=0.01)
+    parser.add_argument("--min-throughput-ratio", type=float, default=0.95)
+    parser.add_argument("--stop-at-saturation", action="store_true")
+    parser.add_argument("--pause", type=float, default=2.0, help="Seconds between rate steps")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="Write the JSON report here")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_load(args))
+    if report["saturation_rps"] is not None:
+        print(f"\n📈 Max sustained: {report['max_sustained_rps']} req/s, saturated at {report['saturation_rps']:g} req/s")
+    else:
+        print(f"\n📈 No saturation up to {max(args.rates):g} req/s")
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+        print(f"💾 Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
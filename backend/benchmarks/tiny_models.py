@@ -0,0 +1,185 @@
+"""
+Synthetic tiny stand-in models for benchmarking
+backend/benchmarks/tiny_models.py
+
+Writes small, randomly initialised artifacts in the layout the services load:
+
+    <output>/emergency_classifier/   HF sequence classifier (2 labels)
+    <output>/urgency_classifier/     HF sequence classifier (4 labels)
+    <output>/vlm/models/feature_extractor.h5
+    <output>/vlm/models/disaster_classifier.pkl
+
+    python benchmarks/tiny_models.py --output bench_models
+
+The models predict nothing useful; they exercise every loading and inference
+path (tokenization, batching, CNN features, sklearn scoring) in seconds and
+are deterministic for a given --seed, so benchmark runs stay comparable.
+"""
+
+import json
+import pickle
+import shutil
+import argparse
+import platform
+from pathlib import Path
+from typing import Any, Dict
+
+import numpy as np
+
+# Disaster types the services map classifier outputs onto (keep in sync)
+NUM_DISASTER_CLASSES = 10
+
+# Small English vocabulary plus character pieces so any ASCII text tokenizes
+VOCAB_WORDS = """
+help emergency urgent rescue trapped fire smoke flood water flooding rising
+landslide earthquake cyclone tsunami collapse collapsed building house road
+bridge people family child children injured dead missing need needs food
+medicine doctor hospital evacuate evacuation shelter boat power electricity
+the a an and or in on at of to is are was were we i my our please now
+colombo kandy galle jaffna batticaloa ratnapura street village near river
+""".split()
+
+
+def _write_vocab(path: Path):
+    specials = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"]
+    characters = [chr(c) for c in range(ord("a"), ord("z") + 1)] + list("0123456789.,!?'-")
+    pieces = [f"##{c}" for c in characters]
+    tokens = specials + sorted(set(VOCAB_WORDS)) + characters + pieces
+    path.write_text("\n".join(tokens) + "\n", encoding="utf-8")
+    return len(tokens)
+
+
+def build_text_classifier(output_dir: Path, num_labels: int, seed: int, hidden_size: int = 32,
+                          num_layers: int = 2, max_length: int = 128) -> Dict[str, Any]:
+    """Tiny BERT classifier + fast tokenizer saved with save_pretrained"""
+    import torch
+    from transformers import BertConfig, BertForSequenceClassification, BertTokenizerFast
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    vocab_path = output_dir / "vocab.txt"
+    vocab_size = _write_vocab(vocab_path)
+
+    tokenizer = BertTokenizerFast(vocab_file=str(vocab_path), do_lower_case=True,
+                                  model_max_length=max_length)
+    tokenizer.save_pretrained(str(output_dir))
+
+    torch.manual_seed(seed)
+    config = BertConfig(
+        vocab_size=vocab_size,
+        hidden_size=hidden_size,
+        num_hidden_layers=num_layers,
+        num_attention_heads=2,
+        intermediate_size=hidden_size * 2,
+        max_position_embeddings=max_length,
+        num_labels=num_labels
+    )
+    model = BertForSequenceClassification(config)
+    model.eval()
+    model.save_pretrained(str(output_dir), safe_serialization=True)
+
+    return {
+        "path": str(output_dir),
+        "num_labels": num_labels,
+        "vocab_size": vocab_size,
+        "parameters": int(sum(p.numel() for p in model.parameters()))
+    }
+
+
+def build_feature_extractor(path: Path, seed: int, image_side: int = 64, feature_dim: int = 32) -> Dict[str, Any]:
+    """Two strided convolutions + pooling, saved as HDF5"""
+    import tensorflow as tf
+
+    tf.random.set_seed(seed)
+    model = tf.keras.Sequential([
+        tf.keras.Input(shape=(image_side, image_side, 3)),
+        tf.keras.layers.Conv2D(8, 3, strides=2, activation="relu"),
+        tf.keras.layers.Conv2D(16, 3, strides=2, activation="relu"),
+        tf.keras.layers.GlobalAveragePooling2D(),
+        tf.keras.layers.Dense(feature_dim, activation="relu")
+    ])
+    path.parent.mkdir(parents=True, exist_ok=True)
+    model.save(str(path))
+
+    return {
+        "path": str(path),
+        "input_shape": [image_side, image_side, 3],
+        "feature_dim": feature_dim,
+        "parameters": int(model.count_params())
+    }
+
+
+def build_disaster_classifier(path: Path, seed: int, feature_dim: int = 32,
+                              num_classes: int = NUM_DISASTER_CLASSES) -> Dict[str, Any]:
+    """LogisticRegression fitted on separable random features (has predict_proba)"""
+    from sklearn.linear_model import LogisticRegression
+
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(0.0, 1.0, size=(num_classes, feature_dim))
+    labels = np.repeat(np.arange(num_classes), 20)
+    features = np.abs(centers[labels] + rng.normal(0.0, 0.5, size=(len(labels), feature_dim)))
+
+    classifier = LogisticRegression(max_iter=500)
+    classifier.fit(features, labels)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as f:
+        pickle.dump(classifier, f)
+
+    return {"path": str(path), "num_classes": num_classes, "feature_dim": feature_dim}
+
+
+def generate_tiny_models(output_dir: Path, seed: int = 0, image_side: int = 64,
+                         feature_dim: int = 32, overwrite: bool = False) -> Dict[str, Any]:
+    """Create every stand-in artifact under output_dir and return the manifest
+
+    An existing directory with a matching manifest is reused unless overwrite is set.
+    """
+    output_dir = Path(output_dir)
+    manifest_path = output_dir / "manifest.json"
+    settings = {"seed": seed, "image_side": image_side, "feature_dim": feature_dim}
+
+    if manifest_path.exists() and not overwrite:
+        manifest = json.loads(manifest_path.read_text())
+        if manifest.get("settings") == settings:
+            print(f"♻️ Reusing tiny models in {output_dir}")
+            return manifest
+
+    if output_dir.exists():
+        shutil.rmtree(output_dir)
+    output_dir.mkdir(parents=True)
+    vlm_dir = output_dir / "vlm" / "models"
+
+    print(f"🧪 Generating tiny models in {output_dir} (seed {seed})")
+    manifest = {
+        "settings": settings,
+        "python": platform.python_version(),
+        "artifacts": {
+            "emergency_classifier": build_text_classifier(output_dir / "emergency_classifier", 2, seed),
+            "urgency_classifier": build_text_classifier(output_dir / "urgency_classifier", 4, seed + 1),
+            "feature_extractor": build_feature_extractor(vlm_dir / "feature_extractor.h5", seed,
+                                                         image_side=image_side, feature_dim=feature_dim),
+            "disaster_classifier": build_disaster_classifier(vlm_dir / "disaster_classifier.pkl", seed,
+                                                             feature_dim=feature_dim)
+        }
+    }
+    manifest_path.write_text(json.dumps(manifest, indent=2))
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate tiny stand-in models for benchmarking")
+    parser.add_argument("--output", type=Path, default=Path("bench_models"))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--image-side", type=int, default=64, help="Feature extractor input side")
+    parser.add_argument("--feature-dim", type=int, default=32)
+    parser.add_argument("--overwrite", action="store_true")
+    args = parser.parse_args()
+
+    manifest = generate_tiny_models(args.output, seed=args.seed, image_side=args.image_side,
+                                    feature_dim=args.feature_dim, overwrite=args.overwrite)
+    for name, artifact in manifest["artifacts"].items():
+        print(f"   ✅ {name}: {artifact['path']}")
+
+
+if __name__ == "__main__":
+    main()
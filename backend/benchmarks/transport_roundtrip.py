@@ -0,0 +1,116 @@
+"""
+Image transport round-trip benchmark (base64 JSON vs binary body)
+backend/benchmarks/transport_roundtrip.py
+
+Posts the same image to a running image service through both transports
+and reports request latency and bytes on the wire:
+
+    python benchmarks/transport_roundtrip.py --url http://localhost:8001 --image photo.jpg
+    python benchmarks/transport_roundtrip.py --synthetic-mb 8 --output transport.json
+
+Without --image a synthetic JPEG-tagged payload of --synthetic-mb is sent,
+which the mock service accepts (it does not decode the image).
+"""
+
+import os
+import sys
+import json
+import time
+import base64
+import asyncio
+import argparse
+import statistics
+from pathlib import Path
+from typing import Dict, Any, List
+
+import aiohttp
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from binary_transport import BINARY_CONTENT_TYPE, encode_metadata_headers
+
+METADATA = {
+    "text_description": "Severe flooding in Colombo streets, vehicles submerged",
+    "location": "Colombo, Western Province",
+    "disaster_type": "flood",
+    "analysis_type": "disaster_assessment"
+}
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+async def time_transport(session: aiohttp.ClientSession, url: str, image_data: bytes,
+                         transport: str, requests: int) -> Dict[str, Any]:
+    latencies = []
+    wire_bytes = 0
+    for _ in range(requests):
+        started_at = time.perf_counter()
+        if transport == "binary":
+            headers = {"Content-Type": BINARY_CONTENT_TYPE, **encode_metadata_headers(METADATA)}
+            wire_bytes = len(image_data)
+            response = await session.post(f"{url}/analyze/image/binary", data=image_data, headers=headers)
+        else:
+            body = json.dumps({"image": base64.b64encode(image_data).decode("utf-8"), **METADATA})
+            wire_bytes = len(body)
+            response = await session.post(f"{url}/analyze/image", data=body,
+                                          headers={"Content-Type": "application/json"})
+        async with response:
+            await response.read()
+            if response.status != 200:
+                raise RuntimeError(f"{transport} request failed with HTTP {response.status}")
+        latencies.append((time.perf_counter() - started_at) * 1000)
+
+    return {
+        "requests": requests,
+        "request_bytes": wire_bytes,
+        "mean_ms": statistics.mean(latencies),
+        "p50_ms": percentile(latencies, 0.50),
+        "p95_ms": percentile(latencies, 0.95)
+    }
+
+
+async def run_benchmark(url: str, image_data: bytes, requests: int, warmup: int) -> Dict[str, Any]:
+    async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=120)) as session:
+        results = {}
+        for transport in ("base64", "binary"):
+            await time_transport(session, url, image_data, transport, warmup)
+            results[transport] = await time_transport(session, url, image_data, transport, requests)
+            print(f"📦 {transport:<7} {results[transport]['request_bytes'] / 1e6:7.2f} MB  "
+                  f"p50 {results[transport]['p50_ms']:8.1f} ms  p95 {results[transport]['p95_ms']:8.1f} ms")
+
+    return {
+        "url": url,
+        "image_bytes": len(image_data),
+        "transports": results,
+        "p50_speedup": results["base64"]["p50_ms"] / max(results["binary"]["p50_ms"], 1e-9)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare base64 JSON and binary image transport")
+    parser.add_argument("--url", default="http://localhost:8001")
+    parser.add_argument("--image", type=Path, help="Image file to send")
+    parser.add_argument("--synthetic-mb", type=float, default=5.0, help="Synthetic payload size without --image")
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--output", type=Path, help="Write the JSON report here")
+    args = parser.parse_args()
+
+    if args.image:
+        image_data = args.image.read_bytes()
+    else:
+        image_data = b"\xff\xd8\xff\xe0" + os.urandom(int(args.synthetic_mb * 1024 * 1024))
+
+    report = asyncio.run(run_benchmark(args.url.rstrip("/"), image_data, args.requests, args.warmup))
+    print(f"\n⚡ Binary transport p50 speedup: {report['p50_speedup']:.2f}x")
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+        print(f"💾 Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
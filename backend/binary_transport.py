@@ -0,0 +1,88 @@
+"""
+Binary image transport between the RescueLanka gateway and image services
+backend/binary_transport.py
+
+Images travel as the raw request body (application/octet-stream) and the
+small metadata fields travel as percent-encoded X-RescueLanka-* headers, so
+neither side base64-encodes the image or parses it out of a JSON string.
+The base64 JSON endpoints stay available for older clients.
+"""
+
+from typing import Any, Dict, Mapping, Tuple
+from urllib.parse import quote, unquote
+
+from upload_ingest import DEFAULT_MAX_UPLOAD_BYTES, sniff_image_format
+from metrics import METRICS
+
+BINARY_CONTENT_TYPE = "application/octet-stream"
+METADATA_HEADER_PREFIX = "x-rescuelanka-"
+
+
+class BinaryPayloadError(ValueError):
+    """Binary request refused; carries the HTTP status to return"""
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def encode_metadata_headers(metadata: Mapping[str, Any]) -> Dict[str, str]:
+    """{"text_description": ...} -> {"X-RescueLanka-Text-Description": ...}
+
+    Values are percent-encoded UTF-8 so Sinhala/Tamil text survives HTTP headers.
+    """
+    headers = {}
+    for field, value in metadata.items():
+        if value is None:
+            continue
+        header = "X-RescueLanka-" + "-".join(part.capitalize() for part in field.split("_"))
+        headers[header] = quote(str(value), safe="")
+    return headers
+
+
+def decode_metadata_headers(headers: Mapping[str, str]) -> Dict[str, str]:
+    """Inverse of encode_metadata_headers (header names are case-insensitive)"""
+    metadata = {}
+    for name, value in headers.items():
+        name = name.lower()
+        if name.startswith(METADATA_HEADER_PREFIX):
+            field = name[len(METADATA_HEADER_PREFIX):].replace("-", "_")
+            metadata[field] = unquote(value)
+    return metadata
+
+
+async def read_binary_image_request(request, max_bytes: int = DEFAULT_MAX_UPLOAD_BYTES) -> Tuple[bytes, Dict[str, str]]:
+    """Read a raw image body and its header metadata from a Starlette request
+
+    The body is streamed and joined once; oversized bodies are refused from
+    Content-Length or as soon as the limit is crossed.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type and content_type != BINARY_CONTENT_TYPE and not content_type.startswith("image/"):
+        raise BinaryPayloadError(f"Expected {BINARY_CONTENT_TYPE} or image/* body", status_code=415)
+
+    max_mb = max_bytes / (1024 * 1024)
+    declared = request.headers.get("content-length")
+    if declared is not None and declared.isdigit() and int(declared) > max_bytes:
+        raise BinaryPayloadError(f"Image too large (max {max_mb:g}MB)", status_code=413)
+
+    chunks = []
+    total = 0
+    with METRICS.stage("upload_read"):
+        async for chunk in request.stream():
+            if not chunk:
+                continue
+            total += len(chunk)
+            if total > max_bytes:
+                raise BinaryPayloadError(f"Image too large (max {max_mb:g}MB)", status_code=413)
+            chunks.append(chunk)
+    METRICS.observe_image(None, None, total)
+
+    if total == 0:
+        raise BinaryPayloadError("Image is required", status_code=400)
+
+    image_data = chunks[0] if len(chunks) == 1 else b"".join(chunks)
+    if sniff_image_format(image_data[:32]) is None:
+        raise BinaryPayloadError("Unsupported or invalid image format", status_code=415)
+
+    return image_data, decode_metadata_headers(request.headers)
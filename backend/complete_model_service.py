@@ -14,77 +14,78 @@ backend/complete_model_service.py
 import os
 import sys
 import pickle
-import joblib
 import numpy as np
-import cv2
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple, Union
 import logging
 import base64
 import io
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 
 # FastAPI imports
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 import uvicorn
 
-# ML/Image processing imports
-try:
-    import tensorflow as tf
-    from tensorflow.keras.models import load_model
-    from tensorflow.keras.preprocessing import image
-    from tensorflow.keras.applications.vgg16 import preprocess_input
-    from PIL import Image, ImageStat
-    HAS_TF = True
-except ImportError as e:
-    print(f"⚠️ Missing TensorFlow: {e}")
-    HAS_TF = False
+from lazy_imports import lazy_import, lazy_from, modules_available
+
+# ML/Image processing imports (probed without importing; loaded when a model is loaded)
+HAS_TF = modules_available("tensorflow", "PIL")
+if HAS_TF:
+    tf = lazy_import("tensorflow")
+    image = lazy_import("tensorflow.keras.preprocessing.image")
+    preprocess_input = lazy_from("tensorflow.keras.applications.vgg16", "preprocess_input")
+else:
+    print("⚠️ Missing TensorFlow: tensorflow/Pillow not installed")
 
 # Hugging Face imports
-try:
-    from transformers import (
-        AutoTokenizer, 
-        AutoModelForSequenceClassification,
-        pipeline
-    )
-    import torch
-    HAS_TRANSFORMERS = True
-except ImportError as e:
-    print(f"⚠️ Missing Transformers: {e}")
-    HAS_TRANSFORMERS = False
+HAS_TRANSFORMERS = modules_available("transformers", "torch")
+if HAS_TRANSFORMERS:
+    torch = lazy_import("torch")
+    AutoTokenizer = lazy_from("transformers", "AutoTokenizer")
+    AutoModelForSequenceClassification = lazy_from("transformers", "AutoModelForSequenceClassification")
+else:
+    print("⚠️ Missing Transformers: transformers/torch not installed")
+
+HAS_SKLEARN = modules_available("joblib")
+joblib = lazy_import("joblib")
 
-try:
-    import joblib
-    HAS_SKLEARN = True
-except ImportError:
-    HAS_SKLEARN = False
+from json_response import NumpyJSONResponse
+from metrics import METRICS, install_metrics, executor_samples, batcher_samples, cache_samples
+from micro_batching import MicroBatcher, DEFAULT_MAX_BATCH_SIZE, DEFAULT_MAX_WAIT_MS
+from text_inference import (
+    build_shared_text_encoder, DirectTextClassifier, resolve_emergency_labels, resolve_urgency_labels,
+    DEFAULT_TEXT_ENCODER_MODE
+)
+from text_backends import (
+    build_onnx_classifier, quantize_text_model,
+    DEFAULT_TEXT_BACKEND, DEFAULT_ONNX_THREADS, DEFAULT_TEXT_QUANTIZATION,
+    DEFAULT_MIN_LABEL_AGREEMENT, DEFAULT_QUANTIZATION_ON_FAILURE
+)
+from image_context import DecodedImage, decode_floor
+from damage_analysis import DamageAnalysisEngine
+from feature_cache import FeatureCache
+from feature_runtime import (
+    load_feature_runtime, tflite_artifact_path, DEFAULT_FEATURE_RUNTIME, DEFAULT_FEATURE_THREADS
+)
+from text_cache import TextResultCache, DEFAULT_TEXT_CACHE_PATH
+from inference_executor import InferenceExecutor, InferenceOverloaded, DEFAULT_INFERENCE_WORKERS
+from stage_graph import Stage, StageGraph
+from binary_transport import read_binary_image_request, BinaryPayloadError
+from upload_ingest import decode_base64_image, UploadRejected
+from keyword_engine import KEYWORDS, URGENCY_FALLBACK_PROBABILITIES
+from tracing import install_tracing
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def convert_numpy_types(obj: Any) -> Any:
-    """
-    Convert numpy types to native Python types for JSON serialization
-    """
-    if isinstance(obj, np.integer):
-        return int(obj)
-    elif isinstance(obj, np.floating):
-        return float(obj)
-    elif isinstance(obj, np.bool_):
-        return bool(obj)
-    elif isinstance(obj, np.ndarray):
-        return obj.tolist()
-    elif isinstance(obj, dict):
-        return {key: convert_numpy_types(value) for key, value in obj.items()}
-    elif isinstance(obj, list):
-        return [convert_numpy_types(item) for item in obj]
-    elif isinstance(obj, tuple):
-        return tuple(convert_numpy_types(item) for item in obj)
-    else:
-        return obj
+# Explicit inference device (cpu, cuda); empty = cuda when available
+DEFAULT_DEVICE = os.getenv("RESCUELANKA_DEVICE", "")
 
 class EnhancedVLMAnalyzer:
     """Enhanced VLM Analyzer with better damage detection capabilities"""
@@ -97,18 +98,28 @@ class EnhancedVLMAnalyzer:
         self.disaster_classifier = None
         self.feature_extractor = None
         self.is_loaded = False
+        
+        # Fused damage heuristics (full resolution unless a working size is configured)
+        self.damage_engine = DamageAnalysisEngine()
+        
+        # Content-addressed cache of feature vectors / classifier output
+        self.feature_cache = FeatureCache()
+    
+    @property
+    def decode_min_side(self) -> int:
+        """Smallest side JPEG decode may reduce to (covers the CNN input and any damage working size)"""
+        model_sides = self.feature_extractor.input_shape[1:3] if self.feature_extractor is not None else ()
+        return decode_floor(self.damage_engine.working_max_side, *model_sides)
     
-    def analyze_visual_damage_indicators(self, image_data: bytes) -> Dict[str, Any]:
+    def analyze_visual_damage_indicators(self, image_data: Union[bytes, DecodedImage]) -> Dict[str, Any]:
         """Analyze visual indicators of damage from the image"""
         try:
-            # Convert to PIL and OpenCV formats
-            image_pil = Image.open(io.BytesIO(image_data))
-            if image_pil.mode != 'RGB':
-                image_pil = image_pil.convert('RGB')
+            # Reuse the request's decoded image (decodes only if given raw bytes)
+            decoded = DecodedImage.ensure(image_data, min_side=self.decode_min_side)
             
-            # Convert to OpenCV format for analysis
-            image_cv = cv2.cvtColor(np.array(image_pil), cv2.COLOR_RGB2BGR)
-            gray = cv2.cvtColor(image_cv, cv2.COLOR_BGR2GRAY)
+            # Fused single-pass measurements at the working resolution
+            with METRICS.stage("damage_heuristics"):
+                measurements = self.damage_engine.measure(decoded.rgb)
             
             # Initialize damage indicators
             damage_indicators = {
@@ -120,41 +131,23 @@ class EnhancedVLMAnalyzer:
             }
             
             # 1. Analyze edges for structural damage (broken lines, irregular patterns)
-            edges = cv2.Canny(gray, 50, 150)
-            edge_density = np.sum(edges > 0) / (edges.shape[0] * edges.shape[1])
+            edge_density = measurements["edge_density"]
             
             # High edge density often indicates debris, broken structures
             if edge_density > 0.15:  # Threshold for high damage
                 damage_indicators["structural_damage_score"] = min(1.0, float(edge_density * 3))
             
-            # 2. Analyze color distribution for fire/smoke (orange, red, black areas)
-            hsv = cv2.cvtColor(image_cv, cv2.COLOR_BGR2HSV)
-            
-            # Fire colors (orange/red)
-            fire_lower = np.array([0, 50, 50])
-            fire_upper = np.array([30, 255, 255])
-            fire_mask = cv2.inRange(hsv, fire_lower, fire_upper)
-            fire_ratio = np.sum(fire_mask > 0) / (fire_mask.shape[0] * fire_mask.shape[1])
-            
-            # Smoke colors (dark gray/black)
-            smoke_lower = np.array([0, 0, 0])
-            smoke_upper = np.array([180, 50, 80])
-            smoke_mask = cv2.inRange(hsv, smoke_lower, smoke_upper)
-            smoke_ratio = np.sum(smoke_mask > 0) / (smoke_mask.shape[0] * smoke_mask.shape[1])
-            
+            # 2. Analyze color distribution for fire/smoke (orange/red and dark gray/black areas)
+            fire_ratio = measurements["fire_ratio"]
+            smoke_ratio = measurements["smoke_ratio"]
             damage_indicators["smoke_fire_indicators"] = min(1.0, float((fire_ratio + smoke_ratio) * 5))
             
             # 3. Analyze water presence (blue areas, reflections)
-            water_lower = np.array([100, 50, 50])
-            water_upper = np.array([130, 255, 255])
-            water_mask = cv2.inRange(hsv, water_lower, water_upper)
-            water_ratio = np.sum(water_mask > 0) / (water_mask.shape[0] * water_mask.shape[1])
-            
+            water_ratio = measurements["water_ratio"]
             damage_indicators["water_damage_indicators"] = min(1.0, float(water_ratio * 4))
             
             # 4. Texture analysis for debris
-            # Calculate local binary patterns or texture variance
-            laplacian_var = cv2.Laplacian(gray, cv2.CV_64F).var()
+            laplacian_var = measurements["laplacian_var"]
             # Normalize variance (typical range 0-10000)
             texture_score = min(1.0, float(laplacian_var / 5000))
             damage_indicators["debris_presence"] = texture_score
@@ -174,12 +167,12 @@ class EnhancedVLMAnalyzer:
             damage_indicators["overall_damage_score"] = float(overall_score)
             
             # 6. Image statistics
-            stat = ImageStat.Stat(image_pil)
-            damage_indicators["brightness"] = float(sum(stat.mean) / len(stat.mean) / 255.0)
-            damage_indicators["contrast"] = float(sum(stat.stddev) / len(stat.stddev) / 255.0)
+            channel_mean = measurements["channel_mean"]
+            channel_stddev = measurements["channel_stddev"]
+            damage_indicators["brightness"] = float(sum(channel_mean) / len(channel_mean) / 255.0)
+            damage_indicators["contrast"] = float(sum(channel_stddev) / len(channel_stddev) / 255.0)
             
-            # Convert all numpy types to Python types
-            return convert_numpy_types(damage_indicators)
+            return damage_indicators
             
         except Exception as e:
             logger.error(f"Visual damage analysis failed: {e}")
@@ -256,8 +249,7 @@ class EnhancedVLMAnalyzer:
             }
         }
         
-        # Convert all numpy types to Python types
-        return convert_numpy_types(result)
+        return result
     
     def _categorize_damage_level(self, damage_score: float) -> str:
         """Categorize overall damage level"""
@@ -270,86 +262,166 @@ class EnhancedVLMAnalyzer:
         else:
             return "minimal"
     
-    def classify_disaster_from_image(self, image_data: bytes) -> Dict[str, Any]:
+    def _prepare_model_input(self, decoded: DecodedImage) -> np.ndarray:
+        """Resize and preprocess one decoded image for the feature extractor (VGG16 style)"""
+        input_shape = self.feature_extractor.input_shape[1:3]
+        image_pil = decoded.resized(input_shape)
+        img_array = image.img_to_array(image_pil)
+        return preprocess_input(img_array)
+    
+    def _extract_and_score(self, img_batch: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Extract features and score a stacked (N, H, W, 3) batch in one pass each"""
+        # Extract features using trained model (single forward pass)
+        with METRICS.stage("feature_extraction"):
+            features = self.feature_extractor.predict(img_batch, verbose=0)
+        features_flat = features.reshape(len(img_batch), -1)
+        
+        # Classify disaster type using trained classifier (single scoring call)
+        if hasattr(self.disaster_classifier, 'predict_proba'):
+            with METRICS.stage("classifier_scoring"):
+                return features_flat, np.asarray(self.disaster_classifier.predict_proba(features_flat))
+        
+        with METRICS.stage("classifier_scoring"):
+            predictions = self.disaster_classifier.predict(features_flat)
+        probabilities = np.zeros((len(img_batch), len(self.disaster_types)))
+        for row, prediction in enumerate(predictions):
+            predicted_class_idx = prediction if isinstance(prediction, int) else 0
+            # Create mock probabilities
+            probabilities[row, :] = 0.15 / (len(self.disaster_types) - 1)
+            probabilities[row, predicted_class_idx] = 0.85
+        return features_flat, probabilities
+    
+    def _predict_probabilities(self, decoded_images: List[DecodedImage]) -> List[np.ndarray]:
+        """Classifier probabilities per image, running the CNN only for cache misses"""
+        cache = self.feature_cache
+        input_shape = self.feature_extractor.input_shape[1:3]
+        with METRICS.stage("preprocessing"):
+            keys = [cache.make_key(decoded.resized(input_shape)) if cache.enabled else None
+                    for decoded in decoded_images]
+        
+        probabilities: List[Optional[np.ndarray]] = [None] * len(decoded_images)
+        misses = []
+        for position, key in enumerate(keys):
+            entry = cache.get(key) if key is not None else None
+            if entry is not None and entry.outputs is not None:
+                probabilities[position] = entry.outputs
+            else:
+                misses.append(position)
+        
+        if misses:
+            with METRICS.stage("preprocessing"):
+                img_batch = np.stack([self._prepare_model_input(decoded_images[i]) for i in misses], axis=0)
+            features_flat, miss_probabilities = self._extract_and_score(img_batch)
+            for row, position in enumerate(misses):
+                probabilities[position] = miss_probabilities[row]
+                if keys[position] is not None:
+                    cache.put(keys[position], features_flat[row], np.asarray(miss_probabilities[row]))
+        
+        return probabilities
+    
+    def _build_image_result(self, decoded: DecodedImage, probabilities: np.ndarray) -> Dict[str, Any]:
+        """Combine classifier probabilities with visual damage analysis for one image"""
+        predicted_class_idx = int(np.argmax(probabilities))
+        
+        # Ensure valid index
+        predicted_class_idx = min(predicted_class_idx, len(self.disaster_types) - 1)
+        predicted_disaster = self.disaster_types[predicted_class_idx]
+        base_confidence = float(probabilities[predicted_class_idx])
+        
+        # Analyze visual damage indicators
+        damage_analysis = self.analyze_visual_damage_indicators(decoded)
+        overall_damage_score = damage_analysis["overall_damage_score"]
+        
+        # Enhanced damage assessment
+        severity_assessment = self._assess_enhanced_severity(
+            predicted_disaster, base_confidence, damage_analysis
+        )
+        
+        # Create comprehensive disaster probabilities
+        disaster_probabilities = {
+            disaster_type: float(prob) 
+            for disaster_type, prob in zip(self.disaster_types, probabilities)
+        }
+        
+        result = {
+            "predicted_type": predicted_disaster,
+            "confidence": base_confidence,
+            "all_probabilities": disaster_probabilities,
+            "damage_analysis": damage_analysis,
+            "severity_assessment": severity_assessment,
+            "enhanced_confidence": min(1.0, base_confidence + (overall_damage_score * 0.2)),
+            "visual_indicators": {
+                "structural_damage": bool(damage_analysis["structural_damage_score"] > 0.4),
+                "debris_detected": bool(damage_analysis["debris_presence"] > 0.5),
+                "fire_smoke_detected": bool(damage_analysis["smoke_fire_indicators"] > 0.3),
+                "water_damage": bool(damage_analysis["water_damage_indicators"] > 0.3),
+                "overall_damage_level": self._categorize_damage_level(overall_damage_score)
+            },
+            "image_info": decoded.describe(),
+            "prediction_method": "enhanced_trained_model"
+        }
+        
+        return result
+    
+    def classify_disaster_from_image(self, image_data: Union[bytes, DecodedImage]) -> Dict[str, Any]:
         """Enhanced disaster classification using trained models + visual analysis"""
         if not self.is_loaded:
             return {"error": "VLM models not loaded"}
         
         try:
-            # 1. Preprocess image for feature extractor
-            image_pil = Image.open(io.BytesIO(image_data))
-            if image_pil.mode != 'RGB':
-                image_pil = image_pil.convert('RGB')
-            
-            # Resize to model input size
-            input_shape = self.feature_extractor.input_shape[1:3]
-            image_pil = image_pil.resize(input_shape)
-            
-            # Convert to array and preprocess (VGG16 style)
-            img_array = image.img_to_array(image_pil)
-            img_array = np.expand_dims(img_array, axis=0)
-            img_array = preprocess_input(img_array)
-            
-            # 2. Extract features using trained model
-            features = self.feature_extractor.predict(img_array, verbose=0)
-            features_flat = features.flatten()
-            
-            # 3. Classify disaster type using trained classifier
-            if hasattr(self.disaster_classifier, 'predict_proba'):
-                probabilities = self.disaster_classifier.predict_proba([features_flat])[0]
-                predicted_class_idx = np.argmax(probabilities)
-            else:
-                prediction = self.disaster_classifier.predict([features_flat])[0]
-                predicted_class_idx = prediction if isinstance(prediction, int) else 0
-                # Create mock probabilities
-                probabilities = np.zeros(len(self.disaster_types))
-                probabilities[predicted_class_idx] = 0.85
-                probabilities[probabilities == 0] = 0.15 / (len(probabilities) - 1)
-            
-            # Ensure valid index
-            predicted_class_idx = min(predicted_class_idx, len(self.disaster_types) - 1)
-            predicted_disaster = self.disaster_types[predicted_class_idx]
-            base_confidence = float(probabilities[predicted_class_idx])
-            
-            # 4. Analyze visual damage indicators
-            damage_analysis = self.analyze_visual_damage_indicators(image_data)
-            overall_damage_score = damage_analysis["overall_damage_score"]
-            
-            # 5. Enhanced damage assessment
-            severity_assessment = self._assess_enhanced_severity(
-                predicted_disaster, base_confidence, damage_analysis
-            )
-            
-            # 6. Create comprehensive disaster probabilities
-            disaster_probabilities = {
-                disaster_type: float(prob) 
-                for disaster_type, prob in zip(self.disaster_types, probabilities)
-            }
-            
-            result = {
-                "predicted_type": predicted_disaster,
-                "confidence": base_confidence,
-                "all_probabilities": disaster_probabilities,
-                "damage_analysis": damage_analysis,
-                "severity_assessment": severity_assessment,
-                "enhanced_confidence": min(1.0, base_confidence + (overall_damage_score * 0.2)),
-                "visual_indicators": {
-                    "structural_damage": bool(damage_analysis["structural_damage_score"] > 0.4),
-                    "debris_detected": bool(damage_analysis["debris_presence"] > 0.5),
-                    "fire_smoke_detected": bool(damage_analysis["smoke_fire_indicators"] > 0.3),
-                    "water_damage": bool(damage_analysis["water_damage_indicators"] > 0.3),
-                    "overall_damage_level": self._categorize_damage_level(overall_damage_score)
-                },
-                "prediction_method": "enhanced_trained_model"
-            }
-            
-            # Convert all numpy types to Python types
-            return convert_numpy_types(result)
+            # Decode once; features come from the cache or one CNN pass
+            decoded = DecodedImage.ensure(image_data, min_side=self.decode_min_side)
+            probabilities = self._predict_probabilities([decoded])[0]
+            return self._build_image_result(decoded, probabilities)
             
         except Exception as e:
             logger.error(f"Enhanced disaster classification failed: {e}")
             return {"error": str(e)}
     
+    def classify_disasters_from_images(self, images: List[Union[bytes, DecodedImage]]) -> List[Dict[str, Any]]:
+        """Classify several images with one feature-extractor pass and one classifier call
+        
+        Results are returned in input order; images that fail to decode get an
+        error entry without affecting the rest of the batch.
+        """
+        if not self.is_loaded:
+            return [{"error": "VLM models not loaded"} for _ in images]
+        
+        results: List[Optional[Dict[str, Any]]] = [None] * len(images)
+        decoded_images = []
+        positions = []
+        
+        # 1. Decode each image
+        for position, image_data in enumerate(images):
+            try:
+                decoded_images.append(DecodedImage.ensure(image_data, min_side=self.decode_min_side))
+                positions.append(position)
+            except Exception as e:
+                logger.error(f"Image {position} preprocessing failed: {e}")
+                results[position] = {"error": str(e)}
+        
+        if not decoded_images:
+            return results
+        
+        # 2. One stacked forward pass + one scoring call for all cache misses
+        try:
+            probabilities = self._predict_probabilities(decoded_images)
+        except Exception as e:
+            logger.error(f"Batched disaster classification failed: {e}")
+            for position in positions:
+                results[position] = {"error": str(e)}
+            return results
+        
+        # 3. Per-image damage analysis and assessment
+        for row, (position, decoded) in enumerate(zip(positions, decoded_images)):
+            try:
+                results[position] = self._build_image_result(decoded, probabilities[row])
+            except Exception as e:
+                logger.error(f"Image {position} assessment failed: {e}")
+                results[position] = {"error": str(e)}
+        
+        return results
+    
     def generate_enhanced_recommendations(self, disaster_type: str, severity_assessment: Dict[str, Any], 
                                         damage_analysis: Dict[str, Any]) -> List[str]:
         """Generate enhanced recommendations based on visual analysis"""
@@ -415,17 +487,60 @@ class EnhancedVLMAnalyzer:
 class CompleteModelService:
     """Complete service using all your trained models with enhanced VLM"""
     
-    def __init__(self, models_base_dir="models"):
+    def __init__(self, models_base_dir="models", batch_max_size: int = DEFAULT_MAX_BATCH_SIZE,
+                 batch_max_wait_ms: float = DEFAULT_MAX_WAIT_MS,
+                 text_encoder_mode: str = DEFAULT_TEXT_ENCODER_MODE,
+                 text_backend: str = DEFAULT_TEXT_BACKEND, onnx_threads: int = DEFAULT_ONNX_THREADS,
+                 text_quantization: str = DEFAULT_TEXT_QUANTIZATION,
+                 quantization_min_agreement: float = DEFAULT_MIN_LABEL_AGREEMENT,
+                 quantization_on_failure: str = DEFAULT_QUANTIZATION_ON_FAILURE,
+                 feature_runtime: str = DEFAULT_FEATURE_RUNTIME, feature_threads: int = DEFAULT_FEATURE_THREADS):
         self.models_base_dir = Path(models_base_dir)
         
+        # Micro-batching configuration for the text classifiers
+        self.batch_max_size = batch_max_size
+        self.batch_max_wait_ms = batch_max_wait_ms
+        
+        # Shared tokenizer / multi-head mode (auto, separate, shared_tokenizer, multi_head)
+        self.text_encoder_mode = text_encoder_mode
+        
+        # Requested text inference backend (pytorch, onnx) and the one actually serving each model
+        self.text_backend = text_backend
+        self.onnx_threads = onnx_threads
+        self.text_backends_active = {"emergency": "pytorch", "urgency": "pytorch"}
+        
+        # Opt-in dynamic INT8 quantization (none, int8) guarded by calibration-set label agreement
+        self.text_quantization = text_quantization
+        self.quantization_min_agreement = quantization_min_agreement
+        self.quantization_on_failure = quantization_on_failure
+        self.text_quantization_active = {"emergency": "none", "urgency": "none"}
+        
+        # Feature extractor runtime (keras, tflite, auto) and interpreter threads
+        self.feature_runtime = feature_runtime
+        self.feature_threads = feature_threads
+        
         # Model instances
         self.emergency_classifier = None
         self.emergency_tokenizer = None
-        self.emergency_pipeline = None
+        self.emergency_runner = None
+        self.emergency_labels = None
+        self.emergency_batcher = None
         
         self.urgency_classifier = None  
         self.urgency_tokenizer = None
-        self.urgency_pipeline = None
+        self.urgency_runner = None
+        self.urgency_labels = None
+        self.urgency_batcher = None
+        
+        # Shared tokenization across both text models (when compatible)
+        self.shared_text_encoder = None
+        self.text_batcher = None
+        
+        # Two-tier (memory + SQLite) cache of text classification results
+        self.text_cache = TextResultCache(
+            Path(DEFAULT_TEXT_CACHE_PATH) if DEFAULT_TEXT_CACHE_PATH
+            else self.models_base_dir / ".cache" / "text_results.sqlite3"
+        )
         
         self.disaster_classifier = None
         self.feature_extractor = None
@@ -433,6 +548,19 @@ class CompleteModelService:
         # Enhanced VLM analyzer
         self.enhanced_vlm = EnhancedVLMAnalyzer()
         
+        # Bounded thread pool that async endpoints await for blocking model calls
+        self.executor = InferenceExecutor()
+        
+        # complete_analysis stages run on their own pool: the request itself already
+        # occupies a worker of self.executor, so sharing it could deadlock
+        self.stage_executor = InferenceExecutor(
+            max_workers=max(2, DEFAULT_INFERENCE_WORKERS), max_pending=0, name="analysis_stage"
+        )
+        self.analysis_graph = self._build_analysis_graph()
+        
+        # Queue depths and cache hit rates are read from get_stats() at scrape time
+        METRICS.register_collector("complete_model_service", self._metric_samples)
+        
         # Model paths
         self.emergency_path = self.models_base_dir / "emergency_classifier"
         self.urgency_path = self.models_base_dir / "urgency_classifier"
@@ -446,6 +574,14 @@ class CompleteModelService:
             "feature_extractor": False
         }
         
+        # Per-model load state (pending, loading, ready, failed, unavailable) for readiness checks
+        self.model_states = {
+            name: {"state": "pending", "load_seconds": None, "error": None}
+            for name in self.models_loaded
+        }
+        self.loading_thread = None
+        self.loading_complete = threading.Event()
+        
         # Disaster types and urgency levels
         self.disaster_types = [
             'earthquake', 'flood', 'fire', 'landslide', 'cyclone', 
@@ -454,9 +590,10 @@ class CompleteModelService:
         
         self.urgency_levels = ["LOW", "MEDIUM", "HIGH", "CRITICAL"]
         
-        # Device selection
-        self.device = "cuda" if torch.cuda.is_available() and HAS_TRANSFORMERS else "cpu"
-        logger.info(f"🖥️ Using device: {self.device}")
+        # Device selection (RESCUELANKA_DEVICE, or probed when models load so torch
+        # is not imported at construction time)
+        self.device = DEFAULT_DEVICE or "cpu"
+        self.device_resolved = bool(DEFAULT_DEVICE)
     
     def check_model_files(self):
         """Check which model files are available"""
@@ -502,6 +639,13 @@ class CompleteModelService:
             exists = file_path.exists()
             size = file_path.stat().st_size if exists else 0
             logger.info(f"   {'✅' if exists else '❌'} {file_name} ({size} bytes)")
+        
+        # Report the feature extractor runtime and whether its converted artifact is cached
+        extractor_path = vlm_files["feature_extractor.h5"]
+        if extractor_path.exists():
+            artifact = tflite_artifact_path(extractor_path)
+            logger.info(f"⚙️ Feature extractor runtime: {self.feature_runtime} "
+                        f"(TFLite artifact {'✅ cached' if artifact.exists() else '❌ not converted yet'}: {artifact.name})")
     
     def load_emergency_classifier(self):
         """Load emergency classification model (Hugging Face)"""
@@ -529,16 +673,49 @@ class CompleteModelService:
             self.emergency_classifier.eval()
             logger.info("✅ Emergency model loaded")
             
-            # Create pipeline
-            self.emergency_pipeline = pipeline(
-                "text-classification",
-                model=self.emergency_classifier,
-                tokenizer=self.emergency_tokenizer,
-                device=0 if self.device == "cuda" else -1,
-                top_k=None
+            # Serve through ONNX Runtime when requested and it passes the parity check
+            onnx_classifier = None
+            if self.text_backend == "onnx":
+                onnx_classifier = build_onnx_classifier(
+                    self.emergency_classifier, self.emergency_tokenizer, self.emergency_path,
+                    name="emergency_classifier", intra_op_threads=self.onnx_threads,
+                    quantization=self.text_quantization,
+                    min_agreement=self.quantization_min_agreement,
+                    on_failure=self.quantization_on_failure
+                )
+            
+            if onnx_classifier is not None:
+                self.emergency_runner = onnx_classifier
+                self.text_backends_active["emergency"] = "onnx"
+                self.text_quantization_active["emergency"] = onnx_classifier.quantization
+                # Parity passed and the session holds its own weights; keeping the
+                # PyTorch copy as well would double the classifier's memory
+                self.emergency_classifier = None
+            else:
+                if self.text_quantization == "int8":
+                    self.emergency_classifier = self._quantize_text_model(
+                        self.emergency_classifier, self.emergency_tokenizer, "emergency"
+                    )
+                
+                # Tokenize + forward directly; no pipeline pre/post-processing per call
+                self.emergency_runner = DirectTextClassifier(
+                    self.emergency_classifier, self.emergency_tokenizer, device=self.device
+                )
+                logger.info("✅ Emergency runner created")
+            
+            # Resolve which output is which once, instead of matching label strings per request
+            self.emergency_labels = resolve_emergency_labels(self.emergency_runner.config)
+            logger.info(f"🏷️ Emergency labels ({self.emergency_labels.strategy}): {self.emergency_labels.signature}")
+            
+            # Batch concurrent requests into one padded forward pass
+            self.emergency_batcher = MicroBatcher(
+                lambda texts: list(self.emergency_runner.predict_scores(texts)),
+                name="emergency_classifier",
+                max_batch_size=self.batch_max_size,
+                max_wait_ms=self.batch_max_wait_ms
             )
-            logger.info("✅ Emergency pipeline created")
             
+            self.text_cache.register_model("emergency", self.emergency_path, variant=self._text_model_variant("emergency"))
             self.models_loaded["emergency_classifier"] = True
             return True
             
@@ -572,16 +749,49 @@ class CompleteModelService:
             self.urgency_classifier.eval()
             logger.info("✅ Urgency model loaded")
             
-            # Create pipeline
-            self.urgency_pipeline = pipeline(
-                "text-classification",
-                model=self.urgency_classifier,
-                tokenizer=self.urgency_tokenizer,
-                device=0 if self.device == "cuda" else -1,
-                top_k=None
+            # Serve through ONNX Runtime when requested and it passes the parity check
+            onnx_classifier = None
+            if self.text_backend == "onnx":
+                onnx_classifier = build_onnx_classifier(
+                    self.urgency_classifier, self.urgency_tokenizer, self.urgency_path,
+                    name="urgency_classifier", intra_op_threads=self.onnx_threads,
+                    quantization=self.text_quantization,
+                    min_agreement=self.quantization_min_agreement,
+                    on_failure=self.quantization_on_failure
+                )
+            
+            if onnx_classifier is not None:
+                self.urgency_runner = onnx_classifier
+                self.text_backends_active["urgency"] = "onnx"
+                self.text_quantization_active["urgency"] = onnx_classifier.quantization
+                # Parity passed and the session holds its own weights; keeping the
+                # PyTorch copy as well would double the classifier's memory
+                self.urgency_classifier = None
+            else:
+                if self.text_quantization == "int8":
+                    self.urgency_classifier = self._quantize_text_model(
+                        self.urgency_classifier, self.urgency_tokenizer, "urgency"
+                    )
+                
+                # Tokenize + forward directly; no pipeline pre/post-processing per call
+                self.urgency_runner = DirectTextClassifier(
+                    self.urgency_classifier, self.urgency_tokenizer, device=self.device
+                )
+                logger.info("✅ Urgency runner created")
+            
+            # Resolve which output is which once, instead of matching label strings per request
+            self.urgency_labels = resolve_urgency_labels(self.urgency_runner.config, self.urgency_levels)
+            logger.info(f"🏷️ Urgency labels ({self.urgency_labels.strategy}): {self.urgency_labels.signature}")
+            
+            # Batch concurrent requests into one padded forward pass
+            self.urgency_batcher = MicroBatcher(
+                lambda texts: list(self.urgency_runner.predict_scores(texts)),
+                name="urgency_classifier",
+                max_batch_size=self.batch_max_size,
+                max_wait_ms=self.batch_max_wait_ms
             )
-            logger.info("✅ Urgency pipeline created")
             
+            self.text_cache.register_model("urgency", self.urgency_path, variant=self._text_model_variant("urgency"))
             self.models_loaded["urgency_classifier"] = True
             return True
             
@@ -589,6 +799,26 @@ class CompleteModelService:
             logger.error(f"❌ Failed to load urgency classifier: {e}")
             return False
     
+    def _quantize_text_model(self, model, tokenizer, task: str):
+        """Serve a dynamically INT8-quantized copy of a text model if it passes the accuracy guard"""
+        if self.device != "cpu":
+            logger.warning(f"⚠️ INT8 dynamic quantization is CPU-only - {task} classifier stays float32")
+            return model
+        
+        model, quantized = quantize_text_model(
+            model, tokenizer, f"{task}_classifier",
+            min_agreement=self.quantization_min_agreement,
+            on_failure=self.quantization_on_failure
+        )
+        if quantized:
+            self.text_quantization_active[task] = "int8"
+        return model
+    
+    def _text_model_variant(self, task: str) -> str:
+        """Backend/precision/label-map tag mixed into the text cache fingerprint"""
+        labels = self.emergency_labels if task == "emergency" else self.urgency_labels
+        return f"{self.text_backends_active[task]}-{self.text_quantization_active[task]}-{labels.signature}"
+    
     def load_disaster_classifier(self):
         """Load disaster classification model (pickle/joblib)"""
         try:
@@ -639,8 +869,10 @@ class CompleteModelService:
                 logger.error(f"❌ Feature extractor not found: {extractor_path}")
                 return False
             
-            self.feature_extractor = load_model(str(extractor_path))
-            logger.info("✅ Feature extractor loaded")
+            self.feature_extractor = load_feature_runtime(
+                extractor_path, runtime=self.feature_runtime, num_threads=self.feature_threads
+            )
+            logger.info(f"✅ Feature extractor loaded (runtime: {self.feature_extractor.runtime})")
             logger.info(f"   Input shape: {self.feature_extractor.input_shape}")
             logger.info(f"   Output shape: {self.feature_extractor.output_shape}")
             
@@ -651,51 +883,167 @@ class CompleteModelService:
             logger.error(f"❌ Failed to load feature extractor: {e}")
             return False
     
+    def configure_shared_text_encoder(self):
+        """Tokenize once (and optionally encode once) when both text checkpoints are compatible"""
+        onnx_runners = None
+        if self.text_backends_active["emergency"] == "onnx" and self.text_backends_active["urgency"] == "onnx":
+            onnx_runners = (self.emergency_runner, self.urgency_runner)
+        elif self.text_backends_active["emergency"] != self.text_backends_active["urgency"]:
+            logger.info("ℹ️ Text models run on different backends - models run separately")
+            self.shared_text_encoder = None
+            self.text_batcher = None
+            return
+        
+        try:
+            self.shared_text_encoder = build_shared_text_encoder(
+                self.emergency_tokenizer, self.emergency_classifier,
+                self.urgency_tokenizer, self.urgency_classifier,
+                emergency_path=self.emergency_path,
+                urgency_path=self.urgency_path,
+                device=self.device,
+                mode=self.text_encoder_mode,
+                onnx_runners=onnx_runners
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ Could not configure shared text encoder: {e}")
+            self.shared_text_encoder = None
+        
+        if self.shared_text_encoder is not None:
+            self.text_batcher = MicroBatcher(
+                self.shared_text_encoder.forward_batch,
+                name="shared_text_encoder",
+                max_batch_size=self.batch_max_size,
+                max_wait_ms=self.batch_max_wait_ms
+            )
+        else:
+            self.text_batcher = None
+    
+    def _configure_enhanced_vlm(self):
+        """Hand the loaded VLM models to the enhanced analyzer (switches over atomically)"""
+        self.enhanced_vlm.disaster_classifier = self.disaster_classifier
+        self.enhanced_vlm.feature_extractor = self.feature_extractor
+        self.enhanced_vlm.disaster_types = self.disaster_types
+        self.enhanced_vlm.feature_cache.clear()
+        self.enhanced_vlm.is_loaded = True
+        logger.info("✅ Enhanced VLM analyzer configured")
+    
+    def _load_tracked(self, name: str, loader) -> bool:
+        """Run one model loader and record its state and load duration"""
+        state = self.model_states[name]
+        state.update({"state": "loading", "error": None})
+        started_at = time.perf_counter()
+        
+        try:
+            loaded = bool(loader())
+        except Exception as e:
+            logger.error(f"❌ Loading {name} raised: {e}")
+            loaded = False
+            state["error"] = str(e)
+        
+        state["load_seconds"] = round(time.perf_counter() - started_at, 3)
+        state["state"] = "ready" if loaded else "failed"
+        if not loaded and state["error"] is None:
+            state["error"] = "load failed (see logs)"
+        logger.info(f"{'✅' if loaded else '❌'} {name} {state['state']} after {state['load_seconds']}s")
+        return loaded
+    
+    def _on_model_loaded(self, name: str):
+        """Enable combined components as soon as their models are ready"""
+        if name in ("emergency_classifier", "urgency_classifier"):
+            if self.models_loaded["emergency_classifier"] and self.models_loaded["urgency_classifier"]:
+                self.configure_shared_text_encoder()
+        elif name in ("disaster_classifier", "feature_extractor"):
+            if self.models_loaded["disaster_classifier"] and self.models_loaded["feature_extractor"]:
+                self._configure_enhanced_vlm()
+    
+    def resolve_device(self) -> str:
+        """Pick cuda when available (imports torch on first call)"""
+        if not self.device_resolved:
+            self.device = "cuda" if HAS_TRANSFORMERS and torch.cuda.is_available() else "cpu"
+            self.device_resolved = True
+        logger.info(f"🖥️ Using device: {self.device}")
+        return self.device
+    
     def load_all_models(self):
-        """Load all available models"""
+        """Load all available models in parallel (blocks until every loader finishes)"""
         logger.info("🚀 Loading all models...")
+        self.resolve_device()
         self.check_model_files()
         
-        success_count = 0
         total_models = 4
+        loaders = {}
         
-        # Load each model
         if HAS_TRANSFORMERS:
-            if self.load_emergency_classifier():
-                success_count += 1
-            if self.load_urgency_classifier():
-                success_count += 1
+            loaders["emergency_classifier"] = self.load_emergency_classifier
+            loaders["urgency_classifier"] = self.load_urgency_classifier
         else:
             logger.warning("⚠️ Transformers not available - skipping text classifiers")
         
         if HAS_TF:
-            if self.load_feature_extractor():
-                success_count += 1
+            loaders["feature_extractor"] = self.load_feature_extractor
         else:
             logger.warning("⚠️ TensorFlow not available - skipping feature extractor")
         
         if HAS_SKLEARN:
-            if self.load_disaster_classifier():
-                success_count += 1
+            loaders["disaster_classifier"] = self.load_disaster_classifier
         else:
             logger.warning("⚠️ Scikit-learn not available - skipping disaster classifier")
         
-        # Setup enhanced VLM if VLM models loaded
-        if self.models_loaded["disaster_classifier"] and self.models_loaded["feature_extractor"]:
-            self.enhanced_vlm.disaster_classifier = self.disaster_classifier
-            self.enhanced_vlm.feature_extractor = self.feature_extractor
-            self.enhanced_vlm.disaster_types = self.disaster_types
-            self.enhanced_vlm.is_loaded = True
-            logger.info("✅ Enhanced VLM analyzer configured")
+        for name in self.model_states:
+            if name not in loaders:
+                self.model_states[name]["state"] = "unavailable"
         
+        # Each model loads on its own thread; dependent components switch on as pairs complete
+        if loaders:
+            with ThreadPoolExecutor(max_workers=len(loaders), thread_name_prefix="model_loader") as pool:
+                futures = {pool.submit(self._load_tracked, name, loader): name for name, loader in loaders.items()}
+                for future in as_completed(futures):
+                    if future.result():
+                        self._on_model_loaded(futures[future])
+        
+        success_count = sum(self.models_loaded.values())
         logger.info(f"📊 Loaded {success_count}/{total_models} models successfully")
         
         # Test models if loaded
         if success_count > 0:
             self.test_models()
         
+        self.loading_complete.set()
         return success_count > 0
     
+    def start_background_loading(self) -> threading.Thread:
+        """Load models on a background thread so the API can serve traffic immediately
+        
+        Until a model is ready its endpoints answer with the keyword fallback.
+        """
+        if self.loading_thread is None:
+            self.loading_thread = threading.Thread(
+                target=self._background_load, name="model_loading", daemon=True
+            )
+            self.loading_thread.start()
+        return self.loading_thread
+    
+    def _background_load(self):
+        try:
+            if self.load_all_models():
+                logger.info("✅ Background model loading finished")
+            else:
+                logger.error("❌ Background model loading finished without any model")
+        except Exception as e:
+            logger.error(f"❌ Background model loading failed: {e}")
+            self.loading_complete.set()
+    
+    def get_readiness(self) -> Dict[str, Any]:
+        """Per-model load state; ``ready`` once both text models are serving"""
+        text_ready = self.models_loaded["emergency_classifier"] and self.models_loaded["urgency_classifier"]
+        return {
+            "ready": bool(text_ready),
+            "text_models_ready": bool(text_ready),
+            "image_models_ready": bool(self.enhanced_vlm.is_loaded),
+            "loading_complete": self.loading_complete.is_set(),
+            "models": {name: dict(state) for name, state in self.model_states.items()}
+        }
+    
     def test_models(self):
         """Test all loaded models with sample data"""
         logger.info("🧪 Testing loaded models...")
@@ -739,172 +1087,174 @@ class CompleteModelService:
     def classify_emergency(self, text: str) -> Dict[str, Any]:
         """Classify if text describes an emergency"""
         if not self.models_loaded["emergency_classifier"]:
-            return {"error": "Emergency classifier not loaded"}
+            return self._emergency_keyword_fallback(
+                text, RuntimeError(f"Emergency classifier not ready ({self.model_states['emergency_classifier']['state']})")
+            )
+        
+        cached = self.text_cache.get("emergency", text)
+        if cached is not None:
+            return cached
         
         try:
-            results = self.emergency_pipeline(text, top_k=None)
-            
-            # Initialize scores
-            emergency_score = 0.0
-            non_emergency_score = 0.0
-            
-            # Process results
-            for result in results:
-                label = str(result['label']).upper()
-                score = float(result['score'])
-                
-                if 'LABEL_1' in label or '1' in label or 'EMERGENCY' in label:
-                    emergency_score = score
-                elif 'LABEL_0' in label or '0' in label or 'NON_EMERGENCY' in label:
-                    non_emergency_score = score
-                else:
-                    if emergency_score == 0.0:
-                        emergency_score = score
-                    else:
-                        non_emergency_score = score
-            
-            # Ensure we have both scores
-            if emergency_score == 0.0 and non_emergency_score == 0.0:
-                if results:
-                    emergency_score = results[0]['score']
-                    non_emergency_score = 1.0 - emergency_score
-            
-            # Normalize scores
-            total_score = emergency_score + non_emergency_score
-            if total_score > 0:
-                emergency_score = emergency_score / total_score
-                non_emergency_score = non_emergency_score / total_score
-            
-            is_emergency = emergency_score > 0.5
-            confidence = max(emergency_score, non_emergency_score)
-            
-            result = {
-                "is_emergency": bool(is_emergency),
-                "confidence": float(confidence),
-                "probabilities": {
-                    "emergency": float(emergency_score),
-                    "non_emergency": float(non_emergency_score)
-                },
-                "raw_results": results,
-                "model_labels": [r['label'] for r in results]
-            }
-            
-            # Convert numpy types to Python types
-            return convert_numpy_types(result)
+            scores = self.emergency_batcher.submit(text)
+            result = self._postprocess_emergency(scores)
+            self.text_cache.put("emergency", text, result)
+            return result
             
         except Exception as e:
             logger.error(f"Emergency classification failed: {e}")
-            # Keyword fallback
-            text_lower = text.lower()
-            is_emergency = any(word in text_lower for word in ['emergency', 'urgent', 'help', 'rescue', 'trapped', 'fire', 'collapsed'])
-            return {
-                "is_emergency": bool(is_emergency),
-                "confidence": 0.6,
-                "probabilities": {
-                    "emergency": 0.7 if is_emergency else 0.3,
-                    "non_emergency": 0.3 if is_emergency else 0.7
-                },
-                "fallback": "keyword_based",
-                "error": str(e)
-            }
+            return self._emergency_keyword_fallback(text, e)
+    
+    def _postprocess_emergency(self, scores: np.ndarray) -> Dict[str, Any]:
+        """Turn one row of emergency model scores into the emergency analysis dict"""
+        selected = self.emergency_labels.select(scores)
+        emergency_score = selected["emergency"]
+        non_emergency_score = selected["non_emergency"]
+        
+        # A missing output is the complement of the one the model has
+        if non_emergency_score is None:
+            non_emergency_score = 1.0 - emergency_score
+        elif emergency_score is None:
+            emergency_score = 1.0 - non_emergency_score
+        
+        # Normalize scores
+        total_score = emergency_score + non_emergency_score
+        if total_score > 0:
+            emergency_score = emergency_score / total_score
+            non_emergency_score = non_emergency_score / total_score
+        
+        is_emergency = emergency_score > 0.5
+        confidence = max(emergency_score, non_emergency_score)
+        
+        raw_results = self.emergency_labels.ranked(scores)
+        
+        result = {
+            "is_emergency": bool(is_emergency),
+            "confidence": float(confidence),
+            "probabilities": {
+                "emergency": float(emergency_score),
+                "non_emergency": float(non_emergency_score)
+            },
+            "raw_results": raw_results,
+            "raw_scores": [float(score) for score in scores],
+            "model_labels": [r['label'] for r in raw_results]
+        }
+        
+        return result
+    
+    def _emergency_keyword_fallback(self, text: str, error: Exception) -> Dict[str, Any]:
+        """Keyword-based emergency classification used when the model fails"""
+        # Keyword fallback (one pass over the shared lexicon)
+        hits = KEYWORDS.scan(text)
+        is_emergency = hits.is_emergency
+        return {
+            "is_emergency": bool(is_emergency),
+            "confidence": 0.6,
+            "probabilities": {
+                "emergency": 0.7 if is_emergency else 0.3,
+                "non_emergency": 0.3 if is_emergency else 0.7
+            },
+            "matched_keywords": list(hits.terms),
+            "fallback": "keyword_based",
+            "error": str(error)
+        }
     
     def classify_urgency(self, text: str) -> Dict[str, Any]:
         """Classify urgency level of text"""
         if not self.models_loaded["urgency_classifier"]:
-            return {"error": "Urgency classifier not loaded"}
+            return self._urgency_keyword_fallback(
+                text, RuntimeError(f"Urgency classifier not ready ({self.model_states['urgency_classifier']['state']})")
+            )
+        
+        cached = self.text_cache.get("urgency", text)
+        if cached is not None:
+            return cached
         
         try:
-            results = self.urgency_pipeline(text, top_k=None)
-            
-            # Initialize urgency scores
-            urgency_scores = {level: 0.0 for level in self.urgency_levels}
-            
-            # Process results
-            for i, result in enumerate(results):
-                label = str(result['label']).upper()
-                score = float(result['score'])
-                
-                # Map labels to urgency levels
-                mapped = False
-                
-                # Strategy 1: Direct text matching
-                for level in self.urgency_levels:
-                    if level in label:
-                        urgency_scores[level] = score
-                        mapped = True
-                        break
-                
-                # Strategy 2: LABEL_N format mapping
-                if not mapped:
-                    if 'LABEL_0' in label or label == '0':
-                        urgency_scores["LOW"] = score
-                        mapped = True
-                    elif 'LABEL_1' in label or label == '1':
-                        urgency_scores["MEDIUM"] = score
-                        mapped = True
-                    elif 'LABEL_2' in label or label == '2':
-                        urgency_scores["HIGH"] = score
-                        mapped = True
-                    elif 'LABEL_3' in label or label == '3':
-                        urgency_scores["CRITICAL"] = score
-                        mapped = True
-                
-                # Strategy 3: Position-based mapping
-                if not mapped and i < len(self.urgency_levels):
-                    urgency_scores[self.urgency_levels[i]] = score
-            
-            # Ensure we have scores
-            total_score = sum(urgency_scores.values())
-            if total_score == 0.0 and results:
-                for i, result in enumerate(results[:len(self.urgency_levels)]):
-                    urgency_scores[self.urgency_levels[i]] = result['score']
-            
-            # Normalize scores
-            total_score = sum(urgency_scores.values())
-            if total_score > 0:
-                urgency_scores = {level: float(score/total_score) for level, score in urgency_scores.items()}
-            
-            # Find highest scoring urgency level
-            predicted_urgency = max(urgency_scores, key=urgency_scores.get)
-            confidence = urgency_scores[predicted_urgency]
-            
-            result = {
-                "urgency_level": predicted_urgency,
-                "confidence": float(confidence),
-                "probabilities": {level: float(score) for level, score in urgency_scores.items()},
-                "raw_results": results,
-                "model_labels": [r['label'] for r in results]
-            }
-            
-            # Convert numpy types to Python types
-            return convert_numpy_types(result)
+            scores = self.urgency_batcher.submit(text)
+            result = self._postprocess_urgency(scores)
+            self.text_cache.put("urgency", text, result)
+            return result
             
         except Exception as e:
             logger.error(f"Urgency classification failed: {e}")
-            # Keyword fallback
-            text_lower = text.lower()
-            if any(word in text_lower for word in ['critical', 'immediate', 'life threatening']):
-                urgency_level = "CRITICAL"
-                probabilities = {"LOW": 0.1, "MEDIUM": 0.1, "HIGH": 0.2, "CRITICAL": 0.6}
-            elif any(word in text_lower for word in ['urgent', 'emergency', 'help', 'rescue']):
-                urgency_level = "HIGH"
-                probabilities = {"LOW": 0.1, "MEDIUM": 0.2, "HIGH": 0.6, "CRITICAL": 0.1}
-            elif any(word in text_lower for word in ['need', 'assistance', 'damaged']):
-                urgency_level = "MEDIUM"
-                probabilities = {"LOW": 0.2, "MEDIUM": 0.6, "HIGH": 0.2, "CRITICAL": 0.0}
-            else:
-                urgency_level = "LOW"
-                probabilities = {"LOW": 0.6, "MEDIUM": 0.3, "HIGH": 0.1, "CRITICAL": 0.0}
+            return self._urgency_keyword_fallback(text, e)
+    
+    def _postprocess_urgency(self, scores: np.ndarray) -> Dict[str, Any]:
+        """Turn one row of urgency model scores into the urgency analysis dict"""
+        urgency_scores = {
+            level: score if score is not None else 0.0
+            for level, score in self.urgency_labels.select(scores).items()
+        }
+        
+        # Normalize scores
+        total_score = sum(urgency_scores.values())
+        if total_score > 0:
+            urgency_scores = {level: float(score/total_score) for level, score in urgency_scores.items()}
+        
+        # Find highest scoring urgency level
+        predicted_urgency = max(urgency_scores, key=urgency_scores.get)
+        confidence = urgency_scores[predicted_urgency]
+        
+        raw_results = self.urgency_labels.ranked(scores)
+        
+        result = {
+            "urgency_level": predicted_urgency,
+            "confidence": float(confidence),
+            "probabilities": {level: float(score) for level, score in urgency_scores.items()},
+            "raw_results": raw_results,
+            "raw_scores": [float(score) for score in scores],
+            "model_labels": [r['label'] for r in raw_results]
+        }
+        
+        return result
+    
+    def _urgency_keyword_fallback(self, text: str, error: Exception) -> Dict[str, Any]:
+        """Keyword-based urgency classification used when the model fails"""
+        # Keyword fallback (one pass over the shared lexicon)
+        hits = KEYWORDS.scan(text)
+        urgency_level = hits.urgency_level
+        probabilities = URGENCY_FALLBACK_PROBABILITIES[urgency_level]
+        
+        return {
+            "urgency_level": urgency_level,
+            "confidence": float(probabilities[urgency_level]),
+            "probabilities": {level: float(score) for level, score in probabilities.items()},
+            "matched_keywords": list(hits.terms),
+            "fallback": "keyword_based",
+            "error": str(error)
+        }
+    
+    def classify_text(self, text: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Run emergency and urgency classification for one text
+        
+        Uses the shared tokenizer / multi-head encoder when both checkpoints
+        are compatible, otherwise falls back to the two separate models.
+        """
+        if self.text_batcher is None:
+            return self.classify_emergency(text), self.classify_urgency(text)
+        
+        cached_emergency = self.text_cache.get("emergency", text)
+        cached_urgency = self.text_cache.get("urgency", text)
+        if cached_emergency is not None and cached_urgency is not None:
+            return cached_emergency, cached_urgency
+        
+        try:
+            emergency_scores, urgency_scores = self.text_batcher.submit(text)
+            emergency_result = self._postprocess_emergency(emergency_scores)
+            urgency_result = self._postprocess_urgency(urgency_scores)
+            self.text_cache.put("emergency", text, emergency_result)
+            self.text_cache.put("urgency", text, urgency_result)
+            return emergency_result, urgency_result
             
-            return {
-                "urgency_level": urgency_level,
-                "confidence": float(probabilities[urgency_level]),
-                "probabilities": {level: float(score) for level, score in probabilities.items()},
-                "fallback": "keyword_based",
-                "error": str(e)
-            }
+        except Exception as e:
+            logger.error(f"Shared text classification failed: {e}")
+            return (
+                self._emergency_keyword_fallback(text, e),
+                self._urgency_keyword_fallback(text, e)
+            )
     
-    def classify_disaster_from_image(self, image_data: bytes) -> Dict[str, Any]:
+    def classify_disaster_from_image(self, image_data: Union[bytes, DecodedImage]) -> Dict[str, Any]:
         """Enhanced disaster classification using trained models + visual analysis"""
         if not self.enhanced_vlm.is_loaded:
             return {"error": "VLM models not loaded"}
@@ -918,80 +1268,99 @@ class CompleteModelService:
             logger.error(f"Enhanced disaster classification failed: {e}")
             return {"error": str(e)}
     
-    def complete_analysis(self, text: str, image_data: bytes = None, 
-                         location: str = "", disaster_type: str = "") -> Dict[str, Any]:
-        """Complete analysis using all models with enhanced VLM"""
-        start_time = time.time()
+    def classify_disasters_from_images(self, images: List[Union[bytes, DecodedImage]]) -> List[Dict[str, Any]]:
+        """Batched disaster classification for an album of images (results in input order)"""
+        if not self.enhanced_vlm.is_loaded:
+            return [{"error": "VLM models not loaded"} for _ in images]
         
         try:
-            results = {
-                "text": text,
-                "location": location,
-                "timestamp": datetime.utcnow().isoformat()
-            }
+            return self.enhanced_vlm.classify_disasters_from_images(images)
             
-            # Text-based emergency and urgency classification
-            if text:
-                emergency_result = self.classify_emergency(text)
-                urgency_result = self.classify_urgency(text)
+        except Exception as e:
+            logger.error(f"Batched disaster classification failed: {e}")
+            return [{"error": str(e)} for _ in images]
+    
+    def _build_analysis_graph(self) -> StageGraph:
+        """Stage graph behind complete_analysis: text and image branches run concurrently"""
+        return StageGraph([
+            Stage("text_classification", self._stage_text_classification,
+                  requires=("text",), lane="text"),
+            Stage("image_classification", self._stage_image_classification,
+                  requires=("image_data",), lane="image",
+                  skip_if=lambda context: bool(context.get("disaster_type"))),
+            Stage("combined_assessment", self._stage_combined_assessment,
+                  after=("text_classification", "image_classification")),
+            Stage("recommendations", self._stage_recommendations,
+                  requires=("combined_assessment",))
+        ])
+    
+    def _stage_text_classification(self, context: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Text-based emergency and urgency classification"""
+        return self.classify_text(context["text"])
+    
+    def _stage_image_classification(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        """Enhanced image-based disaster classification"""
+        return self.classify_disaster_from_image(context["image_data"])
+    
+    def _stage_combined_assessment(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        """Merge text and image results into the combined assessment"""
+        image_data = context.get("image_data")
+        disaster_type = context.get("disaster_type", "")
+        disaster_result = None
+        
+        if image_data:
+            if not disaster_type:
+                # Use enhanced VLM analysis
+                disaster_result = context.get("image_classification", {})
                 
-                results["emergency_analysis"] = emergency_result
-                results["urgency_analysis"] = urgency_result
-            
-            # Enhanced image-based disaster classification
-            if image_data:
-                if not disaster_type:
-                    # Use enhanced VLM analysis
-                    disaster_result = self.classify_disaster_from_image(image_data)
-                    results["disaster_type_prediction"] = disaster_result
-                    
-                    if "error" not in disaster_result:
-                        predicted_disaster_type = disaster_result.get("predicted_type", "unknown")
-                        # Use enhanced severity assessment from VLM
-                        vlm_severity = disaster_result.get("severity_assessment", {})
-                    else:
-                        predicted_disaster_type = "unknown"
-                        vlm_severity = {}
+                if "error" not in disaster_result:
+                    predicted_disaster_type = disaster_result.get("predicted_type", "unknown")
+                    # Use enhanced severity assessment from VLM
+                    vlm_severity = disaster_result.get("severity_assessment", {})
                 else:
-                    # Use provided disaster type
-                    predicted_disaster_type = disaster_type
-                    results["disaster_type_prediction"] = {
-                        "predicted_type": disaster_type,
-                        "confidence": 0.9,
-                        "prediction_method": "user_provided"
-                    }
+                    predicted_disaster_type = "unknown"
                     vlm_severity = {}
             else:
-                predicted_disaster_type = disaster_type or "unknown"
+                # Use provided disaster type
+                predicted_disaster_type = disaster_type
+                disaster_result = {
+                    "predicted_type": disaster_type,
+                    "confidence": 0.9,
+                    "prediction_method": "user_provided"
+                }
                 vlm_severity = {}
+        else:
+            predicted_disaster_type = disaster_type or "unknown"
+            vlm_severity = {}
+        
+        emergency_analysis, urgency_analysis = context.get("text_classification", ({}, {}))
+        
+        is_emergency = emergency_analysis.get("is_emergency", False)
+        urgency_level = urgency_analysis.get("urgency_level", "LOW")
+        
+        # Use VLM severity if available, otherwise calculate basic severity
+        if vlm_severity:
+            priority_score = vlm_severity.get("priority_score", 5)
+            damage_detected = vlm_severity.get("damage_detected", False)
+            requires_immediate_action = vlm_severity.get("requires_immediate_action", False)
+            severity_level = vlm_severity.get("severity_level", urgency_level)
+        else:
+            # Basic severity calculation
+            priority_mapping = {"LOW": 2, "MEDIUM": 5, "HIGH": 8, "CRITICAL": 10}
+            priority_score = priority_mapping.get(urgency_level, 5)
             
-            # Combined assessment
-            emergency_analysis = results.get("emergency_analysis", {})
-            urgency_analysis = results.get("urgency_analysis", {})
-            
-            is_emergency = emergency_analysis.get("is_emergency", False)
-            urgency_level = urgency_analysis.get("urgency_level", "LOW")
-            
-            # Use VLM severity if available, otherwise calculate basic severity
-            if vlm_severity:
-                priority_score = vlm_severity.get("priority_score", 5)
-                damage_detected = vlm_severity.get("damage_detected", False)
-                requires_immediate_action = vlm_severity.get("requires_immediate_action", False)
-                severity_level = vlm_severity.get("severity_level", urgency_level)
-            else:
-                # Basic severity calculation
-                priority_mapping = {"LOW": 2, "MEDIUM": 5, "HIGH": 8, "CRITICAL": 10}
-                priority_score = priority_mapping.get(urgency_level, 5)
-                
-                if is_emergency:
-                    priority_score = min(10, priority_score + 2)
-                
-                damage_detected = is_emergency and priority_score >= 5
-                requires_immediate_action = priority_score >= 8
-                severity_level = urgency_level
+            if is_emergency:
+                priority_score = min(10, priority_score + 2)
             
-            # Enhanced assessment
-            results["combined_assessment"] = {
+            damage_detected = is_emergency and priority_score >= 5
+            requires_immediate_action = priority_score >= 8
+            severity_level = urgency_level
+        
+        return {
+            "disaster_type_prediction": disaster_result,
+            "predicted_disaster_type": predicted_disaster_type,
+            "vlm_severity": vlm_severity,
+            "assessment": {
                 "is_emergency": bool(is_emergency),
                 "urgency_level": urgency_level,
                 "disaster_type": predicted_disaster_type,
@@ -1004,34 +1373,67 @@ class CompleteModelService:
                     "urgency": urgency_analysis.get("confidence", 0.5)
                 }
             }
+        }
+    
+    def _stage_recommendations(self, context: Dict[str, Any]) -> List[str]:
+        """Generate enhanced (VLM) or basic recommendations"""
+        combined = context["combined_assessment"]
+        assessment = combined["assessment"]
+        vlm_severity = combined["vlm_severity"]
+        
+        if context.get("image_data") and self.enhanced_vlm.is_loaded and vlm_severity:
+            # Use VLM-based recommendations
+            damage_analysis = (combined["disaster_type_prediction"] or {}).get("damage_analysis", {})
+            return self.enhanced_vlm.generate_enhanced_recommendations(
+                combined["predicted_disaster_type"], vlm_severity, damage_analysis
+            )
+        
+        # Use basic recommendations
+        return self.generate_recommendations(
+            assessment["is_emergency"], assessment["urgency_level"], combined["predicted_disaster_type"]
+        )
+    
+    def complete_analysis(self, text: str, image_data: bytes = None, 
+                         location: str = "", disaster_type: str = "") -> Dict[str, Any]:
+        """Complete analysis using all models with enhanced VLM"""
+        start_time = time.time()
+        
+        try:
+            results = {
+                "text": text,
+                "location": location,
+                "timestamp": datetime.utcnow().isoformat()
+            }
             
-            # Generate enhanced recommendations
-            if image_data and self.enhanced_vlm.is_loaded and vlm_severity:
-                # Use VLM-based recommendations
-                vlm_result = results.get("disaster_type_prediction", {})
-                damage_analysis = vlm_result.get("damage_analysis", {})
-                
-                results["recommendations"] = self.enhanced_vlm.generate_enhanced_recommendations(
-                    predicted_disaster_type, vlm_severity, damage_analysis
-                )
-            else:
-                # Use basic recommendations
-                results["recommendations"] = self.generate_recommendations(
-                    is_emergency, urgency_level, predicted_disaster_type
-                )
+            # Text and image branches run concurrently; combine/recommendations follow
+            context = {"text": text, "image_data": image_data, "disaster_type": disaster_type}
+            stage_report = self.analysis_graph.run(context, executor=self.stage_executor)
+            for stage_name, stage in stage_report.items():
+                if stage["status"] == "completed":
+                    METRICS.analysis_stage_seconds.observe(stage["latency_ms"] / 1000, stage=stage_name)
+            
+            if "text_classification" in context:
+                results["emergency_analysis"], results["urgency_analysis"] = context["text_classification"]
+            
+            combined = context["combined_assessment"]
+            if combined["disaster_type_prediction"] is not None:
+                results["disaster_type_prediction"] = combined["disaster_type_prediction"]
+            
+            results["combined_assessment"] = combined["assessment"]
+            results["recommendations"] = context["recommendations"]
             
             # Processing info
             processing_time = (time.time() - start_time) * 1000
             results["processing_info"] = {
                 "processing_time_ms": float(processing_time),
+                "stages": stage_report,
                 "models_used": [k for k, v in self.models_loaded.items() if v],
                 "device": self.device,
                 "model_version": "enhanced_complete_v1.0",
                 "enhanced_vlm_used": bool(self.enhanced_vlm.is_loaded)
             }
             
-            # Convert all numpy types to Python types
-            return convert_numpy_types(results)
+            return results
             
         except Exception as e:
             logger.error(f"Complete analysis failed: {e}")
@@ -1076,6 +1478,28 @@ class CompleteModelService:
         
         return recommendations[:8]
     
+    def _metric_samples(self):
+        """Scrape-time metric rows for queues and caches"""
+        yield from executor_samples(self.executor, "request")
+        yield from executor_samples(self.stage_executor, "analysis_stage")
+        for name, batcher in (("emergency", self.emergency_batcher), ("urgency", self.urgency_batcher),
+                              ("text", self.text_batcher)):
+            if batcher is not None:
+                yield from batcher_samples(batcher, name)
+        yield from cache_samples(self.text_cache, "text_results")
+        yield from cache_samples(self.enhanced_vlm.feature_cache, "image_features")
+    
+    def _text_model_details(self, task: str, model, runner, labels) -> Dict[str, Any]:
+        """Model info for a text classifier; ONNX-served models no longer keep the PyTorch module"""
+        return {
+            "model_type": str(type(model if model is not None else runner)),
+            "num_parameters": int(sum(p.numel() for p in model.parameters())) if model is not None else "unknown",
+            "num_labels": int(runner.config.num_labels),
+            "backend": self.text_backends_active[task],
+            "quantization": self.text_quantization_active[task],
+            "label_map": labels.describe() if labels is not None else None
+        }
+    
     def get_model_info(self) -> Dict[str, Any]:
         """Get information about loaded models"""
         info = {
@@ -1086,20 +1510,33 @@ class CompleteModelService:
         }
         
         # Get emergency model details
-        if self.emergency_classifier is not None:
-            info["model_details"]["emergency"] = {
-                "model_type": str(type(self.emergency_classifier)),
-                "num_parameters": int(sum(p.numel() for p in self.emergency_classifier.parameters())),
-                "num_labels": int(self.emergency_classifier.config.num_labels) if hasattr(self.emergency_classifier, 'config') else "unknown"
-            }
+        if self.emergency_runner is not None:
+            info["model_details"]["emergency"] = self._text_model_details(
+                "emergency", self.emergency_classifier, self.emergency_runner, self.emergency_labels
+            )
         
         # Get urgency model details
-        if self.urgency_classifier is not None:
-            info["model_details"]["urgency"] = {
-                "model_type": str(type(self.urgency_classifier)),
-                "num_parameters": int(sum(p.numel() for p in self.urgency_classifier.parameters())),
-                "num_labels": int(self.urgency_classifier.config.num_labels) if hasattr(self.urgency_classifier, 'config') else "unknown"
-            }
+        if self.urgency_runner is not None:
+            info["model_details"]["urgency"] = self._text_model_details(
+                "urgency", self.urgency_classifier, self.urgency_runner, self.urgency_labels
+            )
+        
+        # Micro-batching statistics
+        info["batching"] = {
+            name: batcher.get_stats()
+            for name, batcher in (("emergency", self.emergency_batcher), ("urgency", self.urgency_batcher),
+                                  ("shared_text", self.text_batcher))
+            if batcher is not None
+        }
+        info["text_encoder_mode"] = self.shared_text_encoder.mode if self.shared_text_encoder else "separate"
+        info["text_backend"] = {"requested": self.text_backend, **self.text_backends_active}
+        info["text_quantization"] = {"requested": self.text_quantization, **self.text_quantization_active}
+        
+        info["feature_cache"] = self.enhanced_vlm.feature_cache.get_stats()
+        info["text_cache"] = self.text_cache.get_stats()
+        info["inference_executor"] = self.executor.get_stats()
+        info["stage_executor"] = self.stage_executor.get_stats()
+        info["latency"] = METRICS.summary()
         
         # Get VLM model details
         if self.enhanced_vlm.is_loaded:
@@ -1107,13 +1544,16 @@ class CompleteModelService:
                 "disaster_classifier_type": str(type(self.disaster_classifier)),
                 "feature_extractor_input": str(self.feature_extractor.input_shape),
                 "feature_extractor_output": str(self.feature_extractor.output_shape),
+                "feature_extractor_runtime": self.feature_extractor.describe(),
                 "disaster_types": self.disaster_types
             }
         
-        # Convert numpy types to Python types
-        return convert_numpy_types(info)
+        return info
 
 
+# Maximum number of images accepted by the batch endpoint
+MAX_BATCH_IMAGES = 64
+
 # Global service instance
 complete_service = CompleteModelService()
 
@@ -1123,12 +1563,21 @@ complete_app = FastAPI(
     description="Complete service using all trained models: emergency, urgency, and enhanced disaster classification"
 )
 
+# Per-endpoint latency and GET /metrics (Prometheus text format)
+install_metrics(complete_app)
+
+# Continues the caller's trace (traceparent header); stage spans -> traces.jsonl
+install_tracing(complete_app, "complete-model-service")
+
 class CompleteAnalysisRequest(BaseModel):
     text: str
     image: Optional[str] = None  # base64 encoded
     location: str = ""
     disaster_type: str = ""
 
+class BatchImageAnalysisRequest(BaseModel):
+    images: List[str]  # base64 encoded
+
 @complete_app.on_event("startup")
 async def startup_event():
     """Load all models on startup"""
@@ -1139,12 +1588,9 @@ async def startup_event():
         logger.info(f"Transformers: {HAS_TRANSFORMERS}, TensorFlow: {HAS_TF}, Scikit-learn: {HAS_SKLEARN}")
         return
     
-    success = complete_service.load_all_models()
-    
-    if success:
-        logger.info("✅ Complete Model Service with Enhanced VLM ready!")
-    else:
-        logger.error("❌ Failed to load models")
+    # Models load in parallel in the background; /ready reports progress
+    complete_service.start_background_loading()
+    logger.info("✅ Complete Model Service accepting traffic (models loading in background)")
 
 @complete_app.get("/")
 def root():
@@ -1180,6 +1626,12 @@ async def health():
         }
     }
 
+@complete_app.get("/ready")
+async def ready():
+    """Readiness probe: 200 once the text models are serving, 503 while loading"""
+    readiness = complete_service.get_readiness()
+    return JSONResponse(status_code=200 if readiness["ready"] else 503, content=readiness)
+
 @complete_app.post("/analyze/text")
 async def analyze_text(request: dict):
     """Analyze text for emergency and urgency classification"""
@@ -1188,8 +1640,9 @@ async def analyze_text(request: dict):
         raise HTTPException(status_code=400, detail="Text is required")
     
     try:
-        emergency_result = complete_service.classify_emergency(text)
-        urgency_result = complete_service.classify_urgency(text)
+        emergency_result, urgency_result = await complete_service.executor.run(
+            "text", complete_service.classify_text, text
+        )
         
         result = {
             "text": text,
@@ -1198,7 +1651,9 @@ async def analyze_text(request: dict):
             "timestamp": datetime.utcnow().isoformat()
         }
         
-        return convert_numpy_types(result)
+        return NumpyJSONResponse(result)
+    except InferenceOverloaded as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -1210,41 +1665,147 @@ async def analyze_image(request: dict):
         raise HTTPException(status_code=400, detail="Image is required")
     
     try:
-        image_data = base64.b64decode(image_b64)
-        result = complete_service.classify_disaster_from_image(image_data)
+        image_data = decode_base64_image(image_b64).data
+    except UploadRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    
+    try:
+        result = await complete_service.executor.run(
+            "image", complete_service.classify_disaster_from_image, image_data
+        )
         
         response = {
             "disaster_type_prediction": result,
             "timestamp": datetime.utcnow().isoformat()
         }
         
-        return convert_numpy_types(response)
+        return NumpyJSONResponse(response)
+    except InferenceOverloaded as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@complete_app.post("/analyze/image/binary")
+async def analyze_image_binary(request: Request):
+    """Binary variant of /analyze/image: raw image body (application/octet-stream)"""
+    try:
+        image_data, _ = await read_binary_image_request(request)
+    except BinaryPayloadError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    
+    try:
+        result = await complete_service.executor.run(
+            "image", complete_service.classify_disaster_from_image, image_data
+        )
+        
+        response = {
+            "disaster_type_prediction": result,
+            "timestamp": datetime.utcnow().isoformat()
+        }
+        
+        return NumpyJSONResponse(response)
+    except InferenceOverloaded as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@complete_app.post("/analyze/images/batch")
+async def analyze_images_batch(request: BatchImageAnalysisRequest):
+    """Analyze an album of images with one batched model pass"""
+    if not request.images:
+        raise HTTPException(status_code=400, detail="At least one image is required")
+    if len(request.images) > MAX_BATCH_IMAGES:
+        raise HTTPException(status_code=400, detail=f"Too many images (max {MAX_BATCH_IMAGES})")
+    
+    try:
+        # Decode base64 payloads under the per-upload size, format and pixel limits;
+        # rejected entries get a per-image error and are never decoded as images
+        images = []
+        decode_errors = {}
+        for position, image_b64 in enumerate(request.images):
+            try:
+                images.append(decode_base64_image(image_b64).data)
+            except UploadRejected as e:
+                decode_errors[position] = {"error": str(e), "status_code": e.status_code}
+                images.append(None)
+        
+        valid_positions = [i for i, data in enumerate(images) if data is not None]
+        batch_results = await complete_service.executor.run(
+            "image", complete_service.classify_disasters_from_images,
+            [images[i] for i in valid_positions]
+        ) if valid_positions else []
+        
+        results = [decode_errors.get(i) for i in range(len(images))]
+        for position, result in zip(valid_positions, batch_results):
+            results[position] = result
+        
+        response = {
+            "results": [
+                {"index": i, "disaster_type_prediction": result}
+                for i, result in enumerate(results)
+            ],
+            "count": len(results),
+            "timestamp": datetime.utcnow().isoformat()
+        }
+        
+        return NumpyJSONResponse(response)
+    except InferenceOverloaded as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @complete_app.post("/analyze/complete")
 async def analyze_complete(request: CompleteAnalysisRequest):
     """Complete analysis using all models with enhanced VLM"""
+    image_data = None
+    if request.image:
+        try:
+            image_data = decode_base64_image(request.image).data
+        except UploadRejected as e:
+            raise HTTPException(status_code=e.status_code, detail=str(e))
+    
     try:
-        image_data = None
-        if request.image:
-            image_data = base64.b64decode(request.image)
-        
-        result = complete_service.complete_analysis(
+        result = await complete_service.executor.run(
+            "complete", complete_service.complete_analysis,
             text=request.text,
             image_data=image_data,
             location=request.location,
             disaster_type=request.disaster_type
         )
         
-        return convert_numpy_types(result)
+        return NumpyJSONResponse(result)
+    except InferenceOverloaded as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@complete_app.post("/analyze/complete/binary")
+async def analyze_complete_binary(request: Request):
+    """Binary variant of /analyze/complete: raw image body, text and context in X-RescueLanka-* headers"""
+    try:
+        image_data, metadata = await read_binary_image_request(request)
+    except BinaryPayloadError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    
+    try:
+        result = await complete_service.executor.run(
+            "complete", complete_service.complete_analysis,
+            text=metadata.get("text", ""),
+            image_data=image_data,
+            location=metadata.get("location", ""),
+            disaster_type=metadata.get("disaster_type", "")
+        )
+        
+        return NumpyJSONResponse(result)
+    except InferenceOverloaded as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @complete_app.get("/models/info")
 async def models_info():
     """Get detailed information about loaded models"""
-    return complete_service.get_model_info()
+    return NumpyJSONResponse(complete_service.get_model_info())
 
 if __name__ == "__main__":
     print("🎯 Starting Complete Model Service with Enhanced VLM Analysis...")
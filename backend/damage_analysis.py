@@ -0,0 +1,152 @@
+"""
+Fused damage-indicator kernel for RescueLanka image analysis
+backend/damage_analysis.py
+
+Computes the raw measurements behind EnhancedVLMAnalyzer's damage heuristics
+(edge density, fire/smoke/water colour ratios, texture variance, brightness and
+contrast) in one pass, using per-thread buffers that are reused across
+requests. The measurements run on the image they are given and match the
+original per-metric implementation at that resolution.
+
+Accuracy trade-off: services hand in the image as decoded, which is a reduced
+JPEG decode unless RESCUELANKA_DECODE_MIN_SIDE=0 (see image_context).
+RESCUELANKA_DAMAGE_WORKING_SIDE additionally caps the longest side the kernel
+works at (0, the default, disables the cap). Smaller sizes cut latency and
+memory but shift edge density and texture variance noticeably on detailed
+photos; colour ratios move much less. Set both to 0 for full-resolution scores.
+"""
+
+import os
+import threading
+import logging
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+import numpy as np
+
+from lazy_imports import lazy_import, module_available
+
+HAS_CV2 = module_available("cv2")
+if not HAS_CV2:
+    print("⚠️ Missing OpenCV: cv2 not installed")
+cv2 = lazy_import("cv2")
+
+logger = logging.getLogger(__name__)
+
+# Longest side (pixels) the heuristics run at; 0 keeps the full upload resolution (e.g. 512 to opt in)
+DEFAULT_WORKING_MAX_SIDE = int(os.getenv("RESCUELANKA_DAMAGE_WORKING_SIDE", "0"))
+
+# Number of distinct working shapes whose buffers are kept per thread
+MAX_CACHED_SHAPES = 4
+
+
+def _build_hsv_code_lut() -> np.ndarray:
+    """Per-channel lookup table mapping HSV values to histogram bin codes
+
+    The bins reproduce the former cv2.inRange thresholds exactly:
+    - H: 0 = [0, 30] (fire), 1 = [31, 99], 2 = [100, 130] (water), 3 = [131, 255]
+    - S: 0 = [0, 49], 1 = 50, 2 = [51, 255]
+    - V: 0 = [0, 49], 1 = [50, 80], 2 = [81, 255]
+    """
+    values = np.arange(256)
+    h_code = np.select([values <= 30, values < 100, values <= 130], [0, 1, 2], default=3)
+    s_code = np.select([values < 50, values == 50], [0, 1], default=2)
+    v_code = np.select([values < 50, values <= 80], [0, 1], default=2)
+    return np.stack([h_code, s_code, v_code], axis=-1).astype(np.uint8).reshape(1, 256, 3)
+
+
+_HSV_CODE_LUT = _build_hsv_code_lut()
+_HIST_SIZE = [4, 3, 3]
+_HIST_RANGES = [0, 4, 0, 3, 0, 3]
+
+
+class _WorkingBuffers:
+    """Preallocated working-resolution images for one shape"""
+
+    def __init__(self, height: int, width: int):
+        self.rgb = np.empty((height, width, 3), dtype=np.uint8)
+        self.gray = np.empty((height, width), dtype=np.uint8)
+        self.hsv = np.empty((height, width, 3), dtype=np.uint8)
+        self.codes = np.empty((height, width, 3), dtype=np.uint8)
+        self.edges = np.empty((height, width), dtype=np.uint8)
+        self.laplacian = np.empty((height, width), dtype=np.float32)
+
+
+class DamageAnalysisEngine:
+    """Single-pass damage measurements at a configurable working resolution"""
+
+    def __init__(self, working_max_side: int = DEFAULT_WORKING_MAX_SIDE):
+        self.working_max_side = int(working_max_side or 0)
+        self._local = threading.local()
+
+    def working_shape(self, height: int, width: int) -> Tuple[int, int]:
+        """Working (height, width) preserving aspect ratio"""
+        longest = max(height, width)
+        if self.working_max_side <= 0 or longest <= self.working_max_side:
+            return height, width
+        scale = self.working_max_side / float(longest)
+        return max(1, int(round(height * scale))), max(1, int(round(width * scale)))
+
+    def _buffers(self, height: int, width: int) -> _WorkingBuffers:
+        """Fetch (or allocate) this thread's buffers for a working shape"""
+        cache: Optional[OrderedDict] = getattr(self._local, "buffers", None)
+        if cache is None:
+            cache = OrderedDict()
+            self._local.buffers = cache
+
+        key = (height, width)
+        buffers = cache.get(key)
+        if buffers is None:
+            buffers = _WorkingBuffers(height, width)
+            cache[key] = buffers
+            while len(cache) > MAX_CACHED_SHAPES:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(key)
+        return buffers
+
+    def measure(self, rgb: np.ndarray) -> Dict[str, Any]:
+        """Raw damage measurements for an HxWx3 uint8 RGB image"""
+        height, width = rgb.shape[:2]
+        work_h, work_w = self.working_shape(height, width)
+        buffers = self._buffers(work_h, work_w)
+
+        # 1. Downscale once into the working buffer (area interpolation keeps colour ratios)
+        if (work_h, work_w) != (height, width):
+            working = cv2.resize(rgb, (work_w, work_h), dst=buffers.rgb, interpolation=cv2.INTER_AREA)
+        else:
+            working = np.ascontiguousarray(rgb)
+
+        total_pixels = float(work_h * work_w)
+
+        # 2. Structural edges
+        cv2.cvtColor(working, cv2.COLOR_RGB2GRAY, dst=buffers.gray)
+        cv2.Canny(buffers.gray, 50, 150, edges=buffers.edges)
+        edge_density = cv2.countNonZero(buffers.edges) / total_pixels
+
+        # 3. Fire / smoke / water ratios from one coded HSV histogram
+        cv2.cvtColor(working, cv2.COLOR_RGB2HSV, dst=buffers.hsv)
+        cv2.LUT(buffers.hsv, _HSV_CODE_LUT, dst=buffers.codes)
+        hist = cv2.calcHist([buffers.codes], [0, 1, 2], None, _HIST_SIZE, _HIST_RANGES)
+        fire_ratio = float(hist[0, 1:, 1:].sum()) / total_pixels
+        smoke_ratio = float(hist[:, :2, :2].sum()) / total_pixels
+        water_ratio = float(hist[2, 1:, 1:].sum()) / total_pixels
+
+        # 4. Texture variance (float32 is exact for the 8-bit Laplacian range)
+        cv2.Laplacian(buffers.gray, cv2.CV_32F, dst=buffers.laplacian)
+        _, lap_std = cv2.meanStdDev(buffers.laplacian)
+        laplacian_var = float(lap_std[0, 0]) ** 2
+
+        # 5. Channel statistics (population mean / stddev, as PIL ImageStat)
+        channel_mean, channel_std = cv2.meanStdDev(working)
+
+        return {
+            "edge_density": float(edge_density),
+            "fire_ratio": fire_ratio,
+            "smoke_ratio": smoke_ratio,
+            "water_ratio": water_ratio,
+            "laplacian_var": laplacian_var,
+            "channel_mean": [float(v) for v in channel_mean.ravel()],
+            "channel_stddev": [float(v) for v in channel_std.ravel()],
+            "working_size": [int(work_w), int(work_h)]
+        }
@@ -0,0 +1,195 @@
+"""
+Content-addressed feature cache for RescueLanka image analysis
+backend/feature_cache.py
+
+Caches the flattened CNN feature vector (and classifier output) per image so
+that repeated uploads of the same photo skip the feature extractor entirely.
+Keys are a content hash of the decoded image at model resolution, optionally
+backed by a perceptual (difference) hash to catch re-encoded copies.
+"""
+
+import os
+import copy
+import hashlib
+import threading
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_MAX_BYTES = int(os.getenv("RESCUELANKA_FEATURE_CACHE_MB", "64")) * 1024 * 1024
+# Maximum Hamming distance for a perceptual-hash hit; -1 disables perceptual matching
+DEFAULT_PHASH_MAX_DISTANCE = int(os.getenv("RESCUELANKA_FEATURE_CACHE_PHASH_DISTANCE", "-1"))
+
+# Fixed per-entry bookkeeping estimate (keys, dict slots, array headers)
+_ENTRY_OVERHEAD_BYTES = 512
+
+
+@dataclass(frozen=True)
+class ImageKey:
+    """Cache key for one decoded image"""
+    content: str
+    perceptual: Optional[int] = None
+
+
+@dataclass
+class CacheEntry:
+    """Cached model outputs for one image"""
+    features: np.ndarray
+    outputs: Any = None
+
+    @property
+    def nbytes(self) -> int:
+        size = self.features.nbytes + _ENTRY_OVERHEAD_BYTES
+        if isinstance(self.outputs, np.ndarray):
+            size += self.outputs.nbytes
+        return size
+
+
+def difference_hash(image_pil) -> int:
+    """64-bit dHash of a PIL image (robust to re-encoding and small resizes)"""
+    small = image_pil.convert('L').resize((9, 8))
+    pixels = np.asarray(small, dtype=np.int16)
+    bits = pixels[:, 1:] > pixels[:, :-1]
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+class FeatureCache:
+    """Bounded LRU cache of feature vectors keyed by image content"""
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+                 phash_max_distance: int = DEFAULT_PHASH_MAX_DISTANCE):
+        self.max_bytes = int(max_bytes)
+        self.phash_max_distance = int(phash_max_distance)
+
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._perceptual_index: Dict[int, str] = {}
+        self._content_to_phash: Dict[str, int] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.perceptual_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def make_key(self, image_pil) -> ImageKey:
+        """Build a key from the decoded image at model input resolution"""
+        pixels = np.ascontiguousarray(np.asarray(image_pil))
+        content = hashlib.blake2b(pixels.tobytes(), digest_size=16)
+        content.update(str(pixels.shape).encode())
+        perceptual = difference_hash(image_pil) if self.phash_max_distance >= 0 else None
+        return ImageKey(content=content.hexdigest(), perceptual=perceptual)
+
+    def _find_perceptual(self, perceptual: int) -> Optional[str]:
+        """Content key of a cached near-duplicate, if any"""
+        if perceptual in self._perceptual_index:
+            return self._perceptual_index[perceptual]
+        if self.phash_max_distance <= 0:
+            return None
+        for candidate, content in self._perceptual_index.items():
+            if bin(candidate ^ perceptual).count("1") <= self.phash_max_distance:
+                return content
+        return None
+
+    def get(self, key: ImageKey) -> Optional[CacheEntry]:
+        """Look up an entry, refreshing its LRU position
+
+        Returns a detached entry: the features are read-only and the outputs are
+        a private copy, so callers may annotate results without touching the cache.
+        """
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key.content)
+            if entry is not None:
+                self._entries.move_to_end(key.content)
+                self.hits += 1
+            elif key.perceptual is not None:
+                content = self._find_perceptual(key.perceptual)
+                if content is not None and content in self._entries:
+                    self._entries.move_to_end(content)
+                    self.perceptual_hits += 1
+                    entry = self._entries[content]
+
+            if entry is None:
+                self.misses += 1
+                return None
+            features, outputs = entry.features, entry.outputs
+
+        return CacheEntry(features=features, outputs=copy.deepcopy(outputs))
+
+    def put(self, key: ImageKey, features: np.ndarray, outputs: Any = None):
+        """Store features (and optional classifier output) for an image"""
+        if not self.enabled:
+            return
+
+        features = np.array(features, dtype=np.float32, copy=True)
+        features.setflags(write=False)
+        entry = CacheEntry(features=features, outputs=copy.deepcopy(outputs))
+        if entry.nbytes > self.max_bytes:
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key.content, None)
+            if previous is not None:
+                self._bytes -= previous.nbytes
+
+            self._entries[key.content] = entry
+            self._bytes += entry.nbytes
+            if key.perceptual is not None:
+                self._perceptual_index[key.perceptual] = key.content
+                self._content_to_phash[key.content] = key.perceptual
+
+            while self._bytes > self.max_bytes and self._entries:
+                self._evict_oldest()
+
+    def update_outputs(self, key: ImageKey, outputs: Any):
+        """Attach classifier output to an existing entry (stored as a private copy)"""
+        outputs = copy.deepcopy(outputs)
+        with self._lock:
+            entry = self._entries.get(key.content)
+            if entry is not None:
+                self._bytes -= entry.nbytes
+                entry.outputs = outputs
+                self._bytes += entry.nbytes
+
+    def _evict_oldest(self):
+        content, entry = self._entries.popitem(last=False)
+        self._bytes -= entry.nbytes
+        perceptual = self._content_to_phash.pop(content, None)
+        if perceptual is not None and self._perceptual_index.get(perceptual) == content:
+            del self._perceptual_index[perceptual]
+        self.evictions += 1
+
+    def clear(self):
+        """Drop all entries (e.g. after a model reload)"""
+        with self._lock:
+            self._entries.clear()
+            self._perceptual_index.clear()
+            self._content_to_phash.clear()
+            self._bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and memory usage"""
+        lookups = self.hits + self.perceptual_hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "perceptual_hits": self.perceptual_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": float((self.hits + self.perceptual_hits) / lookups) if lookups else 0.0
+        }
@@ -0,0 +1,362 @@
+"""
+CPU runtime for the RescueLanka Keras feature extractor
+backend/feature_runtime.py
+
+Converts feature_extractor.h5 once into a TensorFlow Lite flatbuffer, caches
+the artifact next to the .h5 (keyed by the .h5 content hash) and serves
+inference through the TFLite interpreter with a configurable thread count.
+Both runtimes expose the Keras attributes the image pipeline relies on
+(input_shape, output_shape, predict(batch, verbose=0)). The Keras runtime
+serves through concrete tf.functions traced once per batch-size bucket and
+warmed at load time, so requests never pay for tracing.
+
+The default ``auto`` runtime serves TFLite whenever conversion and the parity
+check succeed (and reuses a cached artifact without loading Keras at all), so
+the bucketed Keras graphs only serve with RESCUELANKA_FEATURE_RUNTIME=keras or
+as the fallback when TFLite is unavailable.
+"""
+
+import os
+import time
+import hashlib
+import threading
+import logging
+from pathlib import Path
+from typing import Dict, Any, List, Tuple
+
+import numpy as np
+
+from lazy_imports import lazy_import, lazy_from, module_available
+
+HAS_TF = module_available("tensorflow")
+tf = lazy_import("tensorflow")
+
+# The standalone interpreter avoids importing full TensorFlow when a cached artifact exists
+if module_available("tflite_runtime"):
+    TFLiteInterpreter = lazy_from("tflite_runtime.interpreter", "Interpreter")
+elif HAS_TF:
+    TFLiteInterpreter = lazy_from("tensorflow.lite", "Interpreter")
+else:
+    TFLiteInterpreter = None
+
+logger = logging.getLogger(__name__)
+
+# keras | tflite | auto (tflite when conversion and parity succeed, keras otherwise)
+DEFAULT_FEATURE_RUNTIME = os.getenv("RESCUELANKA_FEATURE_RUNTIME", "auto")
+# Interpreter threads; 0 uses every available core
+DEFAULT_FEATURE_THREADS = int(os.getenv("RESCUELANKA_FEATURE_THREADS", "0"))
+# Maximum feature difference (relative to the largest Keras activation) accepted after conversion
+DEFAULT_FEATURE_PARITY_TOLERANCE = float(os.getenv("RESCUELANKA_FEATURE_PARITY_TOLERANCE", "1e-3"))
+# Batch sizes both runtimes are specialized and warmed for (Keras concrete functions,
+# one TFLite interpreter each); empty uses Model.predict / a resized interpreter
+DEFAULT_BATCH_BUCKETS = [
+    int(v) for v in os.getenv("RESCUELANKA_FEATURE_BATCH_BUCKETS", "1,2,4,8,16").split(",") if v.strip()
+]
+
+# Digest memo keyed by (path, size, mtime) so repeated checks do not re-read the .h5
+_digest_memo: Dict[Tuple[str, int, int], str] = {}
+
+
+def model_file_digest(model_path: Path) -> str:
+    """SHA-256 prefix of a model file"""
+    model_path = Path(model_path)
+    stat = model_path.stat()
+    memo_key = (str(model_path.resolve()), stat.st_size, stat.st_mtime_ns)
+    if memo_key not in _digest_memo:
+        digest = hashlib.sha256()
+        with open(model_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        _digest_memo[memo_key] = digest.hexdigest()[:16]
+    return _digest_memo[memo_key]
+
+
+def tflite_artifact_path(h5_path: Path) -> Path:
+    """Cached TFLite artifact for a Keras .h5 file"""
+    h5_path = Path(h5_path)
+    return h5_path.parent / ".runtime_cache" / f"{h5_path.stem}-{model_file_digest(h5_path)}.tflite"
+
+
+def convert_to_tflite(keras_model, output_path: Path) -> Path:
+    """Convert a Keras model to a float32 TFLite flatbuffer (no quantization)"""
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    converter = tf.lite.TFLiteConverter.from_keras_model(keras_model)
+    flatbuffer = converter.convert()
+
+    # Write to a temporary file first so concurrent workers never load a partial artifact
+    tmp_path = output_path.with_suffix(f".{os.getpid()}.tmp")
+    tmp_path.write_bytes(flatbuffer)
+    os.replace(tmp_path, output_path)
+    return output_path
+
+
+def bucket_for(batch_size: int, buckets: List[int]) -> int:
+    """Smallest bucket that fits the batch (the largest bucket if none does)"""
+    for bucket in buckets:
+        if bucket >= batch_size:
+            return bucket
+    return buckets[-1]
+
+
+class KerasFeatureRuntime:
+    """Full Keras model (reference runtime) served through per-bucket concrete functions
+
+    Batches are zero-padded up to the next bucket and split when larger than
+    the biggest bucket, so every call hits an already traced graph.
+    """
+
+    runtime = "keras"
+
+    def __init__(self, model, batch_buckets: List[int] = DEFAULT_BATCH_BUCKETS, warm: bool = True):
+        self.model = model
+        self.input_shape = model.input_shape
+        self.output_shape = model.output_shape
+        self.batch_buckets = sorted({int(b) for b in batch_buckets if int(b) > 0})
+
+        self.trace_count = 0
+        self.warmup_ms: Dict[int, float] = {}
+        self.bucket_calls: Dict[int, int] = {bucket: 0 for bucket in self.batch_buckets}
+        self._concrete: Dict[int, Any] = {}
+        self._serve = None
+
+        if self.batch_buckets:
+            self._build_serving_function()
+            if warm:
+                self.warm_up()
+
+    def _build_serving_function(self):
+        model = self.model
+
+        def serve(images):
+            # Python body only runs while tracing: one trace per bucket
+            self.trace_count += 1
+            return model(images, training=False)
+
+        self._serve = tf.function(serve, autograph=False)
+
+    def _concrete_function(self, bucket: int):
+        concrete = self._concrete.get(bucket)
+        if concrete is None:
+            spec = tf.TensorSpec((bucket,) + tuple(self.input_shape[1:]), tf.float32)
+            concrete = self._serve.get_concrete_function(spec)
+            self._concrete[bucket] = concrete
+        return concrete
+
+    def warm_up(self):
+        """Trace and run every bucket once so the first request is served from a ready graph"""
+        for bucket in self.batch_buckets:
+            started_at = time.perf_counter()
+            dummy = np.zeros((bucket,) + tuple(self.input_shape[1:]), dtype=np.float32)
+            self._concrete_function(bucket)(tf.constant(dummy))
+            self.warmup_ms[bucket] = (time.perf_counter() - started_at) * 1000
+        logger.info(f"🔥 Feature extractor warmed for batch sizes {self.batch_buckets} "
+                    f"({sum(self.warmup_ms.values()):.0f} ms, {self.trace_count} traces)")
+
+    def _predict_bucket(self, batch: np.ndarray) -> np.ndarray:
+        size = len(batch)
+        bucket = bucket_for(size, self.batch_buckets)
+        if size < bucket:
+            padding = np.zeros((bucket - size,) + batch.shape[1:], dtype=batch.dtype)
+            batch = np.concatenate([batch, padding], axis=0)
+        self.bucket_calls[bucket] += 1
+        return self._concrete_function(bucket)(tf.constant(batch)).numpy()[:size]
+
+    def predict(self, batch: np.ndarray, verbose: int = 0) -> np.ndarray:
+        if self._serve is None:
+            return self.model.predict(batch, verbose=verbose)
+
+        batch = np.asarray(batch, dtype=np.float32)
+        largest = self.batch_buckets[-1]
+        if len(batch) <= largest:
+            return self._predict_bucket(batch)
+        return np.concatenate(
+            [self._predict_bucket(batch[start:start + largest]) for start in range(0, len(batch), largest)],
+            axis=0
+        )
+
+    def describe(self) -> Dict[str, Any]:
+        # Requests only call the per-bucket concrete functions, which never retrace
+        return {
+            "runtime": self.runtime,
+            "batch_buckets": self.batch_buckets,
+            "warmup_ms": {str(bucket): ms for bucket, ms in self.warmup_ms.items()},
+            "warmup_total_ms": sum(self.warmup_ms.values()),
+            "trace_count": self.trace_count,
+            "bucket_calls": {str(bucket): calls for bucket, calls in self.bucket_calls.items()}
+        }
+
+
+class TFLiteFeatureRuntime:
+    """TFLite interpreters with a Keras-like predict()
+
+    One interpreter is allocated per batch-size bucket (the same buckets the
+    Keras runtime uses), and batches are zero-padded up to the next bucket, so
+    varying micro-batch sizes never trigger resize_tensor_input/allocate_tensors.
+    Without buckets a single interpreter is resized whenever the batch size changes.
+    """
+
+    runtime = "tflite"
+
+    def __init__(self, artifact_path: Path, num_threads: int = DEFAULT_FEATURE_THREADS,
+                 batch_buckets: List[int] = DEFAULT_BATCH_BUCKETS):
+        self.artifact_path = Path(artifact_path)
+        self.num_threads = int(num_threads) if num_threads > 0 else (os.cpu_count() or 1)
+        self.batch_buckets = sorted({int(b) for b in batch_buckets if int(b) > 0})
+
+        interpreter = self._new_interpreter()
+        input_details = interpreter.get_input_details()[0]
+        output_details = interpreter.get_output_details()[0]
+        self._input_index = input_details["index"]
+        self._output_index = output_details["index"]
+        self._input_dtype = input_details["dtype"]
+        native_batch_size = int(input_details["shape"][0])
+
+        # Keras-style shapes with an open batch dimension
+        self.input_shape = (None,) + tuple(int(v) for v in input_details["shape"][1:])
+        self.output_shape = (None,) + tuple(int(v) for v in output_details["shape"][1:])
+
+        # batch size -> (interpreter, lock); interpreters are not thread-safe,
+        # but different buckets can run concurrently
+        self._interpreters: Dict[int, Tuple[Any, threading.Lock]] = {}
+        for bucket in self.batch_buckets:
+            if bucket != native_batch_size:
+                bucket_interpreter = self._new_interpreter()
+                self._resize(bucket_interpreter, bucket)
+            else:
+                bucket_interpreter = interpreter
+            self._interpreters[bucket] = (bucket_interpreter, threading.Lock())
+        # Without buckets: one interpreter resized on demand
+        self._dynamic = interpreter
+        self._dynamic_batch_size = native_batch_size
+        self._dynamic_lock = threading.Lock()
+        self.bucket_calls: Dict[int, int] = {bucket: 0 for bucket in self.batch_buckets}
+        self.reallocations = 0
+
+        # One invoke per interpreter at load time so requests do not pay for kernel preparation
+        self.warmup_ms: Dict[int, float] = {}
+        for bucket in (self.batch_buckets or [1]):
+            started_at = time.perf_counter()
+            self.predict(np.zeros((bucket,) + self.input_shape[1:], dtype=np.float32))
+            self.warmup_ms[bucket] = (time.perf_counter() - started_at) * 1000
+        self.bucket_calls = {bucket: 0 for bucket in self.batch_buckets}
+
+    def _new_interpreter(self):
+        interpreter = TFLiteInterpreter(model_path=str(self.artifact_path), num_threads=self.num_threads)
+        interpreter.allocate_tensors()
+        return interpreter
+
+    def _resize(self, interpreter, batch_size: int):
+        interpreter.resize_tensor_input(self._input_index, [batch_size] + list(self.input_shape[1:]))
+        interpreter.allocate_tensors()
+
+    def _invoke(self, batch_size: int, batch: np.ndarray) -> np.ndarray:
+        interpreter, lock = self._interpreters[batch_size]
+        with lock:
+            interpreter.set_tensor(self._input_index, batch)
+            interpreter.invoke()
+            return interpreter.get_tensor(self._output_index).copy()
+
+    def _predict_bucket(self, batch: np.ndarray) -> np.ndarray:
+        size = len(batch)
+        bucket = bucket_for(size, self.batch_buckets)
+        if size < bucket:
+            padding = np.zeros((bucket - size,) + batch.shape[1:], dtype=batch.dtype)
+            batch = np.concatenate([batch, padding], axis=0)
+        self.bucket_calls[bucket] += 1
+        return self._invoke(bucket, batch)[:size]
+
+    def _predict_dynamic(self, batch: np.ndarray) -> np.ndarray:
+        with self._dynamic_lock:
+            if batch.shape[0] != self._dynamic_batch_size:
+                self._resize(self._dynamic, batch.shape[0])
+                self._dynamic_batch_size = batch.shape[0]
+                self.reallocations += 1
+            self._dynamic.set_tensor(self._input_index, batch)
+            self._dynamic.invoke()
+            return self._dynamic.get_tensor(self._output_index).copy()
+
+    def predict(self, batch: np.ndarray, verbose: int = 0) -> np.ndarray:
+        batch = np.ascontiguousarray(batch, dtype=self._input_dtype)
+        if not self.batch_buckets:
+            return self._predict_dynamic(batch)
+
+        largest = self.batch_buckets[-1]
+        if len(batch) <= largest:
+            return self._predict_bucket(batch)
+        return np.concatenate(
+            [self._predict_bucket(batch[start:start + largest]) for start in range(0, len(batch), largest)],
+            axis=0
+        )
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "runtime": self.runtime,
+            "threads": self.num_threads,
+            "artifact": str(self.artifact_path),
+            "batch_buckets": self.batch_buckets,
+            "warmup_ms": {str(bucket): ms for bucket, ms in self.warmup_ms.items()},
+            "warmup_total_ms": sum(self.warmup_ms.values()),
+            "bucket_calls": {str(bucket): calls for bucket, calls in self.bucket_calls.items()},
+            "reallocations": self.reallocations
+        }
+
+
+def check_feature_parity(keras_model, tflite_runtime: TFLiteFeatureRuntime,
+                         tolerance: float = DEFAULT_FEATURE_PARITY_TOLERANCE) -> Tuple[bool, float]:
+    """Compare Keras and TFLite features on a fixed random input"""
+    rng = np.random.default_rng(0)
+    sample = rng.random((1,) + tuple(keras_model.input_shape[1:])).astype(np.float32) * 255.0 - 128.0
+    expected = keras_model.predict(sample, verbose=0)
+    actual = tflite_runtime.predict(sample)
+    max_diff = float(np.max(np.abs(expected - actual)))
+    scale = max(1.0, float(np.max(np.abs(expected))))
+    return max_diff <= tolerance * scale, max_diff
+
+
+def load_feature_runtime(h5_path: Path, runtime: str = DEFAULT_FEATURE_RUNTIME,
+                         num_threads: int = DEFAULT_FEATURE_THREADS):
+    """Load the feature extractor through the configured runtime
+
+    A cached TFLite artifact for the same .h5 content is used directly. Otherwise
+    the Keras model is converted, checked for parity and the artifact is cached.
+    Falls back to Keras (``auto``) when conversion is unavailable or fails.
+    """
+    h5_path = Path(h5_path)
+
+    if runtime in ("tflite", "auto") and TFLiteInterpreter is not None:
+        try:
+            artifact = tflite_artifact_path(h5_path)
+            if artifact.exists():
+                feature_runtime = TFLiteFeatureRuntime(artifact, num_threads)
+                logger.info(f"📦 Using cached TFLite feature extractor: {artifact}")
+                return feature_runtime
+
+            if HAS_TF:
+                keras_model = tf.keras.models.load_model(str(h5_path))
+                logger.info(f"🔄 Converting feature extractor to TFLite: {artifact}")
+                convert_to_tflite(keras_model, artifact)
+                feature_runtime = TFLiteFeatureRuntime(artifact, num_threads)
+
+                passed, max_diff = check_feature_parity(keras_model, feature_runtime)
+                if passed:
+                    logger.info(f"✅ TFLite feature extractor ready ({feature_runtime.num_threads} threads, "
+                                f"max diff {max_diff:.2e})")
+                    return feature_runtime
+
+                logger.warning(f"⚠️ TFLite parity check failed (max diff {max_diff:.2e}) - using Keras")
+                artifact.unlink(missing_ok=True)
+                return KerasFeatureRuntime(keras_model)
+
+        except Exception as e:
+            if runtime == "tflite":
+                raise
+            logger.warning(f"⚠️ TFLite runtime unavailable: {e} - using Keras")
+
+    elif runtime == "tflite":
+        raise RuntimeError("TFLite interpreter not available")
+
+    if not HAS_TF:
+        raise RuntimeError(f"TensorFlow not available to load {h5_path}")
+    return KerasFeatureRuntime(tf.keras.models.load_model(str(h5_path)))
@@ -0,0 +1,126 @@
+"""
+Per-request decoded image context for RescueLanka image analysis
+backend/image_context.py
+
+Decodes the uploaded bytes once and lazily derives the views the image
+pipeline needs (RGB array for the damage heuristics, resized model input).
+JPEGs are reduced at decode time to the smallest power-of-two scale that
+still covers what the models need, and EXIF orientation is applied.
+"""
+
+import io
+import os
+import logging
+from typing import Any, Dict, Optional, Tuple, Union
+
+import numpy as np
+
+from lazy_imports import lazy_import, modules_available
+from metrics import METRICS
+
+HAS_IMAGE_LIBRARIES = modules_available("PIL")
+if not HAS_IMAGE_LIBRARIES:
+    print("⚠️ Missing image libraries: Pillow not installed")
+Image = lazy_import("PIL.Image")
+ImageOps = lazy_import("PIL.ImageOps")
+
+logger = logging.getLogger(__name__)
+
+# Smallest side a decode-time reduction may produce; 0 always decodes at full resolution
+DEFAULT_DECODE_MIN_SIDE = int(os.getenv("RESCUELANKA_DECODE_MIN_SIDE", "512"))
+
+
+def decode_floor(*required_sides: Optional[int]) -> int:
+    """Decode floor for a service: DEFAULT_DECODE_MIN_SIDE raised to every side it needs
+
+    Returns 0 (full-resolution decode) when reduction is disabled.
+    """
+    if DEFAULT_DECODE_MIN_SIDE <= 0:
+        return 0
+    return max([DEFAULT_DECODE_MIN_SIDE] + [int(side) for side in required_sides if side])
+
+EXIF_ORIENTATION_TAG = 0x0112
+# Orientations that swap width and height
+_TRANSPOSED_ORIENTATIONS = (5, 6, 7, 8)
+
+
+class DecodedImage:
+    """Decoded RGB image shared by the CNN path and the damage heuristics
+
+    Views are computed on first access and cached for the lifetime of the
+    request, so JPEG decode and colour conversions happen at most once.
+    """
+
+    def __init__(self, image_pil: "Image.Image", original_size: Optional[Tuple[int, int]] = None):
+        if image_pil.mode != 'RGB':
+            image_pil = image_pil.convert('RGB')
+        self.pil = image_pil
+        # (width, height) of the stored image after orientation, before any reduction
+        self.original_size = tuple(original_size) if original_size else image_pil.size
+        self._rgb = None
+        self._resized: Dict[Tuple[int, int], "Image.Image"] = {}
+
+    @classmethod
+    def from_bytes(cls, image_data: bytes, min_side: int = DEFAULT_DECODE_MIN_SIDE) -> "DecodedImage":
+        """Decode raw upload bytes, reduced at decode time where the format allows
+
+        For JPEG, PIL's draft mode picks the largest 1/2, 1/4 or 1/8 DCT scaling
+        that keeps both sides >= ``min_side``, so a 12 MP photo is never fully
+        decoded just to feed a 224x224 model.
+        """
+        with METRICS.stage("image_decode"):
+            image_pil = Image.open(io.BytesIO(image_data))
+            stored_size = image_pil.size
+            if min_side and min_side > 0 and image_pil.format == "JPEG":
+                image_pil.draft("RGB", (min_side, min_side))
+            image_pil.load()
+
+            orientation = image_pil.getexif().get(EXIF_ORIENTATION_TAG, 1)
+            if orientation != 1:
+                image_pil = ImageOps.exif_transpose(image_pil)
+            if orientation in _TRANSPOSED_ORIENTATIONS:
+                stored_size = (stored_size[1], stored_size[0])
+
+            decoded = cls(image_pil, original_size=stored_size)
+
+        METRICS.observe_image(*stored_size)
+        return decoded
+
+    @classmethod
+    def ensure(cls, image: Union[bytes, "DecodedImage"], min_side: int = DEFAULT_DECODE_MIN_SIDE) -> "DecodedImage":
+        """Accept either raw bytes or an already decoded image"""
+        if isinstance(image, DecodedImage):
+            return image
+        return cls.from_bytes(image, min_side=min_side)
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        """(width, height) of the decoded image"""
+        return self.pil.size
+
+    @property
+    def decode_scale(self) -> int:
+        """Reduction applied at decode time (1 = full resolution)"""
+        return max(1, round(self.original_size[0] / max(1, self.pil.size[0])))
+
+    def describe(self) -> Dict[str, Any]:
+        """Original and decoded dimensions for processing_info"""
+        return {
+            "original_size": [int(v) for v in self.original_size],
+            "decoded_size": [int(v) for v in self.pil.size],
+            "decode_scale": self.decode_scale
+        }
+
+    @property
+    def rgb(self) -> np.ndarray:
+        """HxWx3 uint8 RGB array"""
+        if self._rgb is None:
+            self._rgb = np.asarray(self.pil)
+        return self._rgb
+
+    def resized(self, size: Tuple[int, int]) -> "Image.Image":
+        """PIL image resized for model input (cached per size)"""
+        size = tuple(int(v) for v in size)
+        if size not in self._resized:
+            self._resized[size] = self.pil.resize(size)
+        return self._resized[size]
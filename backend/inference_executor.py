@@ -0,0 +1,178 @@
+"""
+Bounded inference executor for the RescueLanka model services
+backend/inference_executor.py
+
+Runs blocking model calls on a fixed-size thread pool so async endpoints can
+await them without freezing the event loop. Each model group has its own
+concurrency limit, the number of pending calls is bounded, and queue depth /
+wait / run times are tracked for /models/info.
+"""
+
+import os
+import time
+import asyncio
+import threading
+import contextvars
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Any, Callable, Dict, Optional
+
+from tracing import child_span
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INFERENCE_WORKERS = int(os.getenv("RESCUELANKA_INFERENCE_WORKERS", str(min(8, os.cpu_count() or 1))))
+# Calls waiting or running before new ones are rejected (HTTP 503)
+DEFAULT_MAX_PENDING = int(os.getenv("RESCUELANKA_INFERENCE_MAX_PENDING", "256"))
+
+# Concurrent calls allowed per model group
+DEFAULT_MODEL_CONCURRENCY = {
+    "text": int(os.getenv("RESCUELANKA_TEXT_CONCURRENCY", "4")),
+    "image": int(os.getenv("RESCUELANKA_IMAGE_CONCURRENCY", "2")),
+    "complete": int(os.getenv("RESCUELANKA_COMPLETE_CONCURRENCY", "4")),
+}
+
+
+class InferenceOverloaded(RuntimeError):
+    """Raised when the executor already holds the maximum number of pending calls"""
+
+
+class _ModelLane:
+    """Concurrency limit, backlog and counters for one model group
+
+    Calls beyond the limit wait in the lane's backlog rather than occupying a
+    pool thread, so a saturated model group cannot starve the others.
+    """
+
+    def __init__(self, name: str, limit: Optional[int]):
+        self.name = name
+        self.limit = limit
+        self.active = 0
+        self.backlog: deque = deque()
+
+        self.queued = 0
+        self.running = 0
+        self.max_queued = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.total_wait_s = 0.0
+        self.total_run_s = 0.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        finished = self.completed + self.failed
+        return {
+            "concurrency_limit": self.limit,
+            "queued": self.queued,
+            "running": self.running,
+            "max_queued": self.max_queued,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "avg_wait_ms": (self.total_wait_s / finished) * 1000 if finished else 0.0,
+            "avg_run_ms": (self.total_run_s / finished) * 1000 if finished else 0.0
+        }
+
+
+class InferenceExecutor:
+    """Thread pool with per-model concurrency limits and queue-depth metrics"""
+
+    def __init__(self, max_workers: int = DEFAULT_INFERENCE_WORKERS, max_pending: int = DEFAULT_MAX_PENDING,
+                 model_concurrency: Optional[Dict[str, int]] = None, name: str = "inference"):
+        self.max_workers = max(1, int(max_workers))
+        self.max_pending = int(max_pending)
+        self.name = name
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=name)
+
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._lanes: Dict[str, _ModelLane] = {}
+        for model, limit in (model_concurrency or DEFAULT_MODEL_CONCURRENCY).items():
+            self._lanes[model] = _ModelLane(model, limit)
+
+    def submit(self, model: str, fn: Callable, *args, **kwargs) -> Future:
+        """Schedule a blocking call for a model group; returns a concurrent Future"""
+        future: Future = Future()
+        # The caller's context (current trace span) travels with the call
+        call = (future, fn, args, kwargs, time.perf_counter(), contextvars.copy_context())
+
+        with self._lock:
+            lane = self._lanes.get(model)
+            if lane is None:
+                lane = self._lanes[model] = _ModelLane(model, None)
+
+            if self.max_pending > 0 and self._pending >= self.max_pending:
+                lane.rejected += 1
+                raise InferenceOverloaded(
+                    f"Inference queue full ({self._pending} pending calls) - try again shortly"
+                )
+            self._pending += 1
+            lane.queued += 1
+            lane.max_queued = max(lane.max_queued, lane.queued)
+
+            if lane.limit and lane.active >= lane.limit:
+                lane.backlog.append(call)
+                return future
+            lane.active += 1
+
+        self._pool.submit(self._execute, lane, call)
+        return future
+
+    async def run(self, model: str, fn: Callable, *args, **kwargs) -> Any:
+        """Await a blocking call without blocking the event loop"""
+        return await asyncio.wrap_future(self.submit(model, fn, *args, **kwargs))
+
+    def _execute(self, lane: _ModelLane, call):
+        future, fn, args, kwargs, enqueued_at, context = call
+        started_at = time.perf_counter()
+        with self._lock:
+            lane.queued -= 1
+            lane.running += 1
+            lane.total_wait_s += started_at - enqueued_at
+
+        succeeded = None
+        # Calls whose awaiting request was cancelled are skipped
+        if future.set_running_or_notify_cancel():
+            try:
+                future.set_result(context.run(self._traced_call, lane.name, started_at - enqueued_at,
+                                              fn, args, kwargs))
+                succeeded = True
+            except BaseException as e:
+                future.set_exception(e)
+                succeeded = False
+
+        with self._lock:
+            lane.running -= 1
+            lane.total_run_s += time.perf_counter() - started_at
+            if succeeded is True:
+                lane.completed += 1
+            elif succeeded is False:
+                lane.failed += 1
+            self._pending -= 1
+
+            next_call = lane.backlog.popleft() if lane.backlog else None
+            if next_call is None:
+                lane.active -= 1
+
+        if next_call is not None:
+            self._pool.submit(self._execute, lane, next_call)
+
+    @staticmethod
+    def _traced_call(model: str, queue_wait_s: float, fn: Callable, args, kwargs) -> Any:
+        with child_span(f"inference:{model}", queue_wait_ms=round(queue_wait_s * 1000, 3)):
+            return fn(*args, **kwargs)
+
+    def shutdown(self, wait: bool = True):
+        """Stop accepting work and (optionally) wait for running calls"""
+        self._pool.shutdown(wait=wait)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Pool size, queue depth and per-model counters"""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "pending": self._pending,
+                "models": {name: lane.get_stats() for name, lane in self._lanes.items()}
+            }
@@ -0,0 +1,59 @@
+"""
+NumPy-aware JSON responses for the RescueLanka services
+backend/json_response.py
+
+Model results carry NumPy scalars and arrays. Instead of rebuilding every
+result dict with native Python types, results are serialized once at the
+HTTP edge by orjson, which encodes NumPy values natively. Falls back to the
+standard json module (with a NumPy-aware default) when orjson is missing.
+"""
+
+import json
+from typing import Any
+
+import numpy as np
+from fastapi.responses import JSONResponse
+
+from metrics import METRICS
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+def numpy_default(obj: Any) -> Any:
+    """Encode values the JSON encoder does not handle itself"""
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+if HAS_ORJSON:
+    _ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    def dumps_json(content: Any) -> bytes:
+        """Serialize a result tree (NumPy values included) to UTF-8 JSON"""
+        return orjson.dumps(content, default=numpy_default, option=_ORJSON_OPTIONS)
+else:
+    def dumps_json(content: Any) -> bytes:
+        """Serialize a result tree (NumPy values included) to UTF-8 JSON"""
+        return json.dumps(content, default=numpy_default, ensure_ascii=False,
+                          separators=(",", ":")).encode("utf-8")
+
+
+class NumpyJSONResponse(JSONResponse):
+    """JSONResponse that serializes NumPy values without a conversion pass
+
+    Endpoints return this directly (``return NumpyJSONResponse(result)``) so
+    FastAPI's jsonable_encoder, which cannot handle NumPy types, is skipped.
+    """
+
+    def render(self, content: Any) -> bytes:
+        with METRICS.stage("serialization"):
+            return dumps_json(content)
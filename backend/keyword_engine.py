@@ -0,0 +1,203 @@
+"""
+Shared keyword lexicon and single-pass matcher for the fallback paths
+backend/keyword_engine.py
+
+Keyword heuristics take over when a model is loading, failing or overloaded,
+so they must be cheap. All of them read one central lexicon (English plus
+Sinhala/Tamil in native script and common romanizations). The lexicon is
+compiled once into a single case-insensitive regex, and one scan of a text
+returns every matched category.
+
+Latin-script terms match whole words only ("sea" does not match "search"), so
+inflected forms are listed explicitly. Native-script terms, and any term
+written with a trailing "*", match at the start of a word because suffixes
+attach directly to the stem. The longest term wins at each position. A term
+that contains another term also carries that term's categories, so a longer
+match never hides a category.
+"""
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, Mapping, Optional, Tuple
+
+# category -> terms (lowercase; a term may sit in several categories)
+LEXICON: Dict[str, Tuple[str, ...]] = {
+    # Calls for help / explicit emergency
+    "distress": (
+        "emergency", "emergencies", "urgent", "urgently", "help", "helping", "helpless",
+        "rescue", "rescued", "sos", "save us",
+        # Sinhala: udaw / udavu (help), hadisi (urgent), aapada (disaster), beraganna (rescue)
+        "udaw", "udav", "hadisi", "hadissi", "aapada", "apada", "beraganna",
+        "උදව්", "හදිසි", "ආපදා", "බේරගන්න",
+        # Tamil: udhavi (help), avasaram (urgent), aabathu (danger), kaappaatru (save)
+        "udhavi", "uthavi", "avasaram", "aabathu", "abathu", "kaappaatru", "kapatru",
+        "உதவி", "அவசரம்", "ஆபத்து", "காப்பாற்று",
+    ),
+    # Life-threatening situations
+    "critical": (
+        "critical", "severe", "severely", "life threatening", "immediate", "immediately",
+        "trapped", "collapsed", "died", "death", "deaths", "dead", "casualties", "drowning",
+        # Sinhala: hira wela (trapped), maranaya (death), kada watuna (collapsed), gilenawa (drowning)
+        "hira wela", "hirawela", "maranaya", "kada watuna", "kadawatuna", "gilenawa",
+        "හිර වෙලා", "මරණ", "කඩා වැටුණ", "ගිලෙනවා",
+        # Tamil: sikki (trapped), maranam (death), idindhu (collapsed), moozhgi (drowning)
+        "sikki", "maranam", "idindhu", "idinthu", "moozhgi",
+        "சிக்கி", "மரணம்", "இடிந்து", "மூழ்கி",
+    ),
+    # Hazards themselves
+    "hazard": (
+        "fire", "fires", "flood", "floods", "flooded", "flooding", "landslide", "landslides",
+        "explosion", "explosions", "smoke", "tsunami", "cyclone", "earthquake", "earthquakes",
+        # Sinhala: ginna (fire), gangwathura (flood), nayayama (landslide)
+        "ginna", "gini", "gangwathura", "gan wathura", "gangathura", "nayayama", "naayayaama",
+        "ගින්න", "ගංවතුර", "නායයෑම",
+        # Tamil: theevibathu (fire), vellam (flood), nilacharivu / mansarivu (landslide)
+        "theevibathu", "thee vibathu", "vellam", "nilacharivu", "mansarivu",
+        "தீவிபத்து", "வெள்ளம்", "மண்சரிவு", "நிலச்சரிவு",
+    ),
+    # Hazard subtypes that need different responses
+    "fire": (
+        "fire", "fires", "smoke", "burning", "flames",
+        "ginna", "gini", "ගින්න", "theevibathu", "thee vibathu", "தீவிபத்து",
+    ),
+    "flood": (
+        "flood", "floods", "flooded", "flooding", "water", "floodwater",
+        "gangwathura", "gan wathura", "gangathura", "ගංවතුර", "vellam", "வெள்ளம்",
+    ),
+    # Distress that states its own urgency (a plain call for help does not)
+    "urgent": (
+        "emergency", "emergencies", "urgent", "urgently",
+        "hadisi", "hadissi", "හදිසි", "avasaram", "அவசரம்",
+    ),
+    # Damage and displacement
+    "damage": (
+        "damaged", "destroyed", "injured", "injuries", "evacuation", "evacuate", "evacuated",
+        # Sinhala: thuwala (injured), vinasha (destroyed)
+        "thuwala", "thuvala", "vinasha", "තුවාල", "විනාශ",
+        # Tamil: kaayam (injury), sethamadaindha (damaged)
+        "kaayam", "kayam", "sethamadaindha", "காயம்", "சேதம்",
+    ),
+    # Needs short of an emergency
+    "need": ("need", "needs", "needed", "assistance", "damaged", "supplies", "shortage", "shortages"),
+    # People at risk
+    "people": (
+        "person", "persons", "people", "trapped", "injured", "casualties", "victims",
+        "family", "families", "child", "children",
+        # Sinhala: minissu (people), lamai (children); Tamil: makkal (people), kuzhandhaigal (children)
+        "minissu", "lamai", "මිනිස්සු", "ළමයි", "makkal", "kuzhandhaigal", "மக்கள்", "குழந்தைகள்",
+    ),
+    "structural": ("building", "buildings", "structure", "structures", "collapsed", "wall", "walls",
+                   "roof", "roofs", "bridge", "bridges"),
+    "blocked_access": ("blocked", "debris", "impassable", "rubble"),
+    # Roads named in a report; text paths read these as access problems, but a
+    # detected "road" object is just part of the scene
+    "road": ("road", "roads"),
+    "minor": ("minor", "small", "light", "slight"),
+    # Location hints
+    "major_city": ("colombo", "galle", "kandy", "jaffna", "batticaloa"),
+    "coastal": ("coast", "coastal", "beach", "sea", "ocean"),
+    "hill_country": ("mountain", "mountains", "hill", "hills", "hillside", "upcountry"),
+}
+
+
+@dataclass(frozen=True)
+class KeywordHits:
+    """Categories and lexicon terms found in one text"""
+    categories: FrozenSet[str]
+    terms: Tuple[str, ...]
+
+    def has(self, *categories: str) -> bool:
+        """True if any of the given categories matched"""
+        return not self.categories.isdisjoint(categories)
+
+    @property
+    def is_emergency(self) -> bool:
+        return self.has("distress", "critical", "hazard")
+
+    @property
+    def urgency_level(self) -> str:
+        if self.has("critical"):
+            return "CRITICAL"
+        if self.has("distress"):
+            return "HIGH"
+        if self.has("need", "damage"):
+            return "MEDIUM"
+        return "LOW"
+
+    @property
+    def severity_level(self) -> Optional[str]:
+        """CRITICAL / HIGH / LOW from the wording, None when it says nothing
+
+        Fire is critical and flooding high; other hazards and bare calls for
+        help leave the severity open.
+        """
+        if self.has("critical", "fire"):
+            return "CRITICAL"
+        if self.has("damage", "flood", "urgent"):
+            return "HIGH"
+        if self.has("minor"):
+            return "LOW"
+        return None
+
+
+NO_HITS = KeywordHits(frozenset(), ())
+
+# Probabilities reported by the urgency fallbacks for each keyword urgency level
+URGENCY_FALLBACK_PROBABILITIES = {
+    "CRITICAL": {"LOW": 0.1, "MEDIUM": 0.1, "HIGH": 0.2, "CRITICAL": 0.6},
+    "HIGH": {"LOW": 0.1, "MEDIUM": 0.2, "HIGH": 0.6, "CRITICAL": 0.1},
+    "MEDIUM": {"LOW": 0.2, "MEDIUM": 0.6, "HIGH": 0.2, "CRITICAL": 0.0},
+    "LOW": {"LOW": 0.6, "MEDIUM": 0.3, "HIGH": 0.1, "CRITICAL": 0.0}
+}
+
+
+class KeywordEngine:
+    """One compiled alternation over the whole lexicon"""
+
+    def __init__(self, lexicon: Mapping[str, Iterable[str]], cache_size: int = 4096):
+        term_categories: Dict[str, set] = {}
+        prefix_terms = set()
+        for category, terms in lexicon.items():
+            for term in terms:
+                term = term.lower()
+                if term.endswith("*") or not term.isascii():
+                    term = term.rstrip("*")
+                    prefix_terms.add(term)
+                term_categories.setdefault(term, set()).add(category)
+
+        def term_pattern(term: str) -> str:
+            return re.escape(term) if term in prefix_terms else re.escape(term) + r"(?!\w)"
+
+        # A longer term also carries the categories of the terms it contains
+        patterns = {term: re.compile(r"(?<!\w)" + term_pattern(term)) for term in term_categories}
+        self.term_categories: Dict[str, FrozenSet[str]] = {}
+        for term, categories in term_categories.items():
+            merged = set(categories)
+            for other, pattern in patterns.items():
+                if other != term and pattern.search(term):
+                    merged |= term_categories[other]
+            self.term_categories[term] = frozenset(merged)
+
+        # Longest first so the alternation prefers the most specific term
+        alternation = "|".join(term_pattern(term) for term in sorted(term_categories, key=len, reverse=True))
+        self.pattern = re.compile(r"(?<!\w)(?:" + alternation + ")", re.IGNORECASE)
+        self.categories = frozenset(lexicon)
+        self.scan = lru_cache(maxsize=cache_size)(self._scan)
+
+    def _scan(self, text: str) -> KeywordHits:
+        if not text:
+            return NO_HITS
+        terms = []
+        categories = set()
+        for match in self.pattern.finditer(text):
+            term = match.group(0).lower()
+            terms.append(term)
+            categories |= self.term_categories.get(term, frozenset())
+        if not terms:
+            return NO_HITS
+        return KeywordHits(frozenset(categories), tuple(dict.fromkeys(terms)))
+
+
+# Shared engine; KEYWORDS.scan(text) is cached per distinct text
+KEYWORDS = KeywordEngine(LEXICON)
@@ -0,0 +1,97 @@
+"""
+Lazy imports for the heavy ML libraries used by RescueLanka services
+backend/lazy_imports.py
+
+TensorFlow, torch, transformers, OpenCV and friends take seconds to import.
+Availability is probed with importlib.util.find_spec (no import), and the
+modules themselves are imported on first attribute access - i.e. when the
+corresponding model is actually loaded - so gateway processes bind their
+port quickly.
+"""
+
+import importlib
+import importlib.util
+import threading
+import types
+from typing import Any
+
+
+def module_available(name: str) -> bool:
+    """True if a module can be imported, without importing it"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        # Raised for submodules whose parent package is missing
+        return False
+
+
+def modules_available(*names: str) -> bool:
+    return all(module_available(name) for name in names)
+
+
+_import_lock = threading.RLock()
+
+
+class LazyModule(types.ModuleType):
+    """Module proxy that imports the real module on first attribute access"""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_lazy_target"] = None
+
+    def _load(self) -> types.ModuleType:
+        module = self.__dict__["_lazy_target"]
+        if module is None:
+            with _import_lock:
+                module = self.__dict__["_lazy_target"]
+                if module is None:
+                    module = importlib.import_module(self.__name__)
+                    self.__dict__["_lazy_target"] = module
+        return module
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    @property
+    def is_imported(self) -> bool:
+        return self.__dict__["_lazy_target"] is not None
+
+
+class LazyAttribute:
+    """Proxy for ``from module import attr`` (functions and classes)"""
+
+    def __init__(self, module_name: str, attr: str):
+        self._module_name = module_name
+        self._attr = attr
+        self._target = None
+
+    def _load(self) -> Any:
+        if self._target is None:
+            with _import_lock:
+                if self._target is None:
+                    self._target = getattr(importlib.import_module(self._module_name), self._attr)
+        return self._target
+
+    def __call__(self, *args, **kwargs):
+        return self._load()(*args, **kwargs)
+
+    def __getattr__(self, attr: str) -> Any:
+        if attr.startswith("_"):
+            raise AttributeError(attr)
+        return getattr(self._load(), attr)
+
+    def __repr__(self) -> str:
+        return f"<lazy {self._module_name}.{self._attr}>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    """``import name`` deferred until first use"""
+    return LazyModule(name)
+
+
+def lazy_from(module_name: str, attr: str) -> LazyAttribute:
+    """``from module_name import attr`` deferred until first use"""
+    return LazyAttribute(module_name, attr)
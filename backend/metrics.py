@@ -0,0 +1,329 @@
+"""
+Latency histograms and Prometheus-style metrics for the RescueLanka services
+backend/metrics.py
+
+A small in-process registry (no external dependency) of histograms, counters
+and gauges. Pipeline stages record their latency with ``METRICS.stage(...)``;
+queue depths and cache hit rates are collected from the existing get_stats()
+methods at scrape time. ``install_metrics(app)`` adds per-endpoint request
+timing and a ``/metrics`` endpoint in the Prometheus text format.
+"""
+
+import os
+import math
+import time
+import threading
+import logging
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from tracing import child_span
+
+logger = logging.getLogger(__name__)
+
+METRICS_ENABLED = os.getenv("RESCUELANKA_METRICS", "1") not in ("0", "false", "no")
+
+# Seconds; dense below 100 ms where most stages live, sparse up to a stalled request
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25,
+                   0.5, 0.75, 1.0, 2.5, 5.0, 10.0, 30.0)
+TOKEN_BUCKETS = (8, 16, 32, 48, 64, 96, 128, 192, 256, 384, 512)
+MEGAPIXEL_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 12.0, 16.0, 24.0, 50.0)
+BYTES_BUCKETS = (16e3, 64e3, 256e3, 512e3, 1e6, 2e6, 4e6, 8e6, 16e6)
+
+# Pipeline stages timed into rescuelanka_stage_seconds{stage=...}
+STAGES = (
+    "upload_read", "image_decode", "preprocessing", "feature_extraction", "classifier_scoring",
+    "damage_heuristics", "text_tokenization", "text_forward", "serialization", "mongo_logging",
+)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _HistogramSeries:
+    def __init__(self, bucket_count: int):
+        self.counts = [0] * (bucket_count + 1)
+        self.sum = 0.0
+        self.count = 0
+
+
+class Histogram:
+    """Cumulative-bucket histogram keyed by label values"""
+
+    metric_type = "histogram"
+
+    def __init__(self, name: str, help_text: str, buckets: Iterable[float]):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(sorted(float(b) for b in buckets))
+        self._series: Dict[LabelKey, _HistogramSeries] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = _label_key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _HistogramSeries(len(self.buckets))
+            series.counts[index] += 1
+            series.sum += value
+            series.count += 1
+
+    def quantile(self, q: float, **labels) -> Optional[float]:
+        """Bucket-interpolated quantile estimate (as histogram_quantile does)"""
+        with self._lock:
+            series = self._series.get(_label_key(labels))
+            if series is None or series.count == 0:
+                return None
+            counts = list(series.counts)
+            total = series.count
+
+        rank = q * total
+        cumulative = 0
+        for index, count in enumerate(counts):
+            if cumulative + count >= rank and count > 0:
+                if index >= len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[index - 1] if index > 0 else 0.0
+                upper = self.buckets[index]
+                return lower + (upper - lower) * ((rank - cumulative) / count)
+            cumulative += count
+        return self.buckets[-1]
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = [(key, list(series.counts), series.sum, series.count)
+                        for key, series in sorted(self._series.items())]
+        for key, counts, total_sum, total_count in snapshot:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_format_labels(key, ('le', _format_value(bound)))} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {_format_value(total_sum)}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {total_count}")
+        return lines
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            keys = [(key, series.count, series.sum) for key, series in self._series.items()]
+        result = {}
+        for key, count, total_sum in keys:
+            labels = dict(key)
+            result[",".join(f"{k}={v}" for k, v in key) or "all"] = {
+                "count": count,
+                "mean": total_sum / count if count else 0.0,
+                "p50": self.quantile(0.50, **labels),
+                "p95": self.quantile(0.95, **labels),
+                "p99": self.quantile(0.99, **labels)
+            }
+        return result
+
+
+class Counter:
+    """Monotonic counter keyed by label values"""
+
+    metric_type = "counter"
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help = help_text
+        self._values: Dict[LabelKey, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            snapshot = sorted(self._values.items())
+        lines.extend(f"{self.name}{_format_labels(key)} {_format_value(value)}" for key, value in snapshot)
+        return lines
+
+
+class MetricsRegistry:
+    """Process-wide collection of metrics plus scrape-time collectors"""
+
+    def __init__(self, enabled: bool = METRICS_ENABLED):
+        self.enabled = enabled
+        self._metrics: Dict[str, Any] = {}
+        self._collectors: Dict[str, Callable[[], Iterable[Tuple[str, str, str, Dict[str, Any], float]]]] = {}
+        self._lock = threading.Lock()
+
+        self.stage_seconds = self.histogram(
+            "rescuelanka_stage_seconds", "Latency of individual pipeline stages", LATENCY_BUCKETS)
+        self.analysis_stage_seconds = self.histogram(
+            "rescuelanka_analysis_stage_seconds", "Latency of complete_analysis stage-graph stages", LATENCY_BUCKETS)
+        self.request_seconds = self.histogram(
+            "rescuelanka_http_request_seconds", "HTTP request latency by endpoint", LATENCY_BUCKETS)
+        self.requests_total = self.counter(
+            "rescuelanka_http_requests_total", "HTTP requests by endpoint and status")
+        self.text_tokens = self.histogram(
+            "rescuelanka_text_tokens", "Token length of classified texts", TOKEN_BUCKETS)
+        self.image_megapixels = self.histogram(
+            "rescuelanka_image_megapixels", "Original size of analysed images", MEGAPIXEL_BUCKETS)
+        self.upload_bytes = self.histogram(
+            "rescuelanka_upload_bytes", "Size of image uploads", BYTES_BUCKETS)
+
+    def histogram(self, name: str, help_text: str, buckets: Iterable[float]) -> Histogram:
+        with self._lock:
+            if name not in self._metrics:
+                self._metrics[name] = Histogram(name, help_text, buckets)
+            return self._metrics[name]
+
+    def counter(self, name: str, help_text: str) -> Counter:
+        with self._lock:
+            if name not in self._metrics:
+                self._metrics[name] = Counter(name, help_text)
+            return self._metrics[name]
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time a pipeline stage into rescuelanka_stage_seconds (and a trace span)"""
+        with child_span(name):
+            if not self.enabled:
+                yield
+                return
+            started_at = time.perf_counter()
+            try:
+                yield
+            finally:
+                self.stage_seconds.observe(time.perf_counter() - started_at, stage=name)
+
+    def observe_stage(self, name: str, seconds: float):
+        if self.enabled:
+            self.stage_seconds.observe(seconds, stage=name)
+
+    def observe_token_lengths(self, attention_mask):
+        """Record per-text token counts from a tokenizer attention mask"""
+        if not self.enabled or attention_mask is None:
+            return
+        try:
+            rows = attention_mask.sum(axis=1) if hasattr(attention_mask, "sum") else [sum(row) for row in attention_mask]
+            for length in rows:
+                self.text_tokens.observe(float(length))
+        except Exception as e:
+            logger.debug(f"Token length metric skipped: {e}")
+
+    def observe_image(self, width: Optional[int], height: Optional[int], size_bytes: Optional[int] = None):
+        if not self.enabled:
+            return
+        if width and height:
+            self.image_megapixels.observe(width * height / 1e6)
+        if size_bytes is not None:
+            self.upload_bytes.observe(float(size_bytes))
+
+    def register_collector(self, name: str, collect: Callable[[], Iterable[Tuple[str, str, str, Dict[str, Any], float]]]):
+        """Add a scrape-time source yielding (metric, type, help, labels, value)"""
+        with self._lock:
+            self._collectors[name] = collect
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)"""
+        lines: List[str] = []
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors.items())
+        for metric in metrics:
+            lines.extend(metric.render())
+
+        collected: Dict[str, Tuple[str, str, List[str]]] = {}
+        for name, collect in collectors:
+            try:
+                for metric_name, metric_type, help_text, labels, value in collect():
+                    entry = collected.setdefault(metric_name, (metric_type, help_text, []))
+                    entry[2].append(f"{metric_name}{_format_labels(_label_key(labels))} {_format_value(float(value))}")
+            except Exception as e:
+                logger.warning(f"⚠️ Metrics collector {name} failed: {e}")
+        for metric_name, (metric_type, help_text, samples) in collected.items():
+            lines.append(f"# HELP {metric_name} {help_text}")
+            lines.append(f"# TYPE {metric_name} {metric_type}")
+            lines.extend(samples)
+
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> Dict[str, Any]:
+        """JSON view of latency quantiles (for /models/info-style endpoints)"""
+        return {
+            "stages": self.stage_seconds.summary(),
+            "analysis_stages": self.analysis_stage_seconds.summary(),
+            "requests": self.request_seconds.summary()
+        }
+
+
+METRICS = MetricsRegistry()
+
+
+def executor_samples(executor, name: str):
+    """Collector rows for an InferenceExecutor's queue depth"""
+    stats = executor.get_stats()
+    yield ("rescuelanka_executor_pending", "gauge", "Calls waiting or running on an inference executor",
+           {"executor": name}, stats["pending"])
+    for model, lane in stats["models"].items():
+        labels = {"executor": name, "model": model}
+        yield ("rescuelanka_executor_queued", "gauge", "Calls waiting for a model lane", labels, lane["queued"])
+        yield ("rescuelanka_executor_running", "gauge", "Calls running in a model lane", labels, lane["running"])
+        yield ("rescuelanka_executor_rejected_total", "counter", "Calls rejected because the queue was full",
+               labels, lane["rejected"])
+
+
+def batcher_samples(batcher, name: str):
+    """Collector rows for a MicroBatcher's queue depth"""
+    stats = batcher.get_stats()
+    yield ("rescuelanka_batcher_queue_depth", "gauge", "Texts waiting for a micro-batch",
+           {"batcher": name}, stats["queue_depth"])
+    yield ("rescuelanka_batcher_avg_batch_size", "gauge", "Average micro-batch size",
+           {"batcher": name}, stats["avg_batch_size"])
+
+
+def cache_samples(cache, name: str):
+    """Collector rows for a cache exposing get_stats() with a hit_rate"""
+    stats = cache.get_stats()
+    yield ("rescuelanka_cache_hit_rate", "gauge", "Cache hit rate since start", {"cache": name}, stats["hit_rate"])
+    yield ("rescuelanka_cache_misses_total", "counter", "Cache misses", {"cache": name}, stats.get("misses", 0))
+
+
+def install_metrics(app, registry: MetricsRegistry = METRICS):
+    """Time every request by route and serve the registry at /metrics"""
+    from fastapi.responses import PlainTextResponse
+
+    @app.middleware("http")
+    async def record_request_metrics(request, call_next):
+        started_at = time.perf_counter()
+        status = 500
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            if registry.enabled:
+                route = request.scope.get("route")
+                endpoint = getattr(route, "path", None) or "unmatched"
+                registry.request_seconds.observe(time.perf_counter() - started_at, endpoint=endpoint)
+                registry.requests_total.inc(endpoint=endpoint, status=status)
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics_endpoint():
+        return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
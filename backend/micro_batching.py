@@ -0,0 +1,145 @@
+"""
+Dynamic micro-batching for RescueLanka model inference
+backend/micro_batching.py
+
+Collects concurrent single-item requests for a short window and runs them
+through the model as one padded batch, then fans the results back out.
+"""
+
+import os
+import queue
+import threading
+import time
+import logging
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BATCH_SIZE = int(os.getenv("RESCUELANKA_BATCH_MAX_SIZE", "32"))
+DEFAULT_MAX_WAIT_MS = float(os.getenv("RESCUELANKA_BATCH_MAX_WAIT_MS", "5"))
+
+
+class MicroBatcher:
+    """Batching scheduler in front of a batch inference function
+
+    ``batch_fn`` receives a list of inputs and must return a list of results
+    in the same order. Callers use ``submit`` and block on the returned value;
+    a single worker thread groups whatever arrives within ``max_wait_ms`` of
+    the first queued item (up to ``max_batch_size``) into one call.
+    """
+
+    def __init__(self, batch_fn: Callable[[List[Any]], List[Any]], name: str = "batcher",
+                 max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+                 max_wait_ms: float = DEFAULT_MAX_WAIT_MS):
+        self.batch_fn = batch_fn
+        self.name = name
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait_s = max(0.0, float(max_wait_ms)) / 1000.0
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._stopped = False
+
+        # Simple counters for diagnostics
+        self.stats = {
+            "requests": 0,
+            "batches": 0,
+            "max_batch_seen": 0
+        }
+
+    def _ensure_worker(self):
+        """Start the worker thread on first use"""
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._stopped = False
+                self._worker = threading.Thread(
+                    target=self._run, name=f"{self.name}-worker", daemon=True
+                )
+                self._worker.start()
+
+    def submit_future(self, item: Any) -> Future:
+        """Queue one item and return a future for its result"""
+        self._ensure_worker()
+        future: Future = Future()
+        self._queue.put((item, future))
+        return future
+
+    def submit(self, item: Any, timeout: Optional[float] = None) -> Any:
+        """Queue one item and wait for its result (re-raises batch errors)"""
+        return self.submit_future(item).result(timeout=timeout)
+
+    def _collect_batch(self, first) -> List:
+        """Gather queued items until the batch is full or the window closes"""
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait_s
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining <= 0:
+                    batch.append(self._queue.get_nowait())
+                else:
+                    batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        return batch
+
+    def _run(self):
+        """Worker loop: collect, run one forward pass, fan results out"""
+        while not self._stopped:
+            first = self._queue.get()
+            if first is None:
+                break
+
+            batch = self._collect_batch(first)
+            # A stop sentinel may have been picked up while collecting
+            stop_requested = any(entry is None for entry in batch)
+            batch = [entry for entry in batch if entry is not None]
+
+            items = [item for item, _ in batch]
+            futures = [future for _, future in batch]
+
+            self.stats["requests"] += len(items)
+            self.stats["batches"] += 1
+            self.stats["max_batch_seen"] = max(self.stats["max_batch_seen"], len(items))
+
+            try:
+                results = self.batch_fn(items)
+                if len(results) != len(items):
+                    raise RuntimeError(
+                        f"{self.name}: batch function returned {len(results)} results for {len(items)} inputs"
+                    )
+                for future, result in zip(futures, results):
+                    future.set_result(result)
+            except Exception as e:
+                logger.error(f"❌ {self.name} batch of {len(items)} failed: {e}")
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+
+            if stop_requested:
+                break
+
+    def stop(self):
+        """Stop the worker thread after pending batches finish"""
+        self._stopped = True
+        if self._worker is not None and self._worker.is_alive():
+            self._queue.put(None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return batching counters"""
+        batches = self.stats["batches"]
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_s * 1000.0,
+            "requests": self.stats["requests"],
+            "batches": batches,
+            "avg_batch_size": float(self.stats["requests"] / batches) if batches else 0.0,
+            "max_batch_seen": self.stats["max_batch_seen"],
+            "queue_depth": self._queue.qsize()
+        }
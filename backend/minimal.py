@@ -10,6 +10,10 @@ from pathlib import Path
 # Add current directory to path for imports
 sys.path.append(str(Path(__file__).parent))
 
+from upload_ingest import read_image_upload, install_upload_limits
+from tracing import install_tracing, new_request_id
+from keyword_engine import KEYWORDS
+
 # VLM Integration imports (will be created)
 try:
     from vlm_integration_service import VLMIntegrationService
@@ -71,6 +75,12 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# Cap upload size while the body is received (CORS, added after, wraps it)
+install_upload_limits(app)
+
+# Trace ID per request, propagated to the VLM service (spans -> traces.jsonl)
+install_tracing(app, "gateway")
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -113,7 +123,7 @@ def analyze(request: dict):
     return {
         "text": text,
         "emergency_analysis": {
-            "is_emergency": "emergency" in text.lower(),
+            "is_emergency": KEYWORDS.scan(text).is_emergency,
             "confidence": 0.85,
             "probabilities": {"emergency": 0.85, "non_emergency": 0.15}
         },
@@ -124,7 +134,7 @@ def analyze(request: dict):
         },
         "requires_immediate_action": True,
         "processing_time_ms": 100,
-        "request_id": "test-123",
+        "request_id": new_request_id(),
         "timestamp": "2024-01-01T00:00:00Z"
     }
 
@@ -161,14 +171,8 @@ async def analyze_uploaded_image(
     if not vlm_service:
         raise HTTPException(status_code=503, detail="VLM service not available")
     
-    # Validate file type
-    if not file.content_type.startswith('image/'):
-        raise HTTPException(status_code=400, detail="File must be an image")
-    
-    # Validate file size (max 10MB)
-    image_data = await file.read()
-    if len(image_data) > 10 * 1024 * 1024:
-        raise HTTPException(status_code=400, detail="Image too large (max 10MB)")
+    # Stream and validate the upload (size, magic bytes, header dimensions)
+    image_data = (await read_image_upload(file)).data
     
     # Analyze with VLM
     try:
@@ -231,7 +235,7 @@ async def analyze_combined(
     text_result = {
         "text": text,
         "emergency_analysis": {
-            "is_emergency": "emergency" in text.lower(),
+            "is_emergency": KEYWORDS.scan(text).is_emergency,
             "confidence": 0.85,
             "probabilities": {"emergency": 0.85, "non_emergency": 0.15}
         },
@@ -242,7 +246,7 @@ async def analyze_combined(
         },
         "requires_immediate_action": True,
         "processing_time_ms": 100,
-        "request_id": "combined-123",
+        "request_id": new_request_id(),
         "timestamp": "2024-01-01T00:00:00Z"
     }
     
@@ -250,18 +254,16 @@ async def analyze_combined(
     image_result = None
     if file and vlm_service:
         try:
-            # Validate and read image
-            if file.content_type.startswith('image/'):
-                image_data = await file.read()
-                if len(image_data) <= 10 * 1024 * 1024:  # 10MB limit
-                    
-                    # Analyze with VLM
-                    image_result = await vlm_service.analyze_image_with_text(
-                        image_data=image_data,
-                        text_description=text,
-                        location=location,
-                        disaster_type=disaster_type
-                    )
+            # Validate and read image (invalid or oversized images are skipped)
+            image_data = (await read_image_upload(file)).data
+            
+            # Analyze with VLM
+            image_result = await vlm_service.analyze_image_with_text(
+                image_data=image_data,
+                text_description=text,
+                location=location,
+                disaster_type=disaster_type
+            )
         except Exception as e:
             print(f"Image analysis failed: {e}")
     
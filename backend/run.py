@@ -1,8 +1,10 @@
 import uvicorn
 from fastapi import FastAPI, HTTPException, File, UploadFile, Form
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
 import base64
+import time
 from typing import Optional
 import sys
 from pathlib import Path
@@ -10,6 +12,13 @@ from pathlib import Path
 # Add current directory to path for imports
 sys.path.append(str(Path(__file__).parent))
 
+from inference_executor import InferenceOverloaded
+from json_response import NumpyJSONResponse
+from upload_ingest import read_image_upload, install_upload_limits
+from metrics import install_metrics
+from tracing import install_tracing, new_request_id
+from keyword_engine import KEYWORDS, URGENCY_FALLBACK_PROBABILITIES
+
 # Complete model integration
 try:
     from complete_model_service import CompleteModelService
@@ -35,20 +44,12 @@ async def lifespan(app: FastAPI):
             print("🧠 Initializing complete model service...")
             model_service = CompleteModelService()
             
-            # Load all models
-            success = model_service.load_all_models()
+            # Load models in parallel in the background; endpoints use the keyword
+            # fallback until each model is ready (see /ready)
+            model_service.start_background_loading()
+            app.state.model_service = model_service
+            print("⏳ Models loading in background - readiness at /ready")
             
-            if success:
-                print("✅ Complete model service loaded successfully")
-                app.state.model_service = model_service
-                
-                # Show loaded models status
-                loaded_models = [k for k, v in model_service.models_loaded.items() if v]
-                print(f"📊 Loaded models: {', '.join(loaded_models)}")
-            else:
-                print("⚠️ Some models failed to load - running with limited functionality")
-                model_service = None
-                
         except Exception as e:
             print(f"⚠️ Model initialization error: {e}")
             model_service = None
@@ -64,6 +65,7 @@ async def lifespan(app: FastAPI):
     # Shutdown
     print("🛑 Shutting down backend...")
     if model_service:
+        model_service.executor.shutdown(wait=False)
         print("✅ Model service cleaned up")
 
 # Create FastAPI app with lifespan
@@ -74,6 +76,15 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# Cap upload size while the body is received (CORS, added after, wraps it)
+install_upload_limits(app)
+
+# Per-endpoint latency and GET /metrics (Prometheus text format)
+install_metrics(app)
+
+# Trace ID per request and a span per stage (spans -> traces.jsonl)
+install_tracing(app, "backend")
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -163,9 +174,19 @@ def models_status():
             "text_urgency_classification": model_service.models_loaded.get("urgency_classifier", False),
             "image_disaster_classification": model_service.models_loaded.get("disaster_classifier", False) and model_service.models_loaded.get("feature_extractor", False),
             "complete_multimodal_analysis": all(model_service.models_loaded.values())
-        }
+        },
+        "inference_executor": model_service.executor.get_stats()
     }
 
+@app.get("/ready")
+def ready():
+    """Readiness probe: 200 once the text models are serving, 503 while loading"""
+    if not model_service:
+        return JSONResponse(status_code=503, content={"ready": False, "error": "Model service not available"})
+    
+    readiness = model_service.get_readiness()
+    return JSONResponse(status_code=200 if readiness["ready"] else 503, content=readiness)
+
 # Text Analysis Endpoints
 @app.post("/analyze/text")
 async def analyze_text_only(request: dict):
@@ -173,18 +194,20 @@ async def analyze_text_only(request: dict):
     if not model_service:
         # Fallback to basic analysis
         text = request.get("text", "")
+        hits = KEYWORDS.scan(text)
+        urgency_probabilities = URGENCY_FALLBACK_PROBABILITIES[hits.urgency_level]
         return {
             "text": text,
             "emergency_analysis": {
-                "is_emergency": "emergency" in text.lower(),
+                "is_emergency": hits.is_emergency,
                 "confidence": 0.6,
                 "probabilities": {"emergency": 0.6, "non_emergency": 0.4},
                 "method": "keyword_fallback"
             },
             "urgency_analysis": {
-                "urgency_level": "MEDIUM",
-                "confidence": 0.5,
-                "probabilities": {"LOW": 0.2, "MEDIUM": 0.5, "HIGH": 0.2, "CRITICAL": 0.1},
+                "urgency_level": hits.urgency_level,
+                "confidence": urgency_probabilities[hits.urgency_level],
+                "probabilities": urgency_probabilities,
                 "method": "keyword_fallback"
             }
         }
@@ -194,14 +217,17 @@ async def analyze_text_only(request: dict):
         raise HTTPException(status_code=400, detail="Text is required")
     
     try:
-        emergency_result = model_service.classify_emergency(text)
-        urgency_result = model_service.classify_urgency(text)
+        emergency_result, urgency_result = await model_service.executor.run(
+            "text", model_service.classify_text, text
+        )
         
-        return {
+        return NumpyJSONResponse({
             "text": text,
             "emergency_analysis": emergency_result,
             "urgency_analysis": urgency_result
-        }
+        })
+    except InferenceOverloaded as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -214,17 +240,16 @@ async def analyze_image_only(
     if not model_service:
         raise HTTPException(status_code=503, detail="Image analysis models not available")
     
-    # Validate file
-    if not file.content_type.startswith('image/'):
-        raise HTTPException(status_code=400, detail="File must be an image")
-    
-    image_data = await file.read()
-    if len(image_data) > 10 * 1024 * 1024:
-        raise HTTPException(status_code=400, detail="Image too large (max 10MB)")
+    # Stream and validate the upload (size, magic bytes, header dimensions)
+    image_data = (await read_image_upload(file)).data
     
     try:
-        result = model_service.classify_disaster_from_image(image_data)
-        return {"disaster_type_prediction": result}
+        result = await model_service.executor.run(
+            "image", model_service.classify_disaster_from_image, image_data
+        )
+        return NumpyJSONResponse({"disaster_type_prediction": result})
+    except InferenceOverloaded as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -243,22 +268,23 @@ async def analyze_complete(
     
     if not model_service:
         # Fallback analysis
+        hits = KEYWORDS.scan(text)
         return {
             "text": text,
             "location": location,
             "emergency_analysis": {
-                "is_emergency": "emergency" in text.lower(),
+                "is_emergency": hits.is_emergency,
                 "confidence": 0.6,
                 "method": "fallback"
             },
             "urgency_analysis": {
-                "urgency_level": "MEDIUM",
+                "urgency_level": hits.urgency_level,
                 "confidence": 0.5,
                 "method": "fallback"
             },
             "combined_assessment": {
-                "is_emergency": "emergency" in text.lower(),
-                "urgency_level": "MEDIUM",
+                "is_emergency": hits.is_emergency,
+                "urgency_level": hits.urgency_level,
                 "disaster_type": disaster_type or "unknown",
                 "priority_score": 5,
                 "requires_immediate_action": False
@@ -267,27 +293,25 @@ async def analyze_complete(
             "note": "Limited analysis - AI models not available"
         }
     
+    # Stream and validate the image if provided
+    image_data = None
+    if file:
+        image_data = (await read_image_upload(file)).data
+    
     try:
-        # Read image data if provided
-        image_data = None
-        if file:
-            if not file.content_type.startswith('image/'):
-                raise HTTPException(status_code=400, detail="File must be an image")
-            
-            image_data = await file.read()
-            if len(image_data) > 10 * 1024 * 1024:
-                raise HTTPException(status_code=400, detail="Image too large (max 10MB)")
-        
         # Perform complete analysis
-        result = model_service.complete_analysis(
+        result = await model_service.executor.run(
+            "complete", model_service.complete_analysis,
             text=text,
             image_data=image_data,
             location=location,
             disaster_type=disaster_type
         )
         
-        return result
+        return NumpyJSONResponse(result)
         
+    except InferenceOverloaded as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -303,17 +327,13 @@ async def vlm_analyze_image(
     if not model_service:
         raise HTTPException(status_code=503, detail="VLM models not available")
     
-    # Validate file
-    if not file.content_type.startswith('image/'):
-        raise HTTPException(status_code=400, detail="File must be an image")
-    
-    image_data = await file.read()
-    if len(image_data) > 10 * 1024 * 1024:
-        raise HTTPException(status_code=400, detail="Image too large (max 10MB)")
+    # Stream and validate the upload (size, magic bytes, header dimensions)
+    image_data = (await read_image_upload(file)).data
     
     try:
         # Use complete analysis but format for VLM compatibility
-        result = model_service.complete_analysis(
+        result = await model_service.executor.run(
+            "complete", model_service.complete_analysis,
             text=text_description,
             image_data=image_data,
             location=location,
@@ -321,15 +341,16 @@ async def vlm_analyze_image(
         )
         
         # Reformat for VLM compatibility
+        hits = KEYWORDS.scan(text_description)
         vlm_result = {
             "disaster_assessment": {
                 "damage_detected": result.get("combined_assessment", {}).get("is_emergency", False),
                 "severity_level": result.get("combined_assessment", {}).get("urgency_level", "MEDIUM"),
                 "priority_score": result.get("combined_assessment", {}).get("priority_score", 5),
                 "requires_immediate_action": result.get("combined_assessment", {}).get("requires_immediate_action", False),
-                "structural_damage": "building" in text_description.lower() or "structure" in text_description.lower(),
-                "casualties_possible": any(word in text_description.lower() for word in ["people", "person", "injured", "trapped"]),
-                "blocked_access": any(word in text_description.lower() for word in ["blocked", "debris", "road"])
+                "structural_damage": hits.has("structural"),
+                "casualties_possible": hits.has("people"),
+                "blocked_access": hits.has("blocked_access", "road")
             },
             "location_info": {
                 "location": location,
@@ -345,8 +366,10 @@ async def vlm_analyze_image(
             "disaster_type_prediction": result.get("disaster_type_prediction", {})
         }
         
-        return vlm_result
+        return NumpyJSONResponse(vlm_result)
         
+    except InferenceOverloaded as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -371,22 +394,23 @@ async def vlm_health():
 def analyze_legacy(request: dict):
     """Legacy analysis endpoint"""
     text = request.get("text", "")
+    start_time = time.perf_counter()
     
     if model_service:
         try:
             # Use new models for analysis
-            emergency_result = model_service.classify_emergency(text)
-            urgency_result = model_service.classify_urgency(text)
+            emergency_result, urgency_result = model_service.classify_text(text)
+            processing_time = (time.perf_counter() - start_time) * 1000
             
-            return {
+            return NumpyJSONResponse({
                 "text": text,
                 "emergency_analysis": emergency_result,
                 "urgency_analysis": urgency_result,
                 "requires_immediate_action": urgency_result.get("urgency_level") in ["HIGH", "CRITICAL"],
-                "processing_time_ms": 50,
-                "request_id": "legacy-request",
+                "processing_time_ms": float(processing_time),
+                "request_id": new_request_id(),
                 "timestamp": "2024-01-01T00:00:00Z"
-            }
+            })
         except Exception as e:
             print(f"Model analysis failed, using fallback: {e}")
     
@@ -394,7 +418,7 @@ def analyze_legacy(request: dict):
     return {
         "text": text,
         "emergency_analysis": {
-            "is_emergency": "emergency" in text.lower(),
+            "is_emergency": KEYWORDS.scan(text).is_emergency,
             "confidence": 0.85,
             "probabilities": {"emergency": 0.85, "non_emergency": 0.15}
         },
@@ -405,7 +429,7 @@ def analyze_legacy(request: dict):
         },
         "requires_immediate_action": True,
         "processing_time_ms": 100,
-        "request_id": "legacy-fallback",
+        "request_id": new_request_id(),
         "timestamp": "2024-01-01T00:00:00Z"
     }
 
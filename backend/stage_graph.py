@@ -0,0 +1,132 @@
+"""
+Declarative stage graph for RescueLanka multi-model analysis
+backend/stage_graph.py
+
+A request is described as a small set of stages with required inputs and
+ordering dependencies. Independent stages run concurrently on an inference
+executor, stages whose required inputs are missing are skipped, and each
+stage's status and latency are recorded for processing_info.
+"""
+
+import time
+import logging
+from concurrent.futures import Future, wait, FIRST_COMPLETED
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Stage:
+    """One step of an analysis graph
+
+    ``fn`` receives the shared context and returns the stage output, which is
+    stored in the context under ``name``. ``requires`` lists context keys
+    (request inputs or stage outputs) that must be present and non-empty for
+    the stage to run; ``after`` lists stages that must finish (or be skipped)
+    first. Stages with a ``lane`` run on the executor's model group of that
+    name; stages without one run inline on the calling thread.
+    """
+    name: str
+    fn: Callable[[Dict[str, Any]], Any]
+    requires: Tuple[str, ...] = ()
+    after: Tuple[str, ...] = ()
+    lane: Optional[str] = None
+    skip_if: Optional[Callable[[Dict[str, Any]], bool]] = None
+
+
+class StageGraph:
+    """Runs stages as soon as their dependencies are resolved"""
+
+    def __init__(self, stages: List[Stage]):
+        self.stages = list(stages)
+        self.stage_names = {stage.name for stage in self.stages}
+        if len(self.stage_names) != len(self.stages):
+            raise ValueError("Duplicate stage names in graph")
+
+        # Dependencies must be declared earlier, which also rules out cycles
+        seen = set()
+        for stage in self.stages:
+            for dependency in self._dependencies(stage):
+                if dependency not in seen:
+                    raise ValueError(f"Stage {stage.name} depends on unknown or later stage {dependency}")
+            seen.add(stage.name)
+
+    def _dependencies(self, stage: Stage) -> List[str]:
+        return [key for key in stage.requires if key in self.stage_names] + list(stage.after)
+
+    @staticmethod
+    def _timed(stage: Stage, context: Dict[str, Any]) -> Tuple[Any, float]:
+        started_at = time.perf_counter()
+        output = stage.fn(context)
+        return output, (time.perf_counter() - started_at) * 1000
+
+    def run(self, context: Dict[str, Any], executor=None,
+            raise_on_error: bool = True) -> Dict[str, Dict[str, Any]]:
+        """Execute the graph over ``context`` (updated in place with stage outputs)
+
+        Returns {stage_name: {"status", "latency_ms", ...}}. When a stage fails
+        the remaining stages still resolve; the first error is re-raised at the
+        end if ``raise_on_error`` is set.
+        """
+        report: Dict[str, Dict[str, Any]] = {}
+        pending = list(self.stages)
+        running: Dict[Future, Stage] = {}
+        errors: List[BaseException] = []
+
+        def finish(stage: Stage, output=None, latency_ms=0.0, error=None):
+            if error is not None:
+                errors.append(error)
+                report[stage.name] = {"status": "failed", "latency_ms": float(latency_ms), "error": str(error)}
+                logger.error(f"Stage {stage.name} failed: {error}")
+            else:
+                context[stage.name] = output
+                report[stage.name] = {"status": "completed", "latency_ms": float(latency_ms)}
+
+        while pending or running:
+            inline_ready = []
+            for stage in list(pending):
+                if any(dependency not in report for dependency in self._dependencies(stage)):
+                    continue
+                pending.remove(stage)
+
+                missing = [key for key in stage.requires if not context.get(key)]
+                if missing:
+                    report[stage.name] = {"status": "skipped", "latency_ms": 0.0,
+                                          "reason": f"missing {', '.join(missing)}"}
+                    continue
+                if stage.skip_if is not None and stage.skip_if(context):
+                    report[stage.name] = {"status": "skipped", "latency_ms": 0.0, "reason": "not needed"}
+                    continue
+
+                if stage.lane is not None and executor is not None:
+                    running[executor.submit(stage.lane, self._timed, stage, context)] = stage
+                else:
+                    inline_ready.append(stage)
+
+            # Cheap stages run on this thread while executor stages are in flight
+            for stage in inline_ready:
+                try:
+                    output, latency_ms = self._timed(stage, context)
+                    finish(stage, output, latency_ms)
+                except Exception as e:
+                    finish(stage, error=e)
+
+            if inline_ready:
+                continue
+            if not running:
+                break
+
+            done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for future in done:
+                stage = running.pop(future)
+                try:
+                    output, latency_ms = future.result()
+                    finish(stage, output, latency_ms)
+                except Exception as e:
+                    finish(stage, error=e)
+
+        if errors and raise_on_error:
+            raise errors[0]
+        return report
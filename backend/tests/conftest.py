@@ -0,0 +1,14 @@
+"""
+Shared pytest setup
+backend/tests/conftest.py
+
+Backend modules import each other as top-level modules (``from metrics import
+METRICS``), so the backend directory goes on sys.path like when the services run.
+"""
+
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
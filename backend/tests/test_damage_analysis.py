@@ -0,0 +1,80 @@
+"""
+Parity tests for the fused damage-indicator kernel
+backend/tests/test_damage_analysis.py
+
+The reference below is the original per-mask implementation (separate
+cv2.inRange masks per colour range, CV_64F Laplacian, PIL-style channel stats).
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+cv2 = pytest.importorskip("cv2")
+
+from damage_analysis import DamageAnalysisEngine
+
+
+def _reference_measurements(rgb):
+    image_cv = cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR)
+    gray = cv2.cvtColor(image_cv, cv2.COLOR_BGR2GRAY)
+    hsv = cv2.cvtColor(image_cv, cv2.COLOR_BGR2HSV)
+    total = float(gray.size)
+
+    def ratio(lower, upper):
+        return np.sum(cv2.inRange(hsv, np.array(lower), np.array(upper)) > 0) / total
+
+    return {
+        "edge_density": np.sum(cv2.Canny(gray, 50, 150) > 0) / total,
+        "fire_ratio": ratio([0, 50, 50], [30, 255, 255]),
+        "smoke_ratio": ratio([0, 0, 0], [180, 50, 80]),
+        "water_ratio": ratio([100, 50, 50], [130, 255, 255]),
+        "laplacian_var": cv2.Laplacian(gray, cv2.CV_64F).var(),
+        "channel_mean": rgb.reshape(-1, 3).mean(axis=0).tolist(),
+        "channel_stddev": rgb.reshape(-1, 3).std(axis=0).tolist()
+    }
+
+
+def _test_image(seed):
+    rng = np.random.default_rng(seed)
+    rgb = rng.integers(0, 256, size=(97, 131, 3), dtype=np.uint8)
+    # Flat patches around the HSV thresholds (S/V 49-51, 79-81; H 29-31, 99-101, 129-131)
+    rgb[:20, :40] = (255, 128, 0)
+    rgb[20:40, :40] = (50, 50, 50)
+    rgb[40:60, :40] = (0, 64, 255)
+    rgb[60:80, :40] = (80, 65, 60)
+    return rgb
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_full_resolution_matches_per_mask_reference(seed):
+    rgb = _test_image(seed)
+    measured = DamageAnalysisEngine(working_max_side=0).measure(rgb)
+    expected = _reference_measurements(rgb)
+
+    for key in ("edge_density", "fire_ratio", "smoke_ratio", "water_ratio"):
+        assert measured[key] == pytest.approx(expected[key], abs=1e-12), key
+    assert measured["laplacian_var"] == pytest.approx(expected["laplacian_var"], rel=1e-6)
+    assert measured["channel_mean"] == pytest.approx(expected["channel_mean"], rel=1e-9)
+    assert measured["channel_stddev"] == pytest.approx(expected["channel_stddev"], rel=1e-6)
+    assert measured["working_size"] == [131, 97]
+
+
+def test_every_hsv_value_lands_in_the_same_masks():
+    # One pixel per (H, S, V) combination around every threshold
+    values = np.array(np.meshgrid(np.arange(0, 180), [0, 49, 50, 51, 255], [0, 49, 50, 51, 79, 80, 81, 255],
+                                  indexing="ij"), dtype=np.uint8).reshape(3, -1).T
+    rgb = cv2.cvtColor(values.reshape(1, -1, 3), cv2.COLOR_HSV2RGB)
+    # Round-tripping through RGB may move a pixel; compare on the HSV the kernel actually sees
+    measured = DamageAnalysisEngine(working_max_side=0).measure(rgb)
+    expected = _reference_measurements(rgb)
+
+    for key in ("fire_ratio", "smoke_ratio", "water_ratio"):
+        assert measured[key] == pytest.approx(expected[key], abs=1e-12), key
+
+
+def test_working_side_bounds_the_longest_side():
+    engine = DamageAnalysisEngine(working_max_side=512)
+
+    assert engine.working_shape(3000, 4000) == (384, 512)
+    assert engine.working_shape(300, 400) == (300, 400)
+    assert DamageAnalysisEngine(working_max_side=0).working_shape(3000, 4000) == (3000, 4000)
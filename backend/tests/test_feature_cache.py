@@ -0,0 +1,82 @@
+"""
+Tests for the content-addressed image feature cache
+backend/tests/test_feature_cache.py
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+Image = pytest.importorskip("PIL.Image")
+
+from feature_cache import FeatureCache, ImageKey
+
+
+def _image(value, size=(32, 32)):
+    pixels = np.full((size[1], size[0], 3), value, dtype=np.uint8)
+    return Image.fromarray(pixels)
+
+
+def test_miss_then_hit_by_content():
+    cache = FeatureCache(max_bytes=1024 * 1024)
+    key = cache.make_key(_image(10))
+
+    assert cache.get(key) is None
+    cache.put(key, np.arange(4), outputs={"label": "flood"})
+
+    entry = cache.get(cache.make_key(_image(10)))
+    assert entry is not None
+    assert entry.features.dtype == np.float32
+    assert entry.features.tolist() == [0.0, 1.0, 2.0, 3.0]
+    assert entry.outputs == {"label": "flood"}
+    assert cache.get(cache.make_key(_image(200))) is None
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_entries_are_isolated_from_callers():
+    cache = FeatureCache(max_bytes=1024 * 1024)
+    key = ImageKey(content="a")
+    features = np.ones(4, dtype=np.float32)
+    outputs = {"scores": [0.9, 0.1]}
+    cache.put(key, features, outputs)
+
+    features[0] = 5.0
+    outputs["scores"].append(0.0)
+    entry = cache.get(key)
+    entry.outputs["scores"][0] = 0.0
+
+    assert not entry.features.flags.writeable
+    assert cache.get(key).features.tolist() == [1.0, 1.0, 1.0, 1.0]
+    assert cache.get(key).outputs == {"scores": [0.9, 0.1]}
+
+
+def test_lru_eviction_by_bytes():
+    entry_bytes = np.zeros(64, dtype=np.float32).nbytes + 512
+    cache = FeatureCache(max_bytes=2 * entry_bytes)
+    for name in ("a", "b"):
+        cache.put(ImageKey(content=name), np.zeros(64))
+    cache.get(ImageKey(content="a"))
+    cache.put(ImageKey(content="c"), np.zeros(64))
+
+    assert cache.get(ImageKey(content="b")) is None
+    assert cache.get(ImageKey(content="a")) is not None
+    assert cache.evictions == 1
+
+
+def test_perceptual_match_for_reencoded_copy():
+    cache = FeatureCache(max_bytes=1024 * 1024, phash_max_distance=0)
+    gradient = np.tile(np.arange(0, 256, 8, dtype=np.uint8), (32, 1))
+    original = Image.fromarray(np.dstack([gradient] * 3))
+    reencoded = Image.fromarray(np.dstack([np.clip(gradient.astype(int) + 1, 0, 255).astype(np.uint8)] * 3))
+    cache.put(cache.make_key(original), np.ones(4))
+
+    assert cache.get(cache.make_key(reencoded)) is not None
+    assert cache.perceptual_hits == 1
+
+
+def test_disabled_cache():
+    cache = FeatureCache(max_bytes=0)
+    key = ImageKey(content="a")
+    cache.put(key, np.ones(4))
+
+    assert cache.get(key) is None
+    assert cache.get_stats()["entries"] == 0
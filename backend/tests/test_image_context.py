@@ -0,0 +1,54 @@
+"""
+Tests for decode-once image handling
+backend/tests/test_image_context.py
+"""
+
+import io
+
+import pytest
+
+pytest.importorskip("numpy")
+Image = pytest.importorskip("PIL.Image")
+
+import image_context
+from image_context import DecodedImage, decode_floor
+
+
+def _jpeg_bytes(width: int, height: int) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), (120, 80, 40)).save(buffer, format="JPEG", quality=85)
+    return buffer.getvalue()
+
+
+def test_large_jpeg_is_reduced_at_decode_time():
+    decoded = DecodedImage.from_bytes(_jpeg_bytes(4000, 3000), min_side=512)
+
+    width, height = decoded.size
+    assert decoded.original_size == (4000, 3000)
+    assert decoded.decode_scale == 4
+    assert (width, height) == (1000, 750)
+    assert min(width, height) >= 512
+
+
+def test_zero_min_side_decodes_full_resolution():
+    decoded = DecodedImage.from_bytes(_jpeg_bytes(1600, 1200), min_side=0)
+
+    assert decoded.size == (1600, 1200)
+    assert decoded.decode_scale == 1
+
+
+def test_png_is_never_reduced():
+    buffer = io.BytesIO()
+    Image.new("RGB", (2048, 1024)).save(buffer, format="PNG")
+
+    assert DecodedImage.from_bytes(buffer.getvalue(), min_side=256).size == (2048, 1024)
+
+
+def test_decode_floor(monkeypatch):
+    monkeypatch.setattr(image_context, "DEFAULT_DECODE_MIN_SIDE", 512)
+    assert decode_floor(224, 224) == 512
+    assert decode_floor(0, 224, 224) == 512
+    assert decode_floor(1024, None) == 1024
+
+    monkeypatch.setattr(image_context, "DEFAULT_DECODE_MIN_SIDE", 0)
+    assert decode_floor(1024, 224) == 0
@@ -0,0 +1,91 @@
+"""
+Tests for the bounded inference executor
+backend/tests/test_inference_executor.py
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from inference_executor import InferenceExecutor, InferenceOverloaded
+
+
+def test_lane_limit_holds_calls_in_the_backlog():
+    executor = InferenceExecutor(max_workers=4, model_concurrency={"image": 1})
+    release = threading.Event()
+    running = []
+    peak = []
+    lock = threading.Lock()
+
+    def call(i):
+        with lock:
+            running.append(i)
+            peak.append(len(running))
+        release.wait(5)
+        with lock:
+            running.remove(i)
+        return i
+
+    try:
+        futures = [executor.submit("image", call, i) for i in range(3)]
+        release.set()
+
+        assert [future.result(timeout=5) for future in futures] == [0, 1, 2]
+        assert max(peak) == 1
+        # Counters settle after the futures resolve
+        executor.shutdown()
+        stats = executor.get_stats()
+        assert stats["pending"] == 0
+        assert stats["models"]["image"]["completed"] == 3
+    finally:
+        release.set()
+        executor.shutdown()
+
+
+def test_saturated_lane_does_not_block_other_lanes():
+    executor = InferenceExecutor(max_workers=2, model_concurrency={"image": 1, "text": 1})
+    release = threading.Event()
+    try:
+        blocked = [executor.submit("image", release.wait, 5) for _ in range(3)]
+
+        assert executor.submit("text", lambda: "text").result(timeout=5) == "text"
+        release.set()
+        assert all(future.result(timeout=5) for future in blocked)
+    finally:
+        release.set()
+        executor.shutdown()
+
+
+def test_rejects_when_pending_limit_reached():
+    executor = InferenceExecutor(max_workers=1, max_pending=1, model_concurrency={"text": 1})
+    release = threading.Event()
+    try:
+        first = executor.submit("text", release.wait, 5)
+        with pytest.raises(InferenceOverloaded):
+            executor.submit("text", lambda: None)
+        assert executor.get_stats()["models"]["text"]["rejected"] == 1
+        release.set()
+        first.result(timeout=5)
+    finally:
+        release.set()
+        executor.shutdown()
+
+
+def test_run_awaits_result_and_propagates_errors():
+    executor = InferenceExecutor(max_workers=2)
+
+    def fail():
+        raise ValueError("bad input")
+
+    async def scenario():
+        assert await executor.run("text", lambda a, b: a + b, 2, b=3) == 5
+        with pytest.raises(ValueError, match="bad input"):
+            await executor.run("text", fail)
+
+    try:
+        asyncio.run(scenario())
+        executor.shutdown()
+        assert executor.get_stats()["models"]["text"]["failed"] == 1
+    finally:
+        executor.shutdown()
@@ -0,0 +1,71 @@
+"""
+Tests for the shared keyword lexicon matcher
+backend/tests/test_keyword_engine.py
+"""
+
+import pytest
+
+from keyword_engine import KEYWORDS, KeywordEngine, NO_HITS
+
+
+@pytest.mark.parametrize("text", [
+    "search teams arrived",
+    "the deadline is tomorrow",
+    "lightning over the lake",
+    "giniwala junction",
+])
+def test_terms_do_not_match_inside_longer_words(text):
+    assert KEYWORDS.scan(text) == NO_HITS
+
+
+def test_whole_words_and_listed_inflections_match():
+    hits = KEYWORDS.scan("Flooding near the coast, people trapped, urgently need help")
+
+    assert hits.has("hazard", "flood", "coastal", "people", "critical", "distress")
+    assert hits.terms == ("flooding", "coast", "people", "trapped", "urgently", "need", "help")
+    assert hits.urgency_level == "CRITICAL"
+
+
+def test_native_script_terms_match_with_suffixes():
+    # "ගංවතුරෙන්" is ගංවතුර (flood) with a case suffix
+    assert KEYWORDS.scan("ගංවතුරෙන් ගෙවල් යට වෙලා").has("hazard", "flood")
+    assert KEYWORDS.scan("உதவி தேவை").has("distress")
+
+
+def test_longest_term_wins_and_keeps_contained_categories():
+    hits = KEYWORDS.scan("Roads impassable, save us")
+
+    assert hits.terms == ("roads", "impassable", "save us")
+    assert hits.has("road") and hits.has("blocked_access") and hits.has("distress")
+
+
+def test_explicit_prefix_terms():
+    engine = KeywordEngine({"distress": ("evacuat*",), "coastal": ("sea",)})
+
+    assert engine.scan("Evacuating the village").has("distress")
+    assert engine.scan("seashore") == NO_HITS
+
+
+# The mock VLM's original keyword lists and the severity each one produced
+BASELINE_SEVERITY = {
+    "CRITICAL": ("collapsed", "fire", "severe", "critical", "trapped", "died", "death"),
+    "HIGH": ("damaged", "flood", "emergency", "injured", "evacuation", "urgent"),
+    "LOW": ("minor", "small", "light", "slight"),
+}
+
+
+@pytest.mark.parametrize("level,word", [
+    (level, word) for level, words in BASELINE_SEVERITY.items() for word in words
+])
+def test_severity_level_keeps_baseline_lists(level, word):
+    assert KEYWORDS.scan(f"Report: {word} near the school").severity_level == level
+
+
+@pytest.mark.parametrize("text", ["please help us", "rescue needed", "landslide near the road", "all quiet"])
+def test_severity_level_is_open_without_baseline_words(text):
+    assert KEYWORDS.scan(text).severity_level is None
+
+
+def test_severity_level_checks_fire_before_other_hazards():
+    assert KEYWORDS.scan("fire after the explosion, help").severity_level == "CRITICAL"
+    assert KEYWORDS.scan("flood and landslide").severity_level == "HIGH"
@@ -0,0 +1,76 @@
+"""
+Tests for the text micro-batcher
+backend/tests/test_micro_batching.py
+"""
+
+import time
+
+import pytest
+
+from micro_batching import MicroBatcher
+
+
+def test_full_batch_flushes_before_the_window_closes():
+    batches = []
+
+    def batch_fn(items):
+        batches.append(list(items))
+        return [item * 2 for item in items]
+
+    batcher = MicroBatcher(batch_fn, max_batch_size=4, max_wait_ms=10_000)
+    try:
+        started_at = time.monotonic()
+        futures = [batcher.submit_future(i) for i in range(4)]
+
+        assert [future.result(timeout=5) for future in futures] == [0, 2, 4, 6]
+        # The 10 s window is still open; the size limit triggered the flush
+        assert time.monotonic() - started_at < 5
+        assert batches == [[0, 1, 2, 3]]
+    finally:
+        batcher.stop()
+
+
+def test_partial_batch_flushes_at_the_deadline():
+    batches = []
+
+    def batch_fn(items):
+        batches.append(list(items))
+        return items
+
+    batcher = MicroBatcher(batch_fn, max_batch_size=32, max_wait_ms=20)
+    try:
+        futures = [batcher.submit_future(i) for i in range(3)]
+
+        assert [future.result(timeout=5) for future in futures] == [0, 1, 2]
+        assert sum(len(batch) for batch in batches) == 3
+        assert all(len(batch) < 32 for batch in batches)
+        assert batcher.get_stats()["requests"] == 3
+    finally:
+        batcher.stop()
+
+
+def test_batch_errors_reach_every_caller():
+    def batch_fn(items):
+        raise ValueError("model failed")
+
+    batcher = MicroBatcher(batch_fn, max_batch_size=8, max_wait_ms=20)
+    try:
+        futures = [batcher.submit_future(i) for i in range(3)]
+
+        for future in futures:
+            with pytest.raises(ValueError, match="model failed"):
+                future.result(timeout=5)
+        # The worker survives a failed batch
+        batcher.batch_fn = lambda items: items
+        assert batcher.submit("ok", timeout=5) == "ok"
+    finally:
+        batcher.stop()
+
+
+def test_result_count_mismatch_is_an_error():
+    batcher = MicroBatcher(lambda items: items[:-1], max_batch_size=1, max_wait_ms=0)
+    try:
+        with pytest.raises(RuntimeError, match="returned 0 results for 1 inputs"):
+            batcher.submit("text", timeout=5)
+    finally:
+        batcher.stop()
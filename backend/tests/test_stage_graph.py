@@ -0,0 +1,88 @@
+"""
+Tests for the complete_analysis stage graph runner
+backend/tests/test_stage_graph.py
+"""
+
+import pytest
+
+from inference_executor import InferenceExecutor
+from stage_graph import Stage, StageGraph
+
+
+def _recording(order, name):
+    def fn(context):
+        order.append(name)
+        return name
+
+    return fn
+
+
+def test_stages_run_after_their_dependencies():
+    order = []
+    graph = StageGraph([
+        Stage("text", _recording(order, "text"), requires=("text_input",), lane="text"),
+        Stage("image", _recording(order, "image"), requires=("image_input",), lane="image"),
+        Stage("combine", lambda context: (context["text"], context["image"]), requires=("text", "image")),
+        Stage("recommend", _recording(order, "recommend"), after=("combine",)),
+    ])
+    executor = InferenceExecutor(max_workers=2)
+    context = {"text_input": "flood", "image_input": b"jpeg"}
+    try:
+        report = graph.run(context, executor=executor)
+    finally:
+        executor.shutdown()
+
+    assert set(order[:2]) == {"text", "image"}
+    assert order[2] == "recommend"
+    assert context["combine"] == ("text", "image")
+    assert all(entry["status"] == "completed" for entry in report.values())
+
+
+def test_missing_inputs_skip_dependent_stages():
+    graph = StageGraph([
+        Stage("image", lambda context: "features", requires=("image_input",)),
+        Stage("damage", lambda context: "damage", requires=("image",)),
+        Stage("summary", lambda context: context.get("image"), after=("damage",)),
+    ])
+    context = {"image_input": None}
+
+    report = graph.run(context)
+
+    assert report["image"]["status"] == "skipped"
+    assert report["damage"] == {"status": "skipped", "latency_ms": 0.0, "reason": "missing image"}
+    assert report["summary"]["status"] == "completed"
+    assert context["summary"] is None
+
+
+def test_failed_stage_is_reported_and_reraised():
+    def fail(context):
+        raise ValueError("model crashed")
+
+    graph = StageGraph([
+        Stage("text", fail, lane="text"),
+        Stage("image", lambda context: "ok", lane="image"),
+        Stage("combine", lambda context: "combined", requires=("text",)),
+    ])
+    executor = InferenceExecutor(max_workers=2)
+    try:
+        with pytest.raises(ValueError, match="model crashed"):
+            graph.run({}, executor=executor)
+
+        report = graph.run({}, executor=executor, raise_on_error=False)
+    finally:
+        executor.shutdown()
+
+    assert report["text"]["status"] == "failed"
+    assert report["text"]["error"] == "model crashed"
+    assert report["image"]["status"] == "completed"
+    assert report["combine"]["status"] == "skipped"
+
+
+def test_dependencies_must_be_declared_earlier():
+    with pytest.raises(ValueError, match="later stage"):
+        StageGraph([
+            Stage("combine", lambda context: None, after=("text",)),
+            Stage("text", lambda context: None),
+        ])
+    with pytest.raises(ValueError, match="Duplicate"):
+        StageGraph([Stage("text", lambda context: None), Stage("text", lambda context: None)])
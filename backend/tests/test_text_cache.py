@@ -0,0 +1,104 @@
+"""
+Tests for the two-tier text classification cache
+backend/tests/test_text_cache.py
+"""
+
+import json
+
+from text_cache import TextResultCache
+
+RESULT = {
+    "is_emergency": True,
+    "confidence": 0.9,
+    "probabilities": {"emergency": 0.9, "non_emergency": 0.1},
+    "raw_results": [{"label": "EMERGENCY", "score": 0.9}, {"label": "NON_EMERGENCY", "score": 0.1}]
+}
+
+
+def _cache(tmp_path, db=True, **kwargs):
+    cache = TextResultCache(tmp_path / "text_results.sqlite3" if db else None, **kwargs)
+    model_dir = tmp_path / "emergency_classifier"
+    if not model_dir.exists():
+        model_dir.mkdir()
+        (model_dir / "config.json").write_text(json.dumps({"num_labels": 2}))
+    cache.register_model("emergency", model_dir)
+    return cache, model_dir
+
+
+def test_miss_then_memory_hit(tmp_path):
+    cache, _ = _cache(tmp_path)
+
+    assert cache.get("emergency", "Flood near Kandy") is None
+    cache.put("emergency", "Flood near Kandy", RESULT)
+
+    # Normalized text shares the key
+    assert cache.get("emergency", "  flood   NEAR kandy ") == RESULT
+    stats = cache.get_stats()
+    assert (stats["misses"], stats["memory_hits"], stats["writes"]) == (1, 1, 1)
+
+
+def test_hits_are_isolated_from_callers(tmp_path):
+    cache, _ = _cache(tmp_path)
+    value = json.loads(json.dumps(RESULT))
+    cache.put("emergency", "fire", value)
+
+    # Mutating the stored object or a returned hit must not reach later hits
+    value["probabilities"]["emergency"] = 0.0
+    hit = cache.get("emergency", "fire")
+    hit["cache_hit"] = True
+    hit["raw_results"].append({"label": "X", "score": 1.0})
+
+    assert cache.get("emergency", "fire") == RESULT
+
+
+def test_disk_tier_survives_a_new_instance(tmp_path):
+    cache, _ = _cache(tmp_path)
+    cache.put("emergency", "landslide", RESULT)
+
+    restarted, _ = _cache(tmp_path)
+    assert restarted.get("emergency", "landslide") == RESULT
+    assert restarted.get_stats()["disk_hits"] == 1
+    # Promoted into memory on the first disk hit
+    assert restarted.get("emergency", "landslide") == RESULT
+    assert restarted.get_stats()["memory_hits"] == 1
+
+
+def test_expired_entries_are_not_served(tmp_path, monkeypatch):
+    cache, _ = _cache(tmp_path, ttl_seconds=60)
+    clock = [1000.0]
+    monkeypatch.setattr("text_cache.time.time", lambda: clock[0])
+    cache.put("emergency", "cyclone", RESULT)
+
+    clock[0] += 59
+    assert cache.get("emergency", "cyclone") == RESULT
+    clock[0] += 2
+    assert cache.get("emergency", "cyclone") is None
+
+
+def test_memory_tier_evicts_least_recently_used(tmp_path):
+    cache, _ = _cache(tmp_path, db=False, max_memory_entries=2)
+    cache.put("emergency", "a", RESULT)
+    cache.put("emergency", "b", RESULT)
+    cache.get("emergency", "a")
+    cache.put("emergency", "c", RESULT)
+
+    assert cache.get("emergency", "b") is None
+    assert cache.get("emergency", "a") == RESULT
+    assert cache.get_stats()["evictions"] == 1
+
+
+def test_new_checkpoint_invalidates_results(tmp_path):
+    cache, model_dir = _cache(tmp_path)
+    cache.put("emergency", "tsunami", RESULT)
+
+    (model_dir / "config.json").write_text(json.dumps({"num_labels": 2, "retrained": True}))
+    cache.register_model("emergency", model_dir)
+
+    assert cache.get("emergency", "tsunami") is None
+
+
+def test_zero_ttl_disables_the_cache(tmp_path):
+    cache, _ = _cache(tmp_path, ttl_seconds=0)
+    cache.put("emergency", "help", RESULT)
+
+    assert cache.get("emergency", "help") is None
@@ -0,0 +1,111 @@
+"""
+Tests for the upload size, format and pixel limits
+backend/tests/test_upload_ingest.py
+"""
+
+import asyncio
+import base64
+import struct
+
+import pytest
+
+pytest.importorskip("fastapi")
+
+from upload_ingest import UploadRejected, decode_base64_image, read_image_upload
+
+
+def _png(width, height, size=64):
+    """PNG signature and IHDR header padded to ``size`` bytes (enough for sniffing)"""
+    header = b"\x89PNG\r\n\x1a\n" + struct.pack(">I", 13) + b"IHDR" + struct.pack(">II", width, height)
+    return header + b"\x00" * (size - len(header))
+
+
+class _Upload:
+    """Minimal stand-in for starlette's UploadFile"""
+
+    def __init__(self, data, content_type="image/png", size=None):
+        self.data = data
+        self.content_type = content_type
+        self.size = size
+        self.reads = 0
+
+    async def read(self, n):
+        chunk, self.data = self.data[:n], self.data[n:]
+        self.reads += 1
+        return chunk
+
+
+def _read(upload, **limits):
+    return asyncio.run(read_image_upload(upload, chunk_size=16, **limits))
+
+
+def _rejected(call):
+    with pytest.raises(UploadRejected) as excinfo:
+        call()
+    return excinfo.value.status_code
+
+
+def test_decode_base64_accepts_image_within_limits():
+    image = decode_base64_image(base64.b64encode(_png(20, 10)).decode(), max_bytes=64, max_pixels=200)
+
+    assert (image.format, image.width, image.height, image.size_bytes) == ("png", 20, 10, 64)
+
+
+def test_decode_base64_byte_limit():
+    encoded = base64.b64encode(_png(20, 10, size=65)).decode()
+
+    assert _rejected(lambda: decode_base64_image(encoded, max_bytes=64)) == 413
+    # Far over the limit is refused from the encoded length, before decoding
+    assert _rejected(lambda: decode_base64_image("A" * 1000, max_bytes=64)) == 413
+
+
+def test_decode_base64_pixel_limit():
+    encoded = base64.b64encode(_png(20, 10)).decode()
+
+    assert _rejected(lambda: decode_base64_image(encoded, max_pixels=199)) == 413
+
+
+@pytest.mark.parametrize("payload,status", [
+    ("", 400),
+    ("not base64!", 400),
+    (base64.b64encode(b"plain text, not an image").decode(), 415),
+])
+def test_decode_base64_rejects_invalid_payloads(payload, status):
+    assert _rejected(lambda: decode_base64_image(payload)) == status
+
+
+def test_streaming_read_accepts_image_within_limits():
+    image = _read(_Upload(_png(20, 10)), max_bytes=64, max_pixels=200)
+
+    assert (image.format, image.width, image.height, image.size_bytes) == ("png", 20, 10, 64)
+
+
+def test_streaming_read_stops_at_byte_limit():
+    upload = _Upload(_png(20, 10, size=1024))
+
+    assert _rejected(lambda: _read(upload, max_bytes=64)) == 413
+    # Rejected after the chunk that crossed the limit, not after reading everything
+    assert upload.reads == 5
+
+
+def test_streaming_read_uses_declared_size():
+    upload = _Upload(_png(20, 10), size=10_000)
+
+    assert _rejected(lambda: _read(upload, max_bytes=64)) == 413
+    assert upload.reads == 0
+
+
+def test_streaming_read_stops_at_pixel_limit():
+    upload = _Upload(_png(20, 10, size=1024))
+
+    assert _rejected(lambda: _read(upload, max_pixels=199)) == 413
+    assert upload.reads == 2
+
+
+@pytest.mark.parametrize("upload,status", [
+    (_Upload(b"GIF-ish but not really an image"), 415),
+    (_Upload(_png(20, 10), content_type="text/plain"), 415),
+    (_Upload(b""), 400),
+])
+def test_streaming_read_rejects_invalid_uploads(upload, status):
+    assert _rejected(lambda: _read(upload)) == status
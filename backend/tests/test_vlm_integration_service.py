@@ -0,0 +1,88 @@
+"""
+Offline tests for the VLM result post-processing
+backend/tests/test_vlm_integration_service.py
+
+These call VLMIntegrationService helpers directly; no VLM service is needed.
+"""
+
+import pytest
+
+pytest.importorskip("aiohttp")
+pytest.importorskip("fastapi")
+
+from vlm_integration_service import VLMIntegrationService
+
+
+@pytest.fixture
+def service():
+    return VLMIntegrationService()
+
+
+def test_recommendations_from_scene_and_objects(service):
+    vlm_result = {
+        "severity_level": "HIGH",
+        "detected_objects": ["damaged_building", "people", "debris"],
+        "scene_description": "Smoke rising over collapsed houses"
+    }
+
+    recommendations = service._generate_recommendations(vlm_result, "")
+
+    assert "Deploy structural engineer for safety assessment" in recommendations
+    assert "Deploy fire suppression teams" in recommendations
+    assert "Conduct immediate headcount and welfare check" in recommendations
+    assert "Deploy heavy equipment for debris removal" in recommendations
+    assert "Deploy water rescue teams" not in recommendations
+
+
+def test_flood_recommendations_from_object_labels(service):
+    vlm_result = {"severity_level": "LOW", "detected_objects": ["flood_water"], "scene_description": ""}
+
+    recommendations = service._generate_recommendations(vlm_result, "")
+
+    assert "Deploy water rescue teams" in recommendations
+    assert "Deploy fire suppression teams" not in recommendations
+
+
+def test_default_recommendations_without_indicators(service):
+    vlm_result = {"severity_level": "LOW", "detected_objects": [], "scene_description": "A quiet street"}
+
+    assert service._generate_recommendations(vlm_result, "") == [
+        "Continue monitoring situation",
+        "Document damage for assessment",
+        "Maintain communication with local authorities"
+    ]
+
+
+def test_enhance_vlm_results(service):
+    vlm_result = {
+        "damage_detected": True,
+        "severity_level": "CRITICAL",
+        "detected_objects": ["collapsed_building", "person"],
+        "scene_description": "Building collapse after earthquake"
+    }
+
+    enhanced = service._enhance_vlm_results(vlm_result, "people trapped", "Kandy")
+
+    assessment = enhanced["disaster_assessment"]
+    assert assessment["priority_score"] == 10
+    assert assessment["requires_immediate_action"] is True
+    assert "IMMEDIATE EVACUATION REQUIRED" in enhanced["recommendations"]
+
+
+def test_road_object_is_not_blocked_access(service):
+    # The mock adds vehicle/road/building for every major city
+    vlm_result = {"severity_level": "LOW", "detected_objects": ["vehicle", "road", "building"], "scene_description": ""}
+
+    enhanced = service._enhance_vlm_results(vlm_result, "", "Colombo")
+
+    assert enhanced["disaster_assessment"]["blocked_access"] is False
+    assert "Deploy heavy equipment for debris removal" not in enhanced["recommendations"]
+
+
+def test_assessment_flags_match_recommendations(service):
+    vlm_result = {"severity_level": "LOW", "detected_objects": ["blocked_passage", "damaged_road"], "scene_description": ""}
+
+    enhanced = service._enhance_vlm_results(vlm_result, "", "")
+
+    assert enhanced["disaster_assessment"]["blocked_access"] is True
+    assert "Deploy heavy equipment for debris removal" in enhanced["recommendations"]
@@ -0,0 +1,37 @@
+"""
+Regression tests for the mock VLM's keyword severity
+backend/tests/test_vlm_mock_service.py
+"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("uvicorn")
+
+from vlm_mock_service import VLMAnalysisRequest, mock_analyze_image
+
+
+def _analyze(text_description, location=""):
+    request = VLMAnalysisRequest(image="", text_description=text_description, location=location)
+    return asyncio.run(mock_analyze_image(request))
+
+
+@pytest.mark.parametrize("text,severity", [
+    ("House fire on the main street", "CRITICAL"),
+    ("Building collapsed, people trapped", "CRITICAL"),
+    ("Severe damage after the storm", "CRITICAL"),
+    ("Flood water rising", "HIGH"),
+    ("Emergency evacuation of the village", "HIGH"),
+    ("Two injured, roof damaged", "HIGH"),
+    ("Minor cracks on a small wall", "LOW"),
+])
+def test_severity_follows_baseline_keywords(text, severity):
+    assert _analyze(text)["severity_level"] == severity
+
+
+@pytest.mark.parametrize("text", ["Please help", "Rescue the family", "Landslide reported", ""])
+def test_severity_stays_open_without_baseline_keywords(text):
+    for _ in range(20):
+        assert _analyze(text)["severity_level"] in ("MEDIUM", "HIGH")
@@ -0,0 +1,349 @@
+"""
+Pluggable inference backends for the RescueLanka text classifiers
+backend/text_backends.py
+
+Exports the emergency/urgency Hugging Face checkpoints to ONNX once, caches the
+graph next to the model directory and serves them through ONNX Runtime on CPU.
+The ONNX classifier returns score rows through the same predict_scores() call
+as the PyTorch DirectTextClassifier, so either one can feed the batchers.
+
+Either backend can optionally serve a dynamically INT8-quantized model, which
+is only accepted when it agrees with the float model on a bundled calibration
+set of disaster reports.
+"""
+
+import os
+import logging
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+from text_cache import checkpoint_fingerprint
+from text_inference import scores_from_logits
+from metrics import METRICS
+
+from lazy_imports import lazy_import, module_available
+
+HAS_TORCH = module_available("torch")
+torch = lazy_import("torch")
+
+HAS_ONNXRUNTIME = module_available("onnxruntime")
+ort = lazy_import("onnxruntime")
+
+logger = logging.getLogger(__name__)
+
+# pytorch | onnx
+DEFAULT_TEXT_BACKEND = os.getenv("RESCUELANKA_TEXT_BACKEND", "pytorch")
+# Intra-op threads per ONNX Runtime session; 0 splits the cores between the text sessions
+DEFAULT_ONNX_THREADS = int(os.getenv("RESCUELANKA_ONNX_THREADS", "0"))
+# Emergency and urgency each get a session, and their batchers run them concurrently
+TEXT_ONNX_SESSIONS = 2
+# Maximum absolute score difference tolerated between PyTorch and ONNX
+DEFAULT_PARITY_TOLERANCE = float(os.getenv("RESCUELANKA_ONNX_PARITY_TOLERANCE", "1e-3"))
+
+ONNX_OPSET = 14
+
+# none | int8 (dynamic INT8 quantization of the Linear layers, either backend)
+DEFAULT_TEXT_QUANTIZATION = os.getenv("RESCUELANKA_TEXT_QUANTIZATION", "none")
+# Minimum top-label agreement with the float model on the calibration set
+DEFAULT_MIN_LABEL_AGREEMENT = float(os.getenv("RESCUELANKA_QUANTIZATION_MIN_AGREEMENT", "0.95"))
+# fallback (serve the float model) | refuse (fail loading the classifier)
+DEFAULT_QUANTIZATION_ON_FAILURE = os.getenv("RESCUELANKA_QUANTIZATION_ON_FAILURE", "fallback")
+
+# Bundled disaster reports used for the ONNX parity check and the INT8 agreement check
+CALIBRATION_TEXTS = [
+    "Building collapsed, people trapped inside, need immediate rescue",
+    "Flood water rising fast in Kelaniya, families stranded on rooftops",
+    "Minor landslide blocked the road near Badulla, no injuries reported",
+    "Fire spreading through the market area, several people injured",
+    "Road cleared, situation under control, thanks to the volunteers",
+    "Critical situation with casualties, ambulance needed urgently",
+    "Earthquake tremors felt in Kandy, cracks in some houses",
+    "Tsunami warning issued for the southern coast, evacuate now",
+    "Cyclone winds tore roofs off houses in Trincomalee, many homeless",
+    "Gas explosion at a factory in Biyagama, workers badly burned",
+    "Heavy rain expected tomorrow, please stay indoors if possible",
+    "Water level in the Kalu Ganga is rising slowly, monitoring the situation",
+    "Elderly woman trapped under debris, she is unconscious and bleeding",
+    "Small fire in the kitchen was put out, nobody hurt",
+    "Landslide buried three houses in Ratnapura, people missing",
+    "Power lines down on Galle Road after the storm",
+    "Need drinking water and food for 200 displaced people at the school",
+    "Child swept away by flood water near the bridge, please send help",
+    "Tree fell on a parked car, no one was inside",
+    "Hospital generator failed during flooding, patients on ventilators at risk",
+    "Villagers report strange sounds from the hillside, cracks appearing in the ground",
+    "The relief camp is running low on medicine for diabetic patients",
+    "Boat capsized off Negombo, fishermen missing at sea",
+    "Bus overturned on the Kandy road, many passengers injured",
+    "Roads flooded in Colombo, traffic moving slowly",
+    "Smoke seen rising from the forest reserve near Ella",
+    "Wall of the school collapsed during the night, classes cancelled",
+    "Family of five stuck on the second floor, water reaching the stairs",
+    "Minor tremor, nothing damaged, just wanted to report it",
+    "Urgent: pregnant woman in labour cut off by the flood, no way to reach hospital",
+    "Community volunteers are distributing dry rations in Matara",
+    "Chemical leak near the harbour, people complaining of breathing problems",
+    "Tornado damaged several houses in Anuradhapura, two people injured",
+    "Drainage blocked and water entering homes in Wellawatte",
+    "Rescue team needed, man fell into a well during the landslide",
+    "Electricity restored in most areas after yesterday's storm",
+    "Fire at the apartment complex, residents trapped on upper floors",
+    "Flash flood washed away the footbridge, village isolated",
+    "Mild flooding in the paddy fields, no houses affected",
+    "Multiple casualties after the building collapse in Pettah, send ambulances",
+]
+
+
+def default_onnx_threads(sessions: int = TEXT_ONNX_SESSIONS) -> int:
+    """Per-session share of the cores, so concurrent sessions do not oversubscribe the CPU"""
+    return max(1, (os.cpu_count() or 1) // max(1, sessions))
+
+
+def onnx_cache_path(model_path: Path) -> Path:
+    """Location of the exported graph for a checkpoint
+
+    Stored in a sibling ``<name>_onnx`` directory and keyed by the checkpoint
+    fingerprint, so a changed checkpoint is re-exported automatically.
+    """
+    model_path = Path(model_path)
+    fingerprint = checkpoint_fingerprint(model_path)
+    return model_path.parent / f"{model_path.name}_onnx" / f"model-{fingerprint}-opset{ONNX_OPSET}.onnx"
+
+
+class QuantizationRejected(RuntimeError):
+    """Raised when a quantized model disagrees with the float model and fallback is disabled"""
+
+
+def _input_names(tokenizer) -> List[str]:
+    """Model inputs the tokenizer produces (input_ids, attention_mask, ...)"""
+    sample = tokenizer(["earthquake"], return_tensors="np")
+    return [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in sample]
+
+
+def _logits_only(model, input_names: List[str]):
+    """Positional-argument wrapper so torch.onnx.export traces only the logits"""
+
+    class _LogitsOnly(torch.nn.Module):
+        def __init__(self):
+            super().__init__()
+            self.model = model
+
+        def forward(self, *inputs):
+            return self.model(**dict(zip(input_names, inputs))).logits
+
+    return _LogitsOnly()
+
+
+def export_to_onnx(model, tokenizer, output_path: Path) -> Path:
+    """Export a sequence classifier to ONNX with dynamic batch/sequence axes"""
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    input_names = _input_names(tokenizer)
+    device = next(model.parameters()).device
+    sample = tokenizer(CALIBRATION_TEXTS[:2], padding=True, truncation=True, return_tensors="pt")
+    sample_inputs = tuple(sample[name].to(device) for name in input_names)
+
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["logits"] = {0: "batch"}
+
+    # Write to a temporary file first so concurrent workers never load a partial graph
+    tmp_path = output_path.with_suffix(f".{os.getpid()}.tmp")
+    with torch.no_grad():
+        torch.onnx.export(
+            _logits_only(model, input_names).eval(),
+            sample_inputs,
+            str(tmp_path),
+            input_names=input_names,
+            output_names=["logits"],
+            dynamic_axes=dynamic_axes,
+            opset_version=ONNX_OPSET,
+            do_constant_folding=True
+        )
+    os.replace(tmp_path, output_path)
+    return output_path
+
+
+class OnnxTextClassifier:
+    """ONNX Runtime session serving one exported text classifier"""
+
+    def __init__(self, onnx_path: Path, tokenizer, config, intra_op_threads: int = DEFAULT_ONNX_THREADS,
+                 quantization: str = "none"):
+        self.onnx_path = Path(onnx_path)
+        self.tokenizer = tokenizer
+        self.config = config
+        self.quantization = quantization
+        self.intra_op_threads = int(intra_op_threads) if intra_op_threads > 0 else default_onnx_threads()
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = self.intra_op_threads
+        options.inter_op_num_threads = 1
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(
+            str(self.onnx_path),
+            sess_options=options,
+            providers=["CPUExecutionProvider"]
+        )
+        self.input_names = [node.name for node in self.session.get_inputs()]
+
+    def tokenize(self, texts: List[str]) -> Dict[str, np.ndarray]:
+        """Tokenize a batch with dynamic padding into int64 numpy arrays"""
+        inputs = self.tokenizer(texts, padding=True, truncation=True, return_tensors="np")
+        return {name: np.asarray(inputs[name], dtype=np.int64) for name in self.input_names}
+
+    def logits_from_inputs(self, inputs: Dict[str, np.ndarray]) -> np.ndarray:
+        """Run already tokenized inputs through the session"""
+        feed = {name: np.asarray(inputs[name], dtype=np.int64) for name in self.input_names}
+        return self.session.run(["logits"], feed)[0]
+
+    def predict_logits(self, texts: List[str]) -> np.ndarray:
+        return self.logits_from_inputs(self.tokenize(texts))
+
+    def predict_scores(self, texts: List[str]) -> np.ndarray:
+        """(len(texts), num_labels) scores in model output order"""
+        with METRICS.stage("text_tokenization"):
+            inputs = self.tokenize(texts)
+        METRICS.observe_token_lengths(inputs.get("attention_mask"))
+        with METRICS.stage("text_forward"):
+            logits = self.logits_from_inputs(inputs)
+        return scores_from_logits(logits, self.config)
+
+
+def _torch_logits(model, tokenizer, texts: List[str]) -> np.ndarray:
+    device = next(model.parameters()).device
+    inputs = tokenizer(texts, padding=True, truncation=True, return_tensors="pt")
+    inputs = {key: value.to(device) for key, value in inputs.items()}
+    with torch.no_grad():
+        return model(**inputs).logits.float().cpu().numpy()
+
+
+def label_agreement(reference_logits: np.ndarray, candidate_logits: np.ndarray) -> float:
+    """Fraction of texts whose top label is the same for both models"""
+    return float(np.mean(reference_logits.argmax(axis=-1) == candidate_logits.argmax(axis=-1)))
+
+
+def accept_quantized(name: str, agreement: float, min_agreement: float = DEFAULT_MIN_LABEL_AGREEMENT,
+                     on_failure: str = DEFAULT_QUANTIZATION_ON_FAILURE) -> bool:
+    """Apply the accuracy guard to a quantized model's calibration agreement"""
+    if agreement >= min_agreement:
+        logger.info(f"✅ {name} INT8 label agreement {agreement:.1%} (threshold {min_agreement:.1%})")
+        return True
+
+    message = f"{name} INT8 label agreement {agreement:.1%} is below {min_agreement:.1%}"
+    if on_failure == "refuse":
+        raise QuantizationRejected(message)
+    logger.warning(f"⚠️ {message} - serving the float32 model")
+    return False
+
+
+def quantize_text_model(model, tokenizer, name: str,
+                        min_agreement: float = DEFAULT_MIN_LABEL_AGREEMENT,
+                        on_failure: str = DEFAULT_QUANTIZATION_ON_FAILURE) -> Tuple[Any, bool]:
+    """Dynamic INT8 quantization of a CPU classifier's Linear layers
+
+    Returns (model_to_serve, quantized). The float model is returned when the
+    calibration agreement is too low and ``on_failure`` is ``fallback``.
+    """
+    float_logits = _torch_logits(model, tokenizer, CALIBRATION_TEXTS)
+
+    quantized = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    quantized.eval()
+    agreement = label_agreement(float_logits, _torch_logits(quantized, tokenizer, CALIBRATION_TEXTS))
+
+    if accept_quantized(name, agreement, min_agreement, on_failure):
+        return quantized, True
+    return model, False
+
+
+def quantize_onnx_int8(source_path: Path, output_path: Path) -> Path:
+    """Dynamically quantize an exported ONNX graph to INT8 weights"""
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+
+    output_path = Path(output_path)
+    tmp_path = output_path.with_suffix(f".{os.getpid()}.tmp")
+    quantize_dynamic(str(source_path), str(tmp_path), weight_type=QuantType.QInt8)
+    os.replace(tmp_path, output_path)
+    return output_path
+
+
+def check_parity(model, tokenizer, onnx_classifier: OnnxTextClassifier,
+                 texts: List[str] = CALIBRATION_TEXTS,
+                 tolerance: float = DEFAULT_PARITY_TOLERANCE) -> Tuple[bool, float]:
+    """Compare PyTorch and ONNX scores on sample reports
+
+    Returns (passed, max_abs_score_difference); predicted labels must agree
+    for every text and scores must be within ``tolerance``.
+    """
+    torch_scores = scores_from_logits(_torch_logits(model, tokenizer, texts), model.config)
+    onnx_scores = scores_from_logits(onnx_classifier.predict_logits(texts), model.config)
+
+    max_diff = float(np.max(np.abs(torch_scores - onnx_scores)))
+    labels_agree = bool(np.all(torch_scores.argmax(axis=-1) == onnx_scores.argmax(axis=-1)))
+    return labels_agree and max_diff <= tolerance, max_diff
+
+
+def build_onnx_classifier(model, tokenizer, model_path: Path, name: str,
+                          intra_op_threads: int = DEFAULT_ONNX_THREADS,
+                          tolerance: float = DEFAULT_PARITY_TOLERANCE,
+                          quantization: str = "none",
+                          min_agreement: float = DEFAULT_MIN_LABEL_AGREEMENT,
+                          on_failure: str = DEFAULT_QUANTIZATION_ON_FAILURE) -> Optional[OnnxTextClassifier]:
+    """Export (or reuse) the ONNX graph for a checkpoint and verify parity
+
+    Returns None when ONNX Runtime is unavailable, export fails or the parity
+    check does not pass; the caller keeps serving the PyTorch model. Otherwise
+    the caller can release the PyTorch model, which the session does not need. With
+    ``quantization="int8"`` the INT8 graph is served when it passes the
+    calibration agreement check, otherwise the float graph is used.
+    """
+    if not (HAS_ONNXRUNTIME and HAS_TORCH):
+        logger.warning(f"⚠️ onnxruntime not installed - {name} stays on PyTorch")
+        return None
+
+    try:
+        onnx_path = onnx_cache_path(model_path)
+        if onnx_path.exists():
+            logger.info(f"📦 Using cached ONNX graph for {name}: {onnx_path}")
+        else:
+            logger.info(f"🔄 Exporting {name} to ONNX: {onnx_path}")
+            export_to_onnx(model, tokenizer, onnx_path)
+
+        if quantization == "int8":
+            int8_path = onnx_path.with_name(f"{onnx_path.stem}-int8.onnx")
+            if not int8_path.exists():
+                logger.info(f"🔄 Quantizing {name} ONNX graph to INT8: {int8_path}")
+                quantize_onnx_int8(onnx_path, int8_path)
+
+            classifier = OnnxTextClassifier(int8_path, tokenizer, model.config, intra_op_threads,
+                                            quantization="int8")
+            agreement = label_agreement(
+                _torch_logits(model, tokenizer, CALIBRATION_TEXTS),
+                classifier.predict_logits(CALIBRATION_TEXTS)
+            )
+            if accept_quantized(name, agreement, min_agreement, on_failure):
+                logger.info(f"✅ {name} served by ONNX Runtime INT8 ({classifier.intra_op_threads} threads)")
+                return classifier
+
+        classifier = OnnxTextClassifier(onnx_path, tokenizer, model.config, intra_op_threads)
+
+        passed, max_diff = check_parity(model, tokenizer, classifier, tolerance=tolerance)
+        if not passed:
+            logger.warning(
+                f"⚠️ ONNX parity check failed for {name} (max score diff {max_diff:.2e}) - staying on PyTorch"
+            )
+            return None
+
+        logger.info(
+            f"✅ {name} served by ONNX Runtime "
+            f"({classifier.intra_op_threads} threads, max score diff {max_diff:.2e})"
+        )
+        return classifier
+
+    except QuantizationRejected:
+        raise
+    except Exception as e:
+        logger.warning(f"⚠️ ONNX backend unavailable for {name}: {e} - staying on PyTorch")
+        return None
@@ -0,0 +1,266 @@
+"""
+Two-tier result cache for RescueLanka text classification
+backend/text_cache.py
+
+Keeps classify_emergency / classify_urgency results keyed by normalized text:
+a bounded in-process LRU in front of an on-disk SQLite store that survives
+restarts and is shared by all workers on the same host. Keys include a
+fingerprint of the model checkpoint, so results from an older checkpoint are
+never served after the model in models/<name>_classifier changes.
+
+Both tiers hold the serialized JSON, so every hit decodes a private copy and
+callers may annotate results without touching the cache.
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+import logging
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TEXT_CACHE_TTL = float(os.getenv("RESCUELANKA_TEXT_CACHE_TTL", str(24 * 3600)))
+DEFAULT_TEXT_CACHE_MEMORY_ENTRIES = int(os.getenv("RESCUELANKA_TEXT_CACHE_MEMORY_ENTRIES", "10000"))
+DEFAULT_TEXT_CACHE_PATH = os.getenv("RESCUELANKA_TEXT_CACHE_PATH", "")
+
+# Checkpoint files whose content/metadata identify a model version
+_CHECKPOINT_FILES = (
+    "config.json",
+    "model.safetensors",
+    "pytorch_model.bin",
+    "tokenizer.json",
+    "tokenizer_config.json",
+    "vocab.txt",
+)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Case-fold and collapse whitespace so trivially different copies share a key"""
+    return _WHITESPACE.sub(" ", text).strip().casefold()
+
+
+def checkpoint_fingerprint(model_path: Path) -> str:
+    """Fingerprint of a Hugging Face checkpoint directory
+
+    config.json is hashed by content; large weight files contribute their
+    size and modification time so the check stays cheap.
+    """
+    model_path = Path(model_path)
+    digest = hashlib.sha256(str(model_path.resolve()).encode())
+    for file_name in _CHECKPOINT_FILES:
+        file_path = model_path / file_name
+        if not file_path.exists():
+            continue
+        stat = file_path.stat()
+        digest.update(f"{file_name}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+        if file_name == "config.json":
+            digest.update(file_path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+class TextResultCache:
+    """In-memory LRU + SQLite result cache with TTL"""
+
+    def __init__(self, db_path: Optional[Path], ttl_seconds: float = DEFAULT_TEXT_CACHE_TTL,
+                 max_memory_entries: int = DEFAULT_TEXT_CACHE_MEMORY_ENTRIES):
+        self.ttl_seconds = float(ttl_seconds)
+        self.max_memory_entries = int(max_memory_entries)
+        self.db_path = Path(db_path) if db_path else None
+
+        # key -> (expires_at, serialized JSON result)
+        self._memory: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.fingerprints: Dict[str, str] = {}
+
+        self.stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "writes": 0,
+            "evictions": 0,
+            "disk_errors": 0
+        }
+
+        self._store_ready = False
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def _init_store(self):
+        """Create the SQLite store on first use"""
+        if self._store_ready or not self.enabled or self.db_path is None:
+            return
+        try:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            connection = self._connection()
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS text_results ("
+                " key TEXT PRIMARY KEY,"
+                " task TEXT NOT NULL,"
+                " fingerprint TEXT NOT NULL,"
+                " value TEXT NOT NULL,"
+                " expires_at REAL NOT NULL)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS text_results_task ON text_results (task, fingerprint)"
+            )
+            connection.commit()
+            self._store_ready = True
+        except Exception as e:
+            logger.warning(f"⚠️ Text result cache disk store unavailable ({self.db_path}): {e}")
+            self.db_path = None
+
+    def _connection(self) -> sqlite3.Connection:
+        """One SQLite connection per thread (WAL mode for concurrent workers)"""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(str(self.db_path), timeout=5.0)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def register_model(self, task: str, model_path: Path, variant: str = ""):
+        """Record the checkpoint fingerprint for a task and drop stale disk entries
+
+        ``variant`` distinguishes serving modes of the same checkpoint (backend,
+        quantization) whose scores may differ slightly.
+        """
+        self._init_store()
+        fingerprint = checkpoint_fingerprint(model_path)
+        if variant:
+            fingerprint = f"{fingerprint}-{variant}"
+        previous = self.fingerprints.get(task)
+        self.fingerprints[task] = fingerprint
+
+        if previous is not None and previous != fingerprint:
+            with self._lock:
+                self._memory.clear()
+
+        if self.enabled and self.db_path is not None:
+            try:
+                connection = self._connection()
+                connection.execute(
+                    "DELETE FROM text_results WHERE (task = ? AND fingerprint != ?) OR expires_at < ?",
+                    (task, fingerprint, time.time())
+                )
+                connection.commit()
+            except Exception as e:
+                self._count("disk_errors")
+                logger.warning(f"⚠️ Could not purge stale text cache entries: {e}")
+
+        logger.info(f"🗃️ Text cache registered {task} checkpoint {fingerprint}")
+
+    def _count(self, name: str):
+        # get/put run on executor threads
+        with self._lock:
+            self.stats[name] += 1
+
+    def _key(self, task: str, text: str) -> Optional[str]:
+        fingerprint = self.fingerprints.get(task)
+        if fingerprint is None:
+            return None
+        raw = f"{task}\x00{fingerprint}\x00{normalize_text(text)}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, task: str, text: str) -> Optional[Dict[str, Any]]:
+        """Cached result for a task/text pair, or None"""
+        if not self.enabled:
+            return None
+        key = self._key(task, text)
+        if key is None:
+            return None
+
+        now = time.time()
+        serialized = None
+        with self._lock:
+            cached = self._memory.get(key)
+            if cached is not None:
+                expires_at, serialized = cached
+                if expires_at >= now:
+                    self._memory.move_to_end(key)
+                    self.stats["memory_hits"] += 1
+                else:
+                    serialized = None
+                    del self._memory[key]
+        if serialized is not None:
+            return json.loads(serialized)
+
+        if self.db_path is not None:
+            try:
+                row = self._connection().execute(
+                    "SELECT value, expires_at FROM text_results WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and row[1] >= now:
+                    self._remember(key, row[1], row[0])
+                    self._count("disk_hits")
+                    return json.loads(row[0])
+            except Exception as e:
+                self._count("disk_errors")
+                logger.warning(f"⚠️ Text cache read failed: {e}")
+
+        self._count("misses")
+        return None
+
+    def put(self, task: str, text: str, value: Dict[str, Any]):
+        """Store a result in both tiers"""
+        if not self.enabled:
+            return
+        key = self._key(task, text)
+        if key is None:
+            return
+
+        expires_at = time.time() + self.ttl_seconds
+        # Serialized once: a snapshot for the memory tier and the row for the disk tier
+        serialized = json.dumps(value)
+        self._remember(key, expires_at, serialized)
+        self._count("writes")
+
+        if self.db_path is not None:
+            try:
+                connection = self._connection()
+                connection.execute(
+                    "INSERT OR REPLACE INTO text_results (key, task, fingerprint, value, expires_at)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (key, task, self.fingerprints[task], serialized, expires_at)
+                )
+                connection.commit()
+            except Exception as e:
+                self._count("disk_errors")
+                logger.warning(f"⚠️ Text cache write failed: {e}")
+
+    def _remember(self, key: str, expires_at: float, serialized: str):
+        with self._lock:
+            self._memory[key] = (expires_at, serialized)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_memory_entries:
+                self._memory.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for both tiers"""
+        with self._lock:
+            stats = dict(self.stats)
+            memory_entries = len(self._memory)
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        hits = stats["memory_hits"] + stats["disk_hits"]
+        return {
+            "enabled": self.enabled,
+            "disk_path": str(self.db_path) if self.db_path else None,
+            "memory_entries": memory_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "fingerprints": dict(self.fingerprints),
+            "hit_rate": float(hits / lookups) if lookups else 0.0,
+            **stats
+        }
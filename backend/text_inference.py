@@ -0,0 +1,389 @@
+"""
+Text inference helpers for the RescueLanka emergency/urgency classifiers
+backend/text_inference.py
+
+Detects when the emergency and urgency checkpoints can share one tokenizer
+(and optionally one encoder) so each report is tokenized and encoded once.
+"""
+
+import os
+import copy
+import hashlib
+import threading
+import logging
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+from lazy_imports import lazy_import, module_available
+from metrics import METRICS
+
+HAS_TORCH = module_available("torch")
+torch = lazy_import("torch")
+
+logger = logging.getLogger(__name__)
+
+# auto | separate | shared_tokenizer | multi_head
+DEFAULT_TEXT_ENCODER_MODE = os.getenv("RESCUELANKA_TEXT_ENCODER_MODE", "auto")
+
+
+def _file_digest(path: Path) -> Optional[str]:
+    """SHA-256 of a file, or None if it does not exist"""
+    if not path.exists():
+        return None
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def tokenizers_compatible(tokenizer_a, tokenizer_b,
+                          path_a: Optional[Path] = None, path_b: Optional[Path] = None) -> bool:
+    """Check whether two tokenizers produce identical input ids"""
+    try:
+        if type(tokenizer_a) is not type(tokenizer_b):
+            return False
+
+        # Fast path: identical tokenizer.json files
+        if path_a is not None and path_b is not None:
+            digest_a = _file_digest(Path(path_a) / "tokenizer.json")
+            digest_b = _file_digest(Path(path_b) / "tokenizer.json")
+            if digest_a is not None and digest_a == digest_b:
+                return True
+
+        if tokenizer_a.get_vocab() != tokenizer_b.get_vocab():
+            return False
+        if tokenizer_a.all_special_tokens != tokenizer_b.all_special_tokens:
+            return False
+        if getattr(tokenizer_a, "do_lower_case", None) != getattr(tokenizer_b, "do_lower_case", None):
+            return False
+        return True
+
+    except Exception as e:
+        logger.warning(f"⚠️ Tokenizer compatibility check failed: {e}")
+        return False
+
+
+def encoder_architectures_match(model_a, model_b) -> bool:
+    """Check whether two sequence classifiers use the same encoder architecture"""
+    config_a, config_b = model_a.config, model_b.config
+    keys = ("model_type", "hidden_size", "num_hidden_layers", "num_attention_heads", "vocab_size")
+    return (
+        model_a.base_model_prefix == model_b.base_model_prefix
+        and all(getattr(config_a, key, None) == getattr(config_b, key, None) for key in keys)
+    )
+
+
+def encoder_weights_identical(model_a, model_b) -> bool:
+    """Check whether two sequence classifiers share bit-identical encoder weights"""
+    if not encoder_architectures_match(model_a, model_b):
+        return False
+
+    state_a = getattr(model_a, model_a.base_model_prefix).state_dict()
+    state_b = getattr(model_b, model_b.base_model_prefix).state_dict()
+    if state_a.keys() != state_b.keys():
+        return False
+    try:
+        return all(torch.equal(state_a[key], state_b[key]) for key in state_a)
+    except (TypeError, RuntimeError):
+        # Quantized encoders hold packed parameters that cannot be compared directly
+        return False
+
+
+def scores_from_logits(logits: np.ndarray, config) -> np.ndarray:
+    """Apply the same output function the text-classification pipeline uses"""
+    logits = np.asarray(logits, dtype=np.float64)
+    if getattr(config, "problem_type", None) == "multi_label_classification" or logits.shape[-1] == 1:
+        return 1.0 / (1.0 + np.exp(-logits))
+    shifted = logits - logits.max(axis=-1, keepdims=True)
+    exp = np.exp(shifted)
+    return exp / exp.sum(axis=-1, keepdims=True)
+
+
+def model_label_names(config) -> List[str]:
+    """Label name for every model output index (LABEL_N where id2label has none)"""
+    num_labels = int(getattr(config, "num_labels", 0) or len(config.id2label))
+    id2label = {int(idx): str(label) for idx, label in dict(config.id2label).items()}
+    return [id2label.get(idx, f"LABEL_{idx}") for idx in range(num_labels)]
+
+
+def _label_number(label: str) -> Optional[int]:
+    """N for 'LABEL_N' or 'N', otherwise None"""
+    label = label.upper()
+    if label.startswith("LABEL_"):
+        label = label[len("LABEL_"):]
+    return int(label) if label.isdigit() else None
+
+
+class LabelMap:
+    """Task label -> model output index, resolved once from config.id2label
+
+    Result dicts are built by indexing score rows, so no label strings are
+    matched per request and the mapping cannot change between calls.
+    """
+
+    def __init__(self, task: str, indices: Dict[str, Optional[int]], model_labels: List[str], strategy: str):
+        self.task = task
+        self.indices = indices
+        self.model_labels = model_labels
+        self.strategy = strategy
+
+    def select(self, scores: np.ndarray) -> Dict[str, Optional[float]]:
+        """Score of each task label in one row (None when the model has no such output)"""
+        return {name: float(scores[idx]) if idx is not None else None for name, idx in self.indices.items()}
+
+    def ranked(self, scores: np.ndarray) -> List[Dict[str, Any]]:
+        """One row as [{'label', 'score'}, ...] by descending score (pipeline top_k=None shape)"""
+        order = np.argsort(-scores, kind="stable")
+        return [{"label": self.model_labels[idx], "score": float(scores[idx])} for idx in order]
+
+    @property
+    def signature(self) -> str:
+        return ",".join(f"{name}={idx}" for name, idx in self.indices.items())
+
+    def describe(self) -> Dict[str, Any]:
+        return {"strategy": self.strategy, "indices": dict(self.indices), "model_labels": list(self.model_labels)}
+
+
+def resolve_emergency_labels(config) -> LabelMap:
+    """Find the emergency / non-emergency outputs by name, LABEL_N number or position"""
+    labels = model_label_names(config)
+    indices: Dict[str, Optional[int]] = {"non_emergency": None, "emergency": None}
+
+    # Negated names first: "NON_EMERGENCY" also contains "EMERGENCY"
+    for idx, label in enumerate(labels):
+        upper = label.upper()
+        if "NON" in upper or "NOT" in upper:
+            indices["non_emergency"] = idx if indices["non_emergency"] is None else indices["non_emergency"]
+        elif "EMERGENCY" in upper:
+            indices["emergency"] = idx if indices["emergency"] is None else indices["emergency"]
+    strategy = "name"
+
+    if len(labels) == 2 and (indices["emergency"] is None) != (indices["non_emergency"] is None):
+        # One named output; the other is whichever index remains
+        named = "emergency" if indices["emergency"] is not None else "non_emergency"
+        other = "non_emergency" if named == "emergency" else "emergency"
+        indices[other] = 1 - indices[named]
+    elif indices["emergency"] is None and indices["non_emergency"] is None:
+        numbers = {_label_number(label): idx for idx, label in enumerate(labels)}
+        if 0 in numbers and 1 in numbers:
+            indices = {"non_emergency": numbers[0], "emergency": numbers[1]}
+            strategy = "label_number"
+        elif len(labels) == 1:
+            # Single sigmoid output: its score is the emergency probability
+            indices = {"non_emergency": None, "emergency": 0}
+            strategy = "single_output"
+        else:
+            indices = {"non_emergency": 0, "emergency": 1 if len(labels) > 1 else None}
+            strategy = "position"
+
+    return LabelMap("emergency", indices, labels, strategy)
+
+
+def resolve_urgency_labels(config, levels: List[str]) -> LabelMap:
+    """Map each output to an urgency level by name, then LABEL_N number, then position"""
+    labels = model_label_names(config)
+    indices: Dict[str, Optional[int]] = {level: None for level in levels}
+    strategies = []
+
+    for idx, label in enumerate(labels):
+        upper = label.upper()
+        level = next((level for level in levels if level in upper), None)
+        strategy = "name"
+        if level is None:
+            number = _label_number(label)
+            if number is not None and number < len(levels):
+                level, strategy = levels[number], "label_number"
+        if level is None and idx < len(levels):
+            level, strategy = levels[idx], "position"
+        if level is not None and indices[level] is None:
+            indices[level] = idx
+            strategies.append(strategy)
+
+    return LabelMap("urgency", indices, labels, "+".join(sorted(set(strategies))) or "none")
+
+
+class DirectTextClassifier:
+    """Run a sequence classifier without the transformers pipeline
+
+    Tokenizes each batch with dynamic padding (longest text in the batch),
+    runs the model under torch.inference_mode() and returns the softmax (or
+    sigmoid) scores for the whole batch as one array.
+    """
+
+    def __init__(self, model, tokenizer, device: str = "cpu"):
+        self.model = model
+        self.tokenizer = tokenizer
+        self.device = device
+        self.config = model.config
+
+    def tokenize(self, texts: List[str]) -> Dict[str, Any]:
+        with METRICS.stage("text_tokenization"):
+            inputs = self.tokenizer(texts, padding="longest", truncation=True, return_tensors="pt")
+        METRICS.observe_token_lengths(inputs.get("attention_mask"))
+        return {key: value.to(self.device) for key, value in inputs.items()}
+
+    def predict_logits(self, texts: List[str]) -> np.ndarray:
+        inputs = self.tokenize(texts)
+        with METRICS.stage("text_forward"), torch.inference_mode():
+            logits = self.model(**inputs).logits
+        return logits.float().cpu().numpy()
+
+    def predict_scores(self, texts: List[str]) -> np.ndarray:
+        """(len(texts), num_labels) scores in model output order"""
+        return scores_from_logits(self.predict_logits(texts), self.config)
+
+
+_precomputed_encoder_class = None
+
+
+def _precomputed_encoder():
+    """Stand-in encoder module (class defined on first use so torch stays lazy)"""
+    global _precomputed_encoder_class
+    if _precomputed_encoder_class is None:
+        class _PrecomputedEncoder(torch.nn.Module):
+            """Stand-in encoder that returns outputs computed by the shared encoder"""
+
+            def __init__(self):
+                super().__init__()
+                self._local = threading.local()
+
+            def set_outputs(self, outputs):
+                self._local.outputs = outputs
+
+            def forward(self, *args, **kwargs):
+                return self._local.outputs
+
+        _precomputed_encoder_class = _PrecomputedEncoder
+    return _precomputed_encoder_class()
+
+
+class SharedTextEncoder:
+    """Tokenize once and run the emergency and urgency classifiers together
+
+    Modes:
+    - ``shared_tokenizer``: one tokenization, both full models run on the same tensors
+    - ``multi_head``: one encoder forward pass, both classification heads on top
+
+    When ``onnx_runners`` (emergency, urgency) are given, the shared tokenization
+    feeds both ONNX Runtime sessions and the PyTorch models may be None.
+    """
+
+    def __init__(self, tokenizer, emergency_model, urgency_model, device: str = "cpu",
+                 mode: str = "shared_tokenizer", onnx_runners: Optional[Tuple[Any, Any]] = None):
+        self.tokenizer = tokenizer
+        self.emergency_model = emergency_model
+        self.urgency_model = urgency_model
+        self.device = device
+        self.onnx_runners = onnx_runners
+        # Exported ONNX graphs contain the whole model, so heads cannot be split off
+        self.mode = "shared_tokenizer" if onnx_runners is not None else mode
+        # ONNX-served models drop their PyTorch modules, so read the configs from the runners
+        emergency_source, urgency_source = onnx_runners or (emergency_model, urgency_model)
+        self.emergency_config = emergency_source.config
+        self.urgency_config = urgency_source.config
+
+        self.encoder = None
+        self._emergency_head = None
+        self._urgency_head = None
+        if self.mode == "multi_head":
+            self._build_heads()
+
+    def _head_only(self, model, stub):
+        """Shallow copy of a classifier whose encoder is replaced by ``stub``"""
+        head = copy.copy(model)
+        head._modules = dict(model._modules)
+        head._modules[model.base_model_prefix] = stub
+        return head
+
+    def _build_heads(self):
+        prefix = self.emergency_model.base_model_prefix
+        self.encoder = getattr(self.emergency_model, prefix)
+        self._stub = _precomputed_encoder()
+        self._emergency_head = self._head_only(self.emergency_model, self._stub)
+        self._urgency_head = self._head_only(self.urgency_model, self._stub)
+
+    def tokenize(self, texts: List[str]) -> Dict[str, Any]:
+        """Tokenize a batch once with dynamic padding"""
+        with METRICS.stage("text_tokenization"):
+            inputs = self.tokenizer(
+                texts,
+                padding=True,
+                truncation=True,
+                return_tensors="pt"
+            )
+        METRICS.observe_token_lengths(inputs.get("attention_mask"))
+        return {key: value.to(self.device) for key, value in inputs.items()}
+
+    def forward_logits(self, texts: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (emergency_logits, urgency_logits) for a batch of texts"""
+        if self.onnx_runners is not None:
+            with METRICS.stage("text_tokenization"):
+                inputs = self.tokenizer(texts, padding=True, truncation=True, return_tensors="np")
+            METRICS.observe_token_lengths(inputs.get("attention_mask"))
+            emergency_runner, urgency_runner = self.onnx_runners
+            with METRICS.stage("text_forward"):
+                return emergency_runner.logits_from_inputs(inputs), urgency_runner.logits_from_inputs(inputs)
+
+        inputs = self.tokenize(texts)
+
+        with METRICS.stage("text_forward"), torch.inference_mode():
+            if self.mode == "multi_head":
+                encoder_outputs = self.encoder(**inputs)
+                self._stub.set_outputs(encoder_outputs)
+                try:
+                    emergency_logits = self._emergency_head(**inputs).logits
+                    urgency_logits = self._urgency_head(**inputs).logits
+                finally:
+                    # Never leave a batch's hidden states pinned in the stub
+                    self._stub.set_outputs(None)
+            else:
+                emergency_logits = self.emergency_model(**inputs).logits
+                urgency_logits = self.urgency_model(**inputs).logits
+
+        return emergency_logits.float().cpu().numpy(), urgency_logits.float().cpu().numpy()
+
+    def forward_batch(self, texts: List[str]) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """Return (emergency_scores, urgency_scores) rows per text, in model output order"""
+        emergency_logits, urgency_logits = self.forward_logits(texts)
+        emergency_scores = scores_from_logits(emergency_logits, self.emergency_config)
+        urgency_scores = scores_from_logits(urgency_logits, self.urgency_config)
+        return list(zip(emergency_scores, urgency_scores))
+
+
+def build_shared_text_encoder(emergency_tokenizer, emergency_model, urgency_tokenizer, urgency_model,
+                              emergency_path: Optional[Path] = None, urgency_path: Optional[Path] = None,
+                              device: str = "cpu",
+                              mode: str = DEFAULT_TEXT_ENCODER_MODE,
+                              onnx_runners: Optional[Tuple[Any, Any]] = None) -> Optional[SharedTextEncoder]:
+    """Build a SharedTextEncoder when the two checkpoints are compatible
+
+    Returns None when sharing is disabled or the models must stay separate.
+    ``auto`` and ``multi_head`` both share the encoder only when its weights are
+    identical in the two checkpoints; fine-tuned encoders that merely share an
+    architecture would feed one model's hidden states to the other's head.
+    ``multi_head`` also warns when it has to fall back. With ``onnx_runners``
+    only the tokenization is shared.
+    """
+    if mode == "separate":
+        logger.info("ℹ️ Shared text encoder disabled - models run separately")
+        return None
+
+    if not tokenizers_compatible(emergency_tokenizer, urgency_tokenizer, emergency_path, urgency_path):
+        logger.info("ℹ️ Emergency and urgency tokenizers differ - models run separately")
+        return None
+
+    resolved_mode = "shared_tokenizer"
+    if mode in ("auto", "multi_head") and onnx_runners is None:
+        if encoder_weights_identical(emergency_model, urgency_model):
+            resolved_mode = "multi_head"
+        elif mode == "multi_head":
+            logger.warning("⚠️ Encoder weights differ between checkpoints - falling back to shared tokenizer only")
+
+    logger.info(f"✅ Shared text encoder enabled (mode: {resolved_mode})")
+    return SharedTextEncoder(
+        emergency_tokenizer, emergency_model, urgency_model,
+        device=device, mode=resolved_mode, onnx_runners=onnx_runners
+    )
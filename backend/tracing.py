@@ -0,0 +1,291 @@
+"""
+Request-scoped tracing for the RescueLanka services
+backend/tracing.py
+
+Each request gets a trace ID (taken from an incoming W3C ``traceparent``
+header or generated) and a tree of spans for the stages it passes through.
+The current span lives in a contextvar, so it follows async tasks and is
+copied onto inference executor threads; outgoing HTTP calls carry it in a
+``traceparent`` header. Finished spans go to a pluggable exporter - by
+default a local JSON-lines file written from a background thread.
+"""
+
+import os
+import json
+import time
+import queue
+import random
+import secrets
+import threading
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# jsonl | none
+DEFAULT_TRACE_EXPORTER = os.getenv("RESCUELANKA_TRACE_EXPORTER", "jsonl")
+DEFAULT_TRACE_PATH = os.getenv("RESCUELANKA_TRACE_PATH", "traces.jsonl")
+# Fraction of new traces that are exported (incoming traceparent flags take precedence)
+DEFAULT_TRACE_SAMPLE_RATE = float(os.getenv("RESCUELANKA_TRACE_SAMPLE_RATE", "1.0"))
+
+TRACEPARENT_HEADER = "traceparent"
+REQUEST_ID_HEADER = "X-Request-ID"
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("rescuelanka_current_span", default=None)
+_service_name = "rescuelanka"
+
+
+class Span:
+    """One timed operation within a trace"""
+
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "service", "sampled",
+                 "start_time", "_started_at", "duration_ms", "status", "attributes")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], sampled: bool,
+                 attributes: Optional[Dict[str, Any]] = None):
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.name = name
+        self.service = _service_name
+        self.sampled = sampled
+        self.start_time = time.time()
+        self._started_at = time.perf_counter()
+        self.duration_ms: Optional[float] = None
+        self.status = "ok"
+        self.attributes: Dict[str, Any] = dict(attributes or {})
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+    def finish(self):
+        self.duration_ms = (time.perf_counter() - self._started_at) * 1000
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "service": self.service,
+            "start_time": self.start_time,
+            "duration_ms": self.duration_ms,
+            "status": self.status,
+            "attributes": self.attributes
+        }
+
+
+class NullExporter:
+    """Drops spans (tracing IDs still propagate)"""
+
+    def export(self, span: Dict[str, Any]):
+        pass
+
+    def shutdown(self):
+        pass
+
+
+class JsonLinesExporter:
+    """Appends one JSON object per finished span, off the request path"""
+
+    def __init__(self, path: Path = Path(DEFAULT_TRACE_PATH), max_queue: int = 10000):
+        self.path = Path(path)
+        self._queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue(maxsize=max_queue)
+        self.dropped = 0
+        self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+        self._thread.start()
+
+    def export(self, span: Dict[str, Any]):
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        while True:
+            span = self._queue.get()
+            if span is None:
+                return
+            batch = [span]
+            # Drain whatever else is waiting so bursts become one write
+            while len(batch) < 512:
+                try:
+                    span = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if span is None:
+                    self._write(batch)
+                    return
+                batch.append(span)
+            self._write(batch)
+
+    def _write(self, batch):
+        try:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write("".join(json.dumps(span, default=str) + "\n" for span in batch))
+        except Exception as e:
+            logger.warning(f"⚠️ Trace export failed: {e}")
+
+    def shutdown(self):
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+
+
+def _default_exporter():
+    if DEFAULT_TRACE_EXPORTER == "jsonl":
+        return JsonLinesExporter()
+    return NullExporter()
+
+
+_exporter = None
+_exporter_lock = threading.Lock()
+
+
+def get_exporter():
+    """The active exporter (created on first use so importing stays side-effect free)"""
+    global _exporter
+    if _exporter is None:
+        with _exporter_lock:
+            if _exporter is None:
+                _exporter = _default_exporter()
+    return _exporter
+
+
+def set_exporter(exporter):
+    """Replace the exporter; anything with export(span_dict) works"""
+    global _exporter
+    with _exporter_lock:
+        _exporter = exporter
+
+
+def parse_traceparent(value: Optional[str]) -> Optional[Tuple[str, str, bool]]:
+    """(trace_id, parent_span_id, sampled) from a W3C traceparent header"""
+    if not value:
+        return None
+    parts = value.strip().split("-")
+    if len(parts) < 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    trace_id, span_id, flags = parts[1].lower(), parts[2].lower(), parts[3]
+    try:
+        int(trace_id, 16), int(span_id, 16)
+        sampled = bool(int(flags[:2], 16) & 0x01)
+    except ValueError:
+        return None
+    if trace_id == "0" * 32 or span_id == "0" * 16:
+        return None
+    return trace_id, span_id, sampled
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def current_trace_id() -> Optional[str]:
+    span = _current_span.get()
+    return span.trace_id if span is not None else None
+
+
+def new_request_id() -> str:
+    """The current trace ID, or a fresh one outside a trace"""
+    return current_trace_id() or secrets.token_hex(16)
+
+
+def inject_headers(headers: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """Add traceparent (and X-Request-ID) for an outgoing call"""
+    headers = dict(headers or {})
+    span = _current_span.get()
+    if span is not None:
+        headers[TRACEPARENT_HEADER] = span.traceparent
+        headers[REQUEST_ID_HEADER] = span.trace_id
+    return headers
+
+
+@contextmanager
+def start_span(name: str, traceparent: Optional[str] = None, **attributes) -> Iterator[Span]:
+    """Open a span under the current one (or a new/remote-parented trace)"""
+    parent = _current_span.get()
+    if parent is not None:
+        span = Span(name, parent.trace_id, parent.span_id, parent.sampled, attributes)
+    else:
+        remote = parse_traceparent(traceparent)
+        if remote is not None:
+            trace_id, parent_id, sampled = remote
+        else:
+            trace_id, parent_id = secrets.token_hex(16), None
+            sampled = random.random() < DEFAULT_TRACE_SAMPLE_RATE
+        span = Span(name, trace_id, parent_id, sampled, attributes)
+
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.status = "error"
+        span.attributes["error"] = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _current_span.reset(token)
+        span.finish()
+        if span.sampled:
+            get_exporter().export(span.to_dict())
+
+
+@contextmanager
+def child_span(name: str, **attributes) -> Iterator[Optional[Span]]:
+    """Span only when a trace is already active (no root spans for background work)"""
+    if _current_span.get() is None:
+        yield None
+        return
+    with start_span(name, **attributes) as span:
+        yield span
+
+
+class TracingMiddleware:
+    """ASGI middleware: one server span per HTTP request, traceparent in and out"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        incoming = None
+        for name, value in scope.get("headers", []):
+            if name == b"traceparent":
+                incoming = value.decode("latin-1")
+                break
+
+        with start_span(f"HTTP {scope.get('method', '')}", traceparent=incoming,
+                        path=scope.get("path", "")) as span:
+
+            async def traced_send(message):
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.status_code", message["status"])
+                    headers = list(message.get("headers", []))
+                    headers.append((b"traceparent", span.traceparent.encode("latin-1")))
+                    headers.append((REQUEST_ID_HEADER.lower().encode("latin-1"), span.trace_id.encode("latin-1")))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            try:
+                await self.app(scope, receive, traced_send)
+            finally:
+                route = scope.get("route")
+                if route is not None and getattr(route, "path", None):
+                    span.name = f"HTTP {scope.get('method', '')} {route.path}"
+
+
+def install_tracing(app, service_name: str):
+    """Name this process's spans and trace every request to ``app``"""
+    global _service_name
+    _service_name = service_name
+    app.add_middleware(TracingMiddleware)
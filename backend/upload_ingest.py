@@ -0,0 +1,303 @@
+"""
+Streaming image upload ingestion for the RescueLanka gateways
+backend/upload_ingest.py
+
+Uploads are read in chunks and rejected as soon as they exceed the byte
+limit, the magic bytes do not match a supported image format or the header
+declares more pixels than allowed - before the whole body is buffered or
+decoded. Accepted uploads are joined once into a single bytes object that
+the decoder can wrap without copying. A small ASGI middleware applies the
+same limit to the raw request body, so oversized multipart requests are cut
+off while they are still being received.
+"""
+
+import os
+import base64
+import binascii
+import struct
+import logging
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse
+
+from metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_UPLOAD_BYTES = int(float(os.getenv("RESCUELANKA_MAX_UPLOAD_MB", "10")) * 1024 * 1024)
+# Decompression-bomb guard, checked against the dimensions in the image header
+DEFAULT_MAX_IMAGE_PIXELS = int(os.getenv("RESCUELANKA_MAX_IMAGE_PIXELS", str(50_000_000)))
+UPLOAD_CHUNK_SIZE = 64 * 1024
+# JPEG dimensions live in the SOF marker, which can follow large EXIF blocks
+HEADER_SNIFF_BYTES = 256 * 1024
+# Room for multipart boundaries and the small form fields sent with an image
+MULTIPART_OVERHEAD_BYTES = 1024 * 1024
+
+
+class UploadRejected(ValueError):
+    """Upload refused before decoding; carries the HTTP status to return"""
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+@dataclass
+class IngestedImage:
+    """Upload bytes plus what was learned from the header"""
+    data: bytes
+    format: str
+    width: Optional[int] = None
+    height: Optional[int] = None
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self.data)
+
+
+def sniff_image_format(header: bytes) -> Optional[str]:
+    """Identify a supported image format from its magic bytes"""
+    if header.startswith(b"\xff\xd8\xff"):
+        return "jpeg"
+    if header.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "png"
+    if header[:6] in (b"GIF87a", b"GIF89a"):
+        return "gif"
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return "webp"
+    if header.startswith(b"BM"):
+        return "bmp"
+    if header[:4] in (b"II*\x00", b"MM\x00*"):
+        return "tiff"
+    return None
+
+
+def _jpeg_dimensions(header: bytes) -> Optional[Tuple[int, int]]:
+    position = 2
+    while position + 4 <= len(header):
+        if header[position] != 0xFF:
+            return None
+        marker = header[position + 1]
+        if marker == 0xFF:
+            # Fill byte before a marker
+            position += 1
+            continue
+        if marker in (0x01, 0xD8) or 0xD0 <= marker <= 0xD7:
+            position += 2
+            continue
+        segment_length = struct.unpack(">H", header[position + 2:position + 4])[0]
+        # SOF0-SOF15 except DHT (C4), JPG (C8) and DAC (CC)
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            if position + 9 > len(header):
+                return None
+            height, width = struct.unpack(">HH", header[position + 5:position + 9])
+            return width, height
+        position += 2 + segment_length
+    return None
+
+
+def sniff_image_dimensions(header: bytes, image_format: str) -> Optional[Tuple[int, int]]:
+    """(width, height) from the image header, or None if not (yet) available"""
+    try:
+        if image_format == "png" and len(header) >= 24:
+            return struct.unpack(">II", header[16:24])
+        if image_format == "gif" and len(header) >= 10:
+            return struct.unpack("<HH", header[6:10])
+        if image_format == "bmp" and len(header) >= 26:
+            width, height = struct.unpack("<ii", header[18:26])
+            return abs(width), abs(height)
+        if image_format == "jpeg":
+            return _jpeg_dimensions(header)
+        if image_format == "webp" and len(header) >= 30:
+            chunk = header[12:16]
+            if chunk == b"VP8 ":
+                width, height = struct.unpack("<HH", header[26:30])
+                return width & 0x3FFF, height & 0x3FFF
+            if chunk == b"VP8L":
+                bits = struct.unpack("<I", header[21:25])[0]
+                return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+            if chunk == b"VP8X":
+                width = int.from_bytes(header[24:27], "little") + 1
+                height = int.from_bytes(header[27:30], "little") + 1
+                return width, height
+    except struct.error:
+        return None
+    return None
+
+
+async def read_image_upload(file, max_bytes: int = DEFAULT_MAX_UPLOAD_BYTES,
+                            max_pixels: int = DEFAULT_MAX_IMAGE_PIXELS,
+                            chunk_size: int = UPLOAD_CHUNK_SIZE) -> IngestedImage:
+    """Read an UploadFile in chunks, validating it as early as possible
+
+    Raises UploadRejected (413 for size, 415 for format) without reading the
+    rest of the upload once a limit is hit.
+    """
+    with METRICS.stage("upload_read"):
+        ingested = await _read_image_upload(file, max_bytes, max_pixels, chunk_size)
+    METRICS.observe_image(None, None, ingested.size_bytes)
+    return ingested
+
+
+async def _read_image_upload(file, max_bytes: int, max_pixels: int, chunk_size: int) -> IngestedImage:
+    max_mb = max_bytes / (1024 * 1024)
+    if file.content_type and not file.content_type.startswith("image/"):
+        raise UploadRejected("File must be an image", status_code=415)
+
+    declared_size = getattr(file, "size", None)
+    if declared_size is not None and declared_size > max_bytes:
+        raise UploadRejected(f"Image too large (max {max_mb:g}MB)", status_code=413)
+
+    chunks = []
+    total = 0
+    header = b""
+    image_format = None
+    dimensions = None
+    sniffing = True
+
+    while True:
+        chunk = await file.read(chunk_size)
+        if not chunk:
+            break
+        total += len(chunk)
+        if total > max_bytes:
+            raise UploadRejected(f"Image too large (max {max_mb:g}MB)", status_code=413)
+        chunks.append(chunk)
+
+        if sniffing:
+            header += chunk
+            if image_format is None and len(header) >= 12:
+                image_format = sniff_image_format(header)
+                if image_format is None:
+                    raise UploadRejected("Unsupported or invalid image format", status_code=415)
+            if image_format is not None:
+                dimensions = sniff_image_dimensions(header, image_format)
+                if dimensions is not None:
+                    width, height = dimensions
+                    if width * height > max_pixels:
+                        raise UploadRejected(
+                            f"Image dimensions too large ({width}x{height})", status_code=413
+                        )
+                if dimensions is not None or len(header) >= HEADER_SNIFF_BYTES:
+                    sniffing = False
+                    header = b""
+
+    if total == 0:
+        raise UploadRejected("Empty image upload", status_code=400)
+    if image_format is None:
+        image_format = sniff_image_format(b"".join(chunks))
+        if image_format is None:
+            raise UploadRejected("Unsupported or invalid image format", status_code=415)
+
+    # One contiguous buffer; io.BytesIO and np.frombuffer wrap bytes without copying
+    data = chunks[0] if len(chunks) == 1 else b"".join(chunks)
+    width, height = dimensions if dimensions is not None else (None, None)
+    return IngestedImage(data=data, format=image_format, width=width, height=height)
+
+
+def decode_base64_image(image_b64: str, max_bytes: int = DEFAULT_MAX_UPLOAD_BYTES,
+                        max_pixels: int = DEFAULT_MAX_IMAGE_PIXELS) -> IngestedImage:
+    """Decode a base64 image from a JSON body under the same limits as read_image_upload
+
+    The encoded length is checked before decoding, so an oversized entry never
+    allocates its decoded bytes.
+    """
+    max_mb = max_bytes / (1024 * 1024)
+    if not image_b64:
+        raise UploadRejected("Image is required", status_code=400)
+    # 4 base64 characters per 3 bytes, plus padding/whitespace slack
+    if len(image_b64) > 4 * ((max_bytes + 2) // 3) + 64:
+        raise UploadRejected(f"Image too large (max {max_mb:g}MB)", status_code=413)
+
+    try:
+        data = base64.b64decode(image_b64)
+    except (binascii.Error, ValueError) as e:
+        raise UploadRejected(f"Invalid base64 image data: {e}", status_code=400)
+    if len(data) > max_bytes:
+        raise UploadRejected(f"Image too large (max {max_mb:g}MB)", status_code=413)
+    if not data:
+        raise UploadRejected("Empty image upload", status_code=400)
+
+    image_format = sniff_image_format(data[:32])
+    if image_format is None:
+        raise UploadRejected("Unsupported or invalid image format", status_code=415)
+    dimensions = sniff_image_dimensions(data[:HEADER_SNIFF_BYTES], image_format)
+    if dimensions is not None and dimensions[0] * dimensions[1] > max_pixels:
+        raise UploadRejected(f"Image dimensions too large ({dimensions[0]}x{dimensions[1]})", status_code=413)
+
+    METRICS.observe_image(None, None, len(data))
+    width, height = dimensions if dimensions is not None else (None, None)
+    return IngestedImage(data=data, format=image_format, width=width, height=height)
+
+
+class _BodyTooLarge(HTTPException):
+    """Raised from receive(); FastAPI passes HTTPExceptions through body parsing"""
+
+    def __init__(self, max_body_bytes: int):
+        super().__init__(status_code=413,
+                         detail=f"Request body too large (max {max_body_bytes / (1024 * 1024):.0f}MB)")
+
+
+class UploadLimitMiddleware:
+    """Reject request bodies above a byte limit while they are being received"""
+
+    def __init__(self, app, max_body_bytes: int):
+        self.app = app
+        self.max_body_bytes = max_body_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        for name, value in scope.get("headers", []):
+            if name == b"content-length":
+                try:
+                    declared = int(value)
+                except ValueError:
+                    declared = 0
+                if declared > self.max_body_bytes:
+                    await self._reject(send)
+                    return
+                break
+
+        received = 0
+        response_started = False
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_bytes:
+                    raise _BodyTooLarge(self.max_body_bytes)
+            return message
+
+        async def tracking_send(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracking_send)
+        except _BodyTooLarge:
+            if response_started:
+                raise
+            await self._reject(send)
+
+    async def _reject(self, send):
+        error = _BodyTooLarge(self.max_body_bytes)
+        response = JSONResponse(status_code=error.status_code, content={"detail": error.detail})
+        await response({"type": "http"}, None, send)
+
+
+def install_upload_limits(app: FastAPI, max_upload_bytes: int = DEFAULT_MAX_UPLOAD_BYTES):
+    """Add the body-size middleware and the UploadRejected error handler to an app"""
+    app.add_middleware(UploadLimitMiddleware, max_body_bytes=max_upload_bytes + MULTIPART_OVERHEAD_BYTES)
+
+    @app.exception_handler(UploadRejected)
+    async def upload_rejected_handler(request: Request, exc: UploadRejected):
+        return JSONResponse(status_code=exc.status_code, content={"detail": str(exc)})
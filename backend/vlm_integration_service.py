@@ -3,6 +3,7 @@ Simple VLM Integration Service for RescueLanka
 Place this file as: backend/vlm_integration_service.py
 """
 
+import os
 import asyncio
 import json
 import base64
@@ -12,13 +13,27 @@ import aiohttp
 from datetime import datetime
 import random
 
+from binary_transport import BINARY_CONTENT_TYPE, encode_metadata_headers
+from tracing import child_span, inject_headers
+from keyword_engine import KEYWORDS
+
+# binary (raw image body, falls back to base64 if the service lacks it) | base64
+DEFAULT_VLM_TRANSPORT = os.getenv("RESCUELANKA_VLM_TRANSPORT", "binary")
+
+def _scan_objects(detected_objects: List[str]):
+    """Keyword hits for VLM object labels, which are snake_case ("damaged_building")"""
+    return KEYWORDS.scan(" ".join(detected_objects).replace("_", " "))
+
 class VLMIntegrationService:
     """Service to integrate VLM capabilities with the main disaster response system"""
     
-    def __init__(self, vlm_service_url: str = "http://localhost:8001"):
+    def __init__(self, vlm_service_url: str = "http://localhost:8001", transport: str = DEFAULT_VLM_TRANSPORT):
         self.vlm_service_url = vlm_service_url
         self.logger = self._setup_logger()
         self.session = None
+        self.transport = transport
+        # Set to False once the service answers that it has no binary endpoint
+        self.binary_supported = None
         
     def _setup_logger(self):
         logging.basicConfig(level=logging.INFO)
@@ -55,39 +70,75 @@ class VLMIntegrationService:
         Analyze image with optional text description for disaster assessment
         """
         try:
-            # Prepare image for VLM service
-            image_b64 = base64.b64encode(image_data).decode('utf-8')
-            
-            payload = {
-                "image": image_b64,
+            metadata = {
                 "text_description": text_description,
                 "location": location,
                 "disaster_type": disaster_type,
                 "analysis_type": "disaster_assessment"
             }
             
+            result = None
+            if self.transport == "binary" and self.binary_supported is not False:
+                result = await self._post_image_binary(image_data, metadata)
+            if result is None:
+                result = await self._post_image_base64(image_data, metadata)
+            
+            # Process and enhance VLM results for disaster response
+            enhanced_result = self._enhance_vlm_results(result, text_description, location)
+            
+            return enhanced_result
+                
+        except asyncio.TimeoutError:
+            raise Exception("VLM analysis timeout")
+        except Exception as e:
+            self.logger.error(f"VLM analysis failed: {str(e)}")
+            raise Exception(f"VLM analysis error: {str(e)}")
+    
+    async def _post_image_binary(self, image_data: bytes, metadata: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """POST the raw image bytes; None if the service has no binary endpoint"""
+        with child_span("vlm_http", transport="binary", request_bytes=len(image_data)) as span:
+            headers = inject_headers({"Content-Type": BINARY_CONTENT_TYPE, **encode_metadata_headers(metadata)})
+            
             async with self.session.post(
-                f"{self.vlm_service_url}/analyze/image",
-                json=payload,
+                f"{self.vlm_service_url}/analyze/image/binary",
+                data=image_data,
+                headers=headers,
                 timeout=aiohttp.ClientTimeout(total=30)
             ) as response:
+                if span is not None:
+                    span.set_attribute("http.status_code", response.status)
+                
+                if response.status in (404, 405):
+                    self.binary_supported = False
+                    self.logger.info("ℹ️ VLM service has no binary endpoint - using base64 JSON")
+                    return None
                 
                 if response.status != 200:
                     error_detail = await response.text()
                     raise Exception(f"VLM analysis failed: {error_detail}")
                 
-                result = await response.json()
-                
-                # Process and enhance VLM results for disaster response
-                enhanced_result = self._enhance_vlm_results(result, text_description, location)
+                self.binary_supported = True
+                return await response.json()
+    
+    async def _post_image_base64(self, image_data: bytes, metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """POST the image base64-encoded in a JSON body (original transport)"""
+        payload = {"image": base64.b64encode(image_data).decode('utf-8'), **metadata}
+        
+        with child_span("vlm_http", transport="base64", request_bytes=len(payload["image"])) as span:
+            async with self.session.post(
+                f"{self.vlm_service_url}/analyze/image",
+                json=payload,
+                headers=inject_headers(),
+                timeout=aiohttp.ClientTimeout(total=30)
+            ) as response:
+                if span is not None:
+                    span.set_attribute("http.status_code", response.status)
                 
-                return enhanced_result
+                if response.status != 200:
+                    error_detail = await response.text()
+                    raise Exception(f"VLM analysis failed: {error_detail}")
                 
-        except asyncio.TimeoutError:
-            raise Exception("VLM analysis timeout")
-        except Exception as e:
-            self.logger.error(f"VLM analysis failed: {str(e)}")
-            raise Exception(f"VLM analysis error: {str(e)}")
+                return await response.json()
     
     def _enhance_vlm_results(self, vlm_result: Dict[str, Any], 
                            text_description: str, location: str) -> Dict[str, Any]:
@@ -99,6 +150,7 @@ class VLMIntegrationService:
         severity_level = vlm_result.get('severity_level', 'UNKNOWN')
         detected_objects = vlm_result.get('detected_objects', [])
         scene_description = vlm_result.get('scene_description', '')
+        object_hits = _scan_objects(detected_objects)
         
         # Calculate priority based on VLM analysis
         priority_score = self._calculate_priority_score(vlm_result)
@@ -114,12 +166,9 @@ class VLMIntegrationService:
                 "severity_level": severity_level,
                 "priority_score": priority_score,
                 "requires_immediate_action": priority_score >= 8,
-                "structural_damage": any('building' in obj.lower() or 'structure' in obj.lower() 
-                                       for obj in detected_objects),
-                "casualties_possible": any('person' in obj.lower() or 'people' in obj.lower() 
-                                         for obj in detected_objects),
-                "blocked_access": any('debris' in obj.lower() or 'blocked' in obj.lower() 
-                                    for obj in detected_objects)
+                "structural_damage": object_hits.has("structural"),
+                "casualties_possible": object_hits.has("people"),
+                "blocked_access": object_hits.has("blocked_access")
             },
             "location_info": {
                 "location": location,
@@ -157,18 +206,19 @@ class VLMIntegrationService:
         
         # Adjust based on detected objects/conditions
         detected_objects = vlm_result.get('detected_objects', [])
-        scene_description = vlm_result.get('scene_description', '').lower()
+        scene_hits = KEYWORDS.scan(vlm_result.get('scene_description', ''))
+        object_hits = _scan_objects(detected_objects)
         
         # Critical indicators
-        if any(keyword in scene_description for keyword in ['collapsed', 'fire', 'flood', 'trapped']):
+        if scene_hits.has("critical", "hazard"):
             score = min(10, score + 2)
         
         # Structural damage indicators
-        if any('building' in obj.lower() or 'structure' in obj.lower() for obj in detected_objects):
+        if object_hits.has("structural"):
             score = min(10, score + 1)
         
         # People presence
-        if any('person' in obj.lower() or 'people' in obj.lower() for obj in detected_objects):
+        if object_hits.has("people"):
             score = min(10, score + 1)
         
         return max(1, min(10, score))
@@ -180,7 +230,8 @@ class VLMIntegrationService:
         
         severity = vlm_result.get('severity_level', '').upper()
         detected_objects = vlm_result.get('detected_objects', [])
-        scene_description = vlm_result.get('scene_description', '').lower()
+        scene_hits = KEYWORDS.scan(vlm_result.get('scene_description', ''))
+        object_hits = _scan_objects(detected_objects)
         
         # Critical severity recommendations
         if severity in ['CRITICAL', 'SEVERE']:
@@ -189,29 +240,29 @@ class VLMIntegrationService:
             recommendations.append("Establish safety perimeter")
         
         # Structural damage
-        if any('building' in obj.lower() or 'structure' in obj.lower() for obj in detected_objects):
+        if object_hits.has("structural"):
             recommendations.append("Deploy structural engineer for safety assessment")
             recommendations.append("Evacuate nearby buildings as precaution")
         
         # Fire detection
-        if 'fire' in scene_description or any('fire' in obj.lower() for obj in detected_objects):
+        if scene_hits.has("fire") or object_hits.has("fire"):
             recommendations.append("Deploy fire suppression teams")
             recommendations.append("Establish water supply for firefighting")
             recommendations.append("Evacuate downwind areas")
         
         # Flood detection
-        if 'flood' in scene_description or any('water' in obj.lower() for obj in detected_objects):
+        if scene_hits.has("flood") or object_hits.has("flood"):
             recommendations.append("Monitor water levels continuously")
             recommendations.append("Prepare evacuation routes to higher ground")
             recommendations.append("Deploy water rescue teams")
         
         # People presence
-        if any('person' in obj.lower() or 'people' in obj.lower() for obj in detected_objects):
+        if object_hits.has("people"):
             recommendations.append("Conduct immediate headcount and welfare check")
             recommendations.append("Provide medical assessment")
         
         # Debris/blocked access
-        if any('debris' in obj.lower() or 'blocked' in obj.lower() for obj in detected_objects):
+        if object_hits.has("blocked_access"):
             recommendations.append("Deploy heavy equipment for debris removal")
             recommendations.append("Establish alternative access routes")
         
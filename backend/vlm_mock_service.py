@@ -4,19 +4,26 @@ Place this file as: backend/vlm_mock_service.py
 Run this service on port 8001 before starting your main API
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from pydantic import BaseModel
 import base64
 import random
 import uvicorn
 from typing import Dict, Any
 
+from binary_transport import read_binary_image_request, BinaryPayloadError
+from tracing import install_tracing
+from keyword_engine import KEYWORDS
+
 # Create mock VLM app
 mock_vlm_app = FastAPI(
     title="Mock VLM Service for RescueLanka", 
     description="Simulated Vision-Language Model for disaster response testing"
 )
 
+# Continues the caller's trace so mock hops show up in traces.jsonl too
+install_tracing(mock_vlm_app, "vlm-mock-service")
+
 class VLMAnalysisRequest(BaseModel):
     image: str  # base64 encoded
     text_description: str = ""
@@ -31,7 +38,8 @@ def root():
         "status": "running",
         "endpoints": {
             "health": "/health",
-            "analyze": "/analyze/image"
+            "analyze": "/analyze/image",
+            "analyze_binary": "/analyze/image/binary"
         }
     }
 
@@ -49,20 +57,22 @@ async def mock_analyze_image(request: VLMAnalysisRequest):
     """Mock VLM analysis with realistic Sri Lankan disaster assessment results"""
     
     # Simulate analysis based on text description and disaster type
-    text_lower = request.text_description.lower()
+    text_hits = KEYWORDS.scan(request.text_description)
+    location_hits = KEYWORDS.scan(request.location)
     disaster_lower = request.disaster_type.lower()
     location_lower = request.location.lower()
     
     # Determine severity based on keywords
-    if any(word in text_lower for word in ['collapsed', 'fire', 'severe', 'critical', 'trapped', 'died', 'death']):
+    keyword_severity = text_hits.severity_level
+    if keyword_severity == 'CRITICAL':
         severity = 'CRITICAL'
         damage_detected = True
         confidence = 0.85 + random.random() * 0.1
-    elif any(word in text_lower for word in ['damaged', 'flood', 'emergency', 'injured', 'evacuation', 'urgent']):
+    elif keyword_severity == 'HIGH':
         severity = 'HIGH'
         damage_detected = True
         confidence = 0.75 + random.random() * 0.15
-    elif any(word in text_lower for word in ['minor', 'small', 'light', 'slight']):
+    elif keyword_severity == 'LOW':
         severity = 'LOW'
         damage_detected = random.choice([True, False])
         confidence = 0.65 + random.random() * 0.2
@@ -86,17 +96,17 @@ async def mock_analyze_image(request: VLMAnalysisRequest):
     detected_objects = objects_map.get(disaster_lower, ['building', 'debris', 'damage'])
     
     # Add people if mentioned
-    if any(word in text_lower for word in ['person', 'people', 'trapped', 'injured', 'casualties', 'victims']):
+    if text_hits.has("people"):
         detected_objects.extend(['person', 'people'])
     
     # Add Sri Lankan specific objects based on location
-    if any(location in location_lower for location in ['colombo', 'galle', 'kandy', 'jaffna', 'batticaloa']):
+    if location_hits.has("major_city"):
         detected_objects.extend(['vehicle', 'road', 'building'])
     
-    if any(location in location_lower for location in ['coast', 'beach', 'sea', 'ocean']):
+    if location_hits.has("coastal"):
         detected_objects.extend(['water', 'sand', 'boat'])
     
-    if any(location in location_lower for location in ['mountain', 'hill', 'upcountry']):
+    if location_hits.has("hill_country"):
         detected_objects.extend(['trees', 'vegetation', 'slope'])
     
     # Generate mock coordinates for Sri Lankan locations
@@ -178,39 +188,55 @@ async def mock_analyze_image(request: VLMAnalysisRequest):
     
     return mock_result
 
+@mock_vlm_app.post("/analyze/image/binary")
+async def mock_analyze_image_binary(request: Request):
+    """Binary variant of /analyze/image: raw image body, metadata in X-RescueLanka-* headers"""
+    try:
+        _, metadata = await read_binary_image_request(request)
+    except BinaryPayloadError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    
+    return await mock_analyze_image(VLMAnalysisRequest(
+        image="",
+        text_description=metadata.get("text_description", ""),
+        location=metadata.get("location", ""),
+        disaster_type=metadata.get("disaster_type", ""),
+        analysis_type=metadata.get("analysis_type", "disaster_assessment")
+    ))
+
+# Sri Lankan disaster scenarios (also used by benchmarks/load_generator.py)
+TEST_SCENARIOS = {
+    "flood_colombo": {
+        "text_description": "Severe flooding in Colombo streets, vehicles submerged",
+        "location": "Colombo, Western Province",
+        "disaster_type": "flood"
+    },
+    "landslide_kandy": {
+        "text_description": "Major landslide blocking Kandy-Nuwara Eliya road",
+        "location": "Kandy, Central Province", 
+        "disaster_type": "landslide"
+    },
+    "cyclone_galle": {
+        "text_description": "Cyclone damage to coastal buildings in Galle",
+        "location": "Galle, Southern Province",
+        "disaster_type": "cyclone"
+    },
+    "building_collapse": {
+        "text_description": "Building collapsed in earthquake, people trapped",
+        "location": "Colombo Central",
+        "disaster_type": "earthquake"
+    }
+}
+
 # Additional endpoint for testing different scenarios
 @mock_vlm_app.post("/analyze/scenario")
 async def analyze_scenario(scenario: str):
     """Test different disaster scenarios quickly"""
-    
-    scenarios = {
-        "flood_colombo": {
-            "text_description": "Severe flooding in Colombo streets, vehicles submerged",
-            "location": "Colombo, Western Province",
-            "disaster_type": "flood"
-        },
-        "landslide_kandy": {
-            "text_description": "Major landslide blocking Kandy-Nuwara Eliya road",
-            "location": "Kandy, Central Province", 
-            "disaster_type": "landslide"
-        },
-        "cyclone_galle": {
-            "text_description": "Cyclone damage to coastal buildings in Galle",
-            "location": "Galle, Southern Province",
-            "disaster_type": "cyclone"
-        },
-        "building_collapse": {
-            "text_description": "Building collapsed in earthquake, people trapped",
-            "location": "Colombo Central",
-            "disaster_type": "earthquake"
-        }
-    }
-    
-    if scenario not in scenarios:
-        raise HTTPException(status_code=400, detail=f"Unknown scenario. Available: {list(scenarios.keys())}")
+    if scenario not in TEST_SCENARIOS:
+        raise HTTPException(status_code=400, detail=f"Unknown scenario. Available: {list(TEST_SCENARIOS.keys())}")
     
     # Use the scenario data to create analysis request
-    scenario_data = scenarios[scenario]
+    scenario_data = TEST_SCENARIOS[scenario]
     request = VLMAnalysisRequest(
         image="mock_image_data",
         **scenario_data
@@ -222,12 +248,7 @@ async def analyze_scenario(scenario: str):
 async def list_test_scenarios():
     """List available test scenarios"""
     return {
-        "available_scenarios": [
-            "flood_colombo",
-            "landslide_kandy", 
-            "cyclone_galle",
-            "building_collapse"
-        ],
+        "available_scenarios": list(TEST_SCENARIOS.keys()),
         "usage": "POST /analyze/scenario with scenario name",
         "example": {
             "scenario": "flood_colombo"
@@ -8,40 +8,42 @@ This version can handle different model formats and provides detailed diagnostic
 import os
 import sys
 import pickle
-import joblib
 import numpy as np
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple, Union
 import logging
 import base64
 import io
 from datetime import datetime
 
 # FastAPI imports
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from pydantic import BaseModel
 import uvicorn
 
-# ML/Image processing imports
-try:
-    import tensorflow as tf
-    from tensorflow.keras.models import load_model
-    from tensorflow.keras.preprocessing import image
-    from tensorflow.keras.applications.vgg16 import preprocess_input
-    from PIL import Image
-    import cv2
-    HAS_ML_LIBRARIES = True
-except ImportError as e:
-    print(f"⚠️ Missing ML libraries: {e}")
-    HAS_ML_LIBRARIES = False
+# ML/Image processing imports (availability is probed here, modules load with the models)
+from lazy_imports import lazy_import, lazy_from, modules_available, module_available
 
-try:
-    from sklearn.ensemble import RandomForestClassifier
-    from sklearn.svm import SVC
-    from sklearn.linear_model import LogisticRegression
-    HAS_SKLEARN = True
-except ImportError:
-    HAS_SKLEARN = False
+HAS_ML_LIBRARIES = modules_available("tensorflow", "PIL", "cv2")
+if not HAS_ML_LIBRARIES:
+    print("⚠️ Missing ML libraries: tensorflow/Pillow/cv2 not installed")
+tf = lazy_import("tensorflow")
+load_model = lazy_from("tensorflow.keras.models", "load_model")
+image = lazy_import("tensorflow.keras.preprocessing.image")
+preprocess_input = lazy_from("tensorflow.keras.applications.vgg16", "preprocess_input")
+
+HAS_SKLEARN = module_available("sklearn")
+joblib = lazy_import("joblib")
+
+from image_context import DecodedImage, decode_floor
+from feature_cache import FeatureCache
+from feature_runtime import load_feature_runtime
+from inference_executor import InferenceExecutor, InferenceOverloaded
+from binary_transport import read_binary_image_request, BinaryPayloadError
+from upload_ingest import decode_base64_image, UploadRejected
+from metrics import METRICS, install_metrics, executor_samples, cache_samples
+from tracing import install_tracing
+from keyword_engine import KEYWORDS
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -149,6 +151,9 @@ class VLMRobustService:
         self.class_labels = None
         self.is_loaded = False
         
+        # Content-addressed cache of feature vectors / classifier output
+        self.feature_cache = FeatureCache()
+        
         # Sri Lankan disaster types mapping
         self.disaster_types = [
             'earthquake', 'flood', 'fire', 'landslide', 'cyclone', 
@@ -223,8 +228,8 @@ class VLMRobustService:
                 if extractor_path.exists():
                     try:
                         logger.info(f"🎯 Found extractor candidate: {candidate}")
-                        self.feature_extractor = load_model(extractor_path)
-                        logger.info(f"✅ Successfully loaded feature extractor")
+                        self.feature_extractor = load_feature_runtime(extractor_path)
+                        logger.info(f"✅ Successfully loaded feature extractor (runtime: {self.feature_extractor.runtime})")
                         logger.info(f"   Input shape: {self.feature_extractor.input_shape}")
                         logger.info(f"   Output shape: {self.feature_extractor.output_shape}")
                         extractor_loaded = True
@@ -241,6 +246,7 @@ class VLMRobustService:
             if not self.validate_models():
                 return False
             
+            self.feature_cache.clear()
             self.is_loaded = True
             logger.info("🎉 All models loaded and validated successfully!")
             return True
@@ -298,19 +304,21 @@ class VLMRobustService:
             logger.error(f"❌ Model validation failed: {e}")
             return False
     
-    def preprocess_image(self, image_data: bytes) -> np.ndarray:
+    @property
+    def decode_min_side(self) -> int:
+        """Smallest side JPEG decode may reduce to (covers the feature extractor's input size)"""
+        model_sides = self.feature_extractor.input_shape[1:3] if self.feature_extractor is not None else ()
+        return decode_floor(*model_sides)
+    
+    def preprocess_image(self, image_data: Union[bytes, DecodedImage]) -> np.ndarray:
         """Preprocess image for feature extractor"""
         try:
-            # Convert bytes to PIL Image
-            image_pil = Image.open(io.BytesIO(image_data))
-            
-            # Convert to RGB if needed
-            if image_pil.mode != 'RGB':
-                image_pil = image_pil.convert('RGB')
+            # Decode once (RGB) or reuse an already decoded image
+            decoded = DecodedImage.ensure(image_data, min_side=self.decode_min_side)
             
             # Get input size from model
             input_shape = self.feature_extractor.input_shape[1:3]  # Height, Width
-            image_pil = image_pil.resize(input_shape)
+            image_pil = decoded.resized(input_shape)
             
             # Convert to numpy array
             img_array = image.img_to_array(image_pil)
@@ -325,60 +333,86 @@ class VLMRobustService:
             logger.error(f"Image preprocessing failed: {e}")
             raise
     
+    def preprocess_images(self, images: List[Union[bytes, DecodedImage]]) -> np.ndarray:
+        """Preprocess several images into one stacked (N, H, W, 3) batch"""
+        with METRICS.stage("preprocessing"):
+            return np.concatenate([self.preprocess_image(image_data) for image_data in images], axis=0)
+    
     def extract_features(self, image_array: np.ndarray) -> np.ndarray:
         """Extract features using the loaded feature extractor"""
+        return self.extract_features_batch(image_array)[0]
+    
+    def extract_features_batch(self, image_batch: np.ndarray) -> np.ndarray:
+        """Extract flattened features for a stacked batch in one forward pass"""
         try:
-            features = self.feature_extractor.predict(image_array, verbose=0)
-            return features.flatten()
+            with METRICS.stage("feature_extraction"):
+                features = self.feature_extractor.predict(image_batch, verbose=0)
+            return features.reshape(len(image_batch), -1)
         except Exception as e:
             logger.error(f"Feature extraction failed: {e}")
             raise
     
     def classify_disaster(self, features: np.ndarray) -> Dict[str, Any]:
         """Classify disaster type using the loaded classifier"""
+        return self.classify_disaster_batch(np.expand_dims(features, axis=0))[0]
+    
+    def classify_disaster_batch(self, features_batch: np.ndarray) -> List[Dict[str, Any]]:
+        """Classify disaster type for every feature row with a single classifier call"""
         try:
-            # Get prediction
+            # Get predictions for all rows at once
             if hasattr(self.disaster_classifier, 'predict_proba'):
-                probabilities = self.disaster_classifier.predict_proba([features])[0]
-                predicted_class_idx = np.argmax(probabilities)
+                with METRICS.stage("classifier_scoring"):
+                    probabilities_batch = self.disaster_classifier.predict_proba(features_batch)
+                predicted_indices = [np.argmax(probabilities) for probabilities in probabilities_batch]
             else:
                 # Fallback for classifiers without predict_proba
-                prediction = self.disaster_classifier.predict([features])[0]
-                if isinstance(prediction, (int, np.integer)):
-                    predicted_class_idx = prediction
-                else:
-                    # String prediction - find index
-                    predicted_class_idx = self.disaster_types.index(prediction) if prediction in self.disaster_types else 0
-                
-                # Create dummy probabilities
-                probabilities = np.zeros(len(self.disaster_types))
-                probabilities[predicted_class_idx] = 0.9
-                probabilities[probabilities == 0] = 0.1 / (len(probabilities) - 1)
-            
-            # Ensure we don't go out of bounds
-            predicted_class_idx = min(predicted_class_idx, len(self.disaster_types) - 1)
-            
-            # Get predicted disaster type
-            predicted_disaster = self.disaster_types[predicted_class_idx]
-            confidence = float(probabilities[predicted_class_idx])
-            
-            # Create probabilities dictionary
-            disaster_probabilities = {
-                disaster_type: float(prob) 
-                for disaster_type, prob in zip(self.disaster_types, probabilities)
-            }
+                with METRICS.stage("classifier_scoring"):
+                    predictions = self.disaster_classifier.predict(features_batch)
+                predicted_indices = []
+                probabilities_batch = []
+                for prediction in predictions:
+                    if isinstance(prediction, (int, np.integer)):
+                        predicted_class_idx = prediction
+                    else:
+                        # String prediction - find index
+                        predicted_class_idx = self.disaster_types.index(prediction) if prediction in self.disaster_types else 0
+                    
+                    # Create dummy probabilities
+                    probabilities = np.zeros(len(self.disaster_types))
+                    probabilities[predicted_class_idx] = 0.9
+                    probabilities[probabilities == 0] = 0.1 / (len(probabilities) - 1)
+                    
+                    predicted_indices.append(predicted_class_idx)
+                    probabilities_batch.append(probabilities)
             
-            return {
-                "predicted_type": predicted_disaster,
-                "confidence": confidence,
-                "all_probabilities": disaster_probabilities,
-                "prediction_method": f"trained_model_{self.classifier_type}",
-                "model_info": {
-                    "classifier_type": type(self.disaster_classifier).__name__,
-                    "n_classes": len(self.disaster_types),
-                    "feature_dim": len(features)
+            results = []
+            for predicted_class_idx, probabilities in zip(predicted_indices, probabilities_batch):
+                # Ensure we don't go out of bounds
+                predicted_class_idx = min(predicted_class_idx, len(self.disaster_types) - 1)
+                
+                # Get predicted disaster type
+                predicted_disaster = self.disaster_types[predicted_class_idx]
+                confidence = float(probabilities[predicted_class_idx])
+                
+                # Create probabilities dictionary
+                disaster_probabilities = {
+                    disaster_type: float(prob) 
+                    for disaster_type, prob in zip(self.disaster_types, probabilities)
                 }
-            }
+                
+                results.append({
+                    "predicted_type": predicted_disaster,
+                    "confidence": confidence,
+                    "all_probabilities": disaster_probabilities,
+                    "prediction_method": f"trained_model_{self.classifier_type}",
+                    "model_info": {
+                        "classifier_type": type(self.disaster_classifier).__name__,
+                        "n_classes": len(self.disaster_types),
+                        "feature_dim": int(features_batch.shape[1])
+                    }
+                })
+            
+            return results
             
         except Exception as e:
             logger.error(f"Disaster classification failed: {e}")
@@ -418,16 +452,14 @@ class VLMRobustService:
                 if severity == "LOW":
                     severity = "MEDIUM"
             
-            # Text-based adjustments
-            text_lower = text_description.lower()
-            critical_words = ['critical', 'severe', 'collapsed', 'trapped', 'death', 'casualties', 'emergency']
-            high_words = ['damaged', 'injured', 'urgent', 'evacuation', 'rescue']
+            # Text-based adjustments (one pass over the shared lexicon)
+            hits = KEYWORDS.scan(text_description)
             
-            if any(word in text_lower for word in critical_words):
+            if hits.has("critical"):
                 priority_score = min(10, priority_score + 3)
                 if severity in ["LOW", "MEDIUM"]:
                     severity = "HIGH"
-            elif any(word in text_lower for word in high_words):
+            elif hits.has("damage", "distress"):
                 priority_score = min(10, priority_score + 1)
             
             return {
@@ -435,9 +467,9 @@ class VLMRobustService:
                 "priority_score": priority_score,
                 "damage_detected": priority_score >= 4,
                 "requires_immediate_action": priority_score >= 8,
-                "structural_damage": disaster_type in ['earthquake', 'building_collapse', 'explosion'] or 'building' in text_lower,
-                "casualties_possible": any(word in text_lower for word in ['people', 'person', 'trapped', 'injured', 'casualties']),
-                "blocked_access": any(word in text_lower for word in ['blocked', 'debris', 'road', 'impassable']),
+                "structural_damage": disaster_type in ['earthquake', 'building_collapse', 'explosion'] or hits.has("structural"),
+                "casualties_possible": hits.has("people"),
+                "blocked_access": hits.has("blocked_access", "road"),
                 "feature_analysis": {
                     "feature_mean": float(feature_mean),
                     "feature_std": float(feature_std),
@@ -510,100 +542,203 @@ class VLMRobustService:
         try:
             logger.info("🔄 Starting image analysis...")
             
-            # Step 1: Preprocess image
-            logger.info("📸 Preprocessing image...")
-            image_array = self.preprocess_image(image_data)
-            
-            # Step 2: Extract features
+            # Step 1-2: Preprocess image and extract features (skipped on cache hit)
             logger.info("🧠 Extracting features...")
-            features = self.extract_features(image_array)
+            features_batch, keys, entries, decoded_images = self._cached_features([image_data])
+            features = features_batch[0]
             logger.info(f"✅ Extracted {len(features)} features")
             
             # Step 3: Classify disaster type
             logger.info("🎯 Classifying disaster type...")
+            disaster_prediction = None
             if not disaster_type:
-                disaster_prediction = self.classify_disaster(features)
-                predicted_disaster_type = disaster_prediction["predicted_type"]
-                disaster_confidence = disaster_prediction["confidence"]
-                disaster_probabilities = disaster_prediction["all_probabilities"]
-                was_predicted = True
-                logger.info(f"🤖 Predicted: {predicted_disaster_type} (confidence: {disaster_confidence:.2f})")
-            else:
-                predicted_disaster_type = disaster_type
-                disaster_confidence = 0.9
-                disaster_probabilities = {disaster_type: 0.9}
-                was_predicted = False
-                logger.info(f"👤 User provided: {predicted_disaster_type}")
-            
-            # Step 4: Assess damage
-            logger.info("📊 Assessing damage severity...")
-            damage_assessment = self.assess_damage_severity(
-                predicted_disaster_type, features, text_description
-            )
+                disaster_prediction = self._cached_classifications(features_batch, keys, entries)[0]
             
-            # Step 5: Generate recommendations
-            logger.info("💡 Generating recommendations...")
-            recommendations = self.generate_recommendations(
-                predicted_disaster_type, 
-                damage_assessment["severity_level"], 
-                damage_assessment
+            result = self._compile_analysis(
+                features, disaster_prediction, text_description, location, disaster_type,
+                decoded=decoded_images[0]
             )
             
-            # Step 6: Compile results
-            result = {
-                "disaster_assessment": damage_assessment,
-                "location_info": {
-                    "location": location,
-                    "coordinates": [7.8731, 80.7718],  # Default Sri Lanka center
-                    "area_affected": f"approximately {damage_assessment['priority_score'] * 25} square meters"
-                },
-                "recommendations": recommendations,
-                "visual_tags": [
-                    predicted_disaster_type.replace('_', ' '),
-                    damage_assessment["severity_level"].lower(),
-                    "damage_detected" if damage_assessment["damage_detected"] else "no_damage"
-                ],
-                "processing_info": {
-                    "timestamp": datetime.utcnow().isoformat(),
-                    "model_version": f"real_vlm_robust_v1.0_{self.classifier_type}",
-                    "confidence_score": disaster_confidence
-                },
-                "disaster_type_prediction": {
-                    "predicted_type": predicted_disaster_type,
-                    "confidence": disaster_confidence,
-                    "all_probabilities": disaster_probabilities,
-                    "was_predicted": was_predicted,
-                    "user_provided_type": disaster_type if disaster_type else None
-                },
-                "vlm_analysis": {
-                    "feature_vector_size": len(features),
-                    "classifier_type": type(self.disaster_classifier).__name__,
-                    "model_load_method": self.classifier_type
-                }
-            }
-            
             logger.info("✅ Analysis completed successfully!")
             return result
             
         except Exception as e:
             logger.error(f"❌ Image analysis failed: {e}")
             raise
+    
+    def analyze_images(self, images: List[bytes], text_description: str = "", 
+                      location: str = "", disaster_type: str = "") -> List[Dict[str, Any]]:
+        """Batched image analysis: one forward pass and one classifier call for all images"""
+        if not self.is_loaded:
+            raise Exception("Models not loaded. Please load models first.")
+        
+        try:
+            logger.info(f"🔄 Starting batch analysis of {len(images)} images...")
+            
+            features_batch, keys, entries, decoded_images = self._cached_features(images)
+            logger.info(f"✅ Extracted features for {len(features_batch)} images")
+            
+            if not disaster_type:
+                disaster_predictions = self._cached_classifications(features_batch, keys, entries)
+            else:
+                disaster_predictions = [None] * len(features_batch)
+            
+            results = [
+                self._compile_analysis(features, prediction, text_description, location, disaster_type,
+                                       decoded=decoded)
+                for features, prediction, decoded in zip(features_batch, disaster_predictions, decoded_images)
+            ]
+            
+            logger.info("✅ Batch analysis completed successfully!")
+            return results
+            
+        except Exception as e:
+            logger.error(f"❌ Batch image analysis failed: {e}")
+            raise
+    
+    def _cached_features(self, images: List[Union[bytes, DecodedImage]]) -> Tuple[np.ndarray, List, List, List[DecodedImage]]:
+        """Feature rows for each image, running the CNN in one batch for cache misses only"""
+        decoded_images = [DecodedImage.ensure(image_data, min_side=self.decode_min_side) for image_data in images]
+        input_shape = self.feature_extractor.input_shape[1:3]
+        
+        cache = self.feature_cache
+        with METRICS.stage("preprocessing"):
+            keys = [cache.make_key(decoded.resized(input_shape)) if cache.enabled else None
+                    for decoded in decoded_images]
+        entries = [cache.get(key) if key is not None else None for key in keys]
+        features: List[Optional[np.ndarray]] = [entry.features if entry is not None else None for entry in entries]
+        
+        misses = [i for i, entry in enumerate(entries) if entry is None]
+        if misses:
+            image_batch = self.preprocess_images([decoded_images[i] for i in misses])
+            extracted = self.extract_features_batch(image_batch)
+            for row, position in enumerate(misses):
+                features[position] = extracted[row]
+                if keys[position] is not None:
+                    cache.put(keys[position], extracted[row])
+        
+        return np.stack(features, axis=0), keys, entries, decoded_images
+    
+    def _cached_classifications(self, features_batch: np.ndarray, keys: List, entries: List) -> List[Dict[str, Any]]:
+        """Disaster predictions per feature row, reusing cached classifier output"""
+        predictions: List[Optional[Dict[str, Any]]] = [
+            entry.outputs if entry is not None else None for entry in entries
+        ]
+        
+        misses = [i for i, prediction in enumerate(predictions) if prediction is None]
+        if misses:
+            computed = self.classify_disaster_batch(features_batch[misses])
+            for prediction, position in zip(computed, misses):
+                predictions[position] = prediction
+                if keys[position] is not None:
+                    self.feature_cache.update_outputs(keys[position], prediction)
+        
+        return predictions
+    
+    def _compile_analysis(self, features: np.ndarray, disaster_prediction: Optional[Dict[str, Any]],
+                          text_description: str, location: str, disaster_type: str,
+                          decoded: Optional[DecodedImage] = None) -> Dict[str, Any]:
+        """Assess damage and compile the response for one image"""
+        if disaster_prediction is not None:
+            predicted_disaster_type = disaster_prediction["predicted_type"]
+            disaster_confidence = disaster_prediction["confidence"]
+            disaster_probabilities = disaster_prediction["all_probabilities"]
+            was_predicted = True
+            logger.info(f"🤖 Predicted: {predicted_disaster_type} (confidence: {disaster_confidence:.2f})")
+        else:
+            predicted_disaster_type = disaster_type
+            disaster_confidence = 0.9
+            disaster_probabilities = {disaster_type: 0.9}
+            was_predicted = False
+            logger.info(f"👤 User provided: {predicted_disaster_type}")
+        
+        # Step 4: Assess damage
+        logger.info("📊 Assessing damage severity...")
+        damage_assessment = self.assess_damage_severity(
+            predicted_disaster_type, features, text_description
+        )
+        
+        # Step 5: Generate recommendations
+        logger.info("💡 Generating recommendations...")
+        recommendations = self.generate_recommendations(
+            predicted_disaster_type, 
+            damage_assessment["severity_level"], 
+            damage_assessment
+        )
+        
+        # Step 6: Compile results
+        return {
+            "disaster_assessment": damage_assessment,
+            "location_info": {
+                "location": location,
+                "coordinates": [7.8731, 80.7718],  # Default Sri Lanka center
+                "area_affected": f"approximately {damage_assessment['priority_score'] * 25} square meters"
+            },
+            "recommendations": recommendations,
+            "visual_tags": [
+                predicted_disaster_type.replace('_', ' '),
+                damage_assessment["severity_level"].lower(),
+                "damage_detected" if damage_assessment["damage_detected"] else "no_damage"
+            ],
+            "processing_info": {
+                "timestamp": datetime.utcnow().isoformat(),
+                "model_version": f"real_vlm_robust_v1.0_{self.classifier_type}",
+                "confidence_score": disaster_confidence,
+                "image_info": decoded.describe() if decoded is not None else None
+            },
+            "disaster_type_prediction": {
+                "predicted_type": predicted_disaster_type,
+                "confidence": disaster_confidence,
+                "all_probabilities": disaster_probabilities,
+                "was_predicted": was_predicted,
+                "user_provided_type": disaster_type if disaster_type else None
+            },
+            "vlm_analysis": {
+                "feature_vector_size": len(features),
+                "classifier_type": type(self.disaster_classifier).__name__,
+                "model_load_method": self.classifier_type
+            }
+        }
 
 # Global service instance
 vlm_robust_service = VLMRobustService()
 
+# Blocking model calls run here so the event loop (and /health) stays responsive
+inference_executor = InferenceExecutor()
+
+def _metric_samples():
+    yield from executor_samples(inference_executor, "request")
+    yield from cache_samples(vlm_robust_service.feature_cache, "image_features")
+
+METRICS.register_collector("vlm_real_service", _metric_samples)
+
 # FastAPI app
 robust_vlm_app = FastAPI(
     title="Robust VLM Service for RescueLanka",
     description="Production VLM service with robust model loading and format detection"
 )
 
+# Per-endpoint latency and GET /metrics (Prometheus text format)
+install_metrics(robust_vlm_app)
+
+# Continues the caller's trace (traceparent header); stage spans -> traces.jsonl
+install_tracing(robust_vlm_app, "vlm-service")
+
 class VLMAnalysisRequest(BaseModel):
     image: str  # base64 encoded
     text_description: str = ""
     location: str = ""
     disaster_type: str = ""
 
+class VLMBatchAnalysisRequest(BaseModel):
+    images: List[str]  # base64 encoded
+    text_description: str = ""
+    location: str = ""
+    disaster_type: str = ""
+
+# Maximum number of images accepted by the batch endpoint
+MAX_BATCH_IMAGES = 64
+
 @robust_vlm_app.on_event("startup")
 async def startup_event():
     """Load models on startup"""
@@ -653,11 +788,14 @@ async def analyze_image(request: VLMAnalysisRequest):
         raise HTTPException(status_code=503, detail="Models not loaded")
     
     try:
-        # Decode base64 image
-        image_data = base64.b64decode(request.image)
-        
+        image_data = decode_base64_image(request.image).data
+    except UploadRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    
+    try:
         # Analyze with loaded models
-        result = vlm_robust_service.analyze_image(
+        result = await inference_executor.run(
+            "image", vlm_robust_service.analyze_image,
             image_data=image_data,
             text_description=request.text_description,
             location=request.location,
@@ -666,10 +804,86 @@ async def analyze_image(request: VLMAnalysisRequest):
         
         return result
         
+    except InferenceOverloaded as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        logger.error(f"Analysis failed: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@robust_vlm_app.post("/analyze/image/binary")
+async def analyze_image_binary(request: Request):
+    """Binary variant of /analyze/image: raw image body, metadata in X-RescueLanka-* headers"""
+    if not vlm_robust_service.is_loaded:
+        raise HTTPException(status_code=503, detail="Models not loaded")
+    
+    try:
+        image_data, metadata = await read_binary_image_request(request)
+    except BinaryPayloadError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    
+    try:
+        result = await inference_executor.run(
+            "image", vlm_robust_service.analyze_image,
+            image_data=image_data,
+            text_description=metadata.get("text_description", ""),
+            location=metadata.get("location", ""),
+            disaster_type=metadata.get("disaster_type", "")
+        )
+        
+        return result
+        
+    except InferenceOverloaded as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         logger.error(f"Analysis failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@robust_vlm_app.post("/analyze/images/batch")
+async def analyze_images_batch(request: VLMBatchAnalysisRequest):
+    """Analyze an album of images with one batched model pass"""
+    if not vlm_robust_service.is_loaded:
+        raise HTTPException(status_code=503, detail="Models not loaded")
+    if not request.images:
+        raise HTTPException(status_code=400, detail="At least one image is required")
+    if len(request.images) > MAX_BATCH_IMAGES:
+        raise HTTPException(status_code=400, detail=f"Too many images (max {MAX_BATCH_IMAGES})")
+    
+    try:
+        # Decode base64 payloads under the per-upload size, format and pixel limits;
+        # rejected entries get a per-image error and are never decoded as images
+        images = []
+        decode_errors = {}
+        for position, image_b64 in enumerate(request.images):
+            try:
+                images.append(decode_base64_image(image_b64).data)
+            except UploadRejected as e:
+                decode_errors[position] = {"error": str(e), "status_code": e.status_code}
+                images.append(None)
+        
+        valid_positions = [i for i, data in enumerate(images) if data is not None]
+        batch_results = await inference_executor.run(
+            "image", vlm_robust_service.analyze_images,
+            images=[images[i] for i in valid_positions],
+            text_description=request.text_description,
+            location=request.location,
+            disaster_type=request.disaster_type
+        ) if valid_positions else []
+        
+        results = [decode_errors.get(i) for i in range(len(images))]
+        for position, result in zip(valid_positions, batch_results):
+            results[position] = result
+        
+        return {
+            "results": [{"index": i, **result} for i, result in enumerate(results)],
+            "count": len(results)
+        }
+        
+    except InferenceOverloaded as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        logger.error(f"Batch analysis failed: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @robust_vlm_app.get("/debug/models")
 async def debug_models():
     """Debug endpoint to inspect model loading"""
@@ -680,7 +894,10 @@ async def debug_models():
         "models_loaded": vlm_robust_service.is_loaded,
         "classifier_loaded": vlm_robust_service.disaster_classifier is not None,
         "extractor_loaded": vlm_robust_service.feature_extractor is not None,
-        "classifier_type": vlm_robust_service.classifier_type
+        "classifier_type": vlm_robust_service.classifier_type,
+        "feature_runtime": vlm_robust_service.feature_extractor.describe() if vlm_robust_service.feature_extractor is not None else None,
+        "feature_cache": vlm_robust_service.feature_cache.get_stats(),
+        "inference_executor": inference_executor.get_stats()
     }
 
 if __name__ == "__main__":